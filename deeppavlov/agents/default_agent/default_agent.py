@@ -17,6 +17,7 @@ from typing import List, Optional
 from deeppavlov.agents.filters.transparent_filter import TransparentFilter
 from deeppavlov.agents.processors.highest_confidence_selector import HighestConfidenceSelector
 from deeppavlov.core.agent.agent import Agent
+from deeppavlov.core.agent.dialog_store import DialogStore
 from deeppavlov.core.agent.filter import Filter
 from deeppavlov.core.agent.processor import Processor
 from deeppavlov.core.models.component import Component
@@ -41,6 +42,8 @@ class DefaultAgent(Agent):
         skills: List of initiated agent skills or components instances.
         skills_processor: Initiated agent processor.
         skills_filter: Initiated agent filter.
+        history_store: Storage of dialogs histories, an unbounded in-memory store is used by default.
+        states_store: Storage of skills states, an unbounded in-memory store is used by default.
 
     Attributes:
         skills: List of initiated agent skills instances.
@@ -48,8 +51,9 @@ class DefaultAgent(Agent):
         skills_filter: Initiated agent filter.
     """
     def __init__(self, skills: List[Component], skills_processor: Optional[Processor] = None,
-                 skills_filter: Optional[Filter] = None, *args, **kwargs) -> None:
-        super(DefaultAgent, self).__init__(skills=skills)
+                 skills_filter: Optional[Filter] = None, history_store: Optional[DialogStore] = None,
+                 states_store: Optional[DialogStore] = None, *args, **kwargs) -> None:
+        super(DefaultAgent, self).__init__(skills=skills, history_store=history_store, states_store=states_store)
         self.skills_filter = skills_filter or TransparentFilter(len(skills))
         self.skills_processor = skills_processor or HighestConfidenceSelector()
 
@@ -13,7 +13,6 @@
 # limitations under the License.
 
 import argparse
-from collections import defaultdict
 from logging import getLogger
 from typing import List, Dict, Any
 
@@ -48,7 +47,7 @@ class EcommerceAgent(Agent):
 
     def __init__(self, skills: List[Skill], *args, **kwargs) -> None:
         super(EcommerceAgent, self).__init__(skills=skills)
-        self.states: dict = defaultdict(lambda: [{"start": 0, "stop": 5} for _ in self.skills])
+        self.states.default_factory = lambda: [{"start": 0, "stop": 5} for _ in self.skills]
 
     def _call(self, utterances_batch: List[str], utterances_ids: List[int] = None) -> List[RichMessage]:
         """Processes batch of utterances and returns corresponding responses batch.
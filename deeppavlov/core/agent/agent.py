@@ -13,10 +13,10 @@
 # limitations under the License.
 
 from abc import ABCMeta, abstractmethod
-from collections import defaultdict
-from typing import List, Dict, Tuple, Optional, Union
+from typing import List, Tuple, Optional
 
 from deeppavlov.core.agent.dialog_logger import DialogLogger
+from deeppavlov.core.agent.dialog_store import DialogStore, MemoryDialogStore
 from deeppavlov.core.models.component import Component
 
 
@@ -32,6 +32,10 @@ class Agent(Component, metaclass=ABCMeta):
 
     Args:
         skills: List of initiated agent skills instances.
+        history_store: Storage of dialogs histories, an unbounded in-memory
+            :class:`~deeppavlov.core.agent.dialog_store.MemoryDialogStore` is used by default.
+        states_store: Storage of skills states, an unbounded in-memory
+            :class:`~deeppavlov.core.agent.dialog_store.MemoryDialogStore` is used by default.
 
     Attributes:
         skills: List of initiated Skill or Component instances.
@@ -39,6 +43,7 @@ class Agent(Component, metaclass=ABCMeta):
         history: Histories for each each dialog with agent indexed
             by dialog ID. Each history is represented by list of incoming
             and outcoming replicas of the dialog casted to str and updated automatically.
+            Histories are kept in a DialogStore which can truncate and evict them.
         states: States for each skill with agent indexed by dialog ID. Each
             state updated automatically after each wrapped skill inference.
             So we highly recommend use this attribute only for reading and
@@ -50,10 +55,13 @@ class Agent(Component, metaclass=ABCMeta):
             We highly recommend to use wrapped skills for skills inference.
         dialog_logger: DeepPavlov dialog logging facility.
     """
-    def __init__(self, skills: List[Component]) -> None:
+    def __init__(self, skills: List[Component], history_store: Optional[DialogStore] = None,
+                 states_store: Optional[DialogStore] = None) -> None:
         self.skills = skills
-        self.history: Dict = defaultdict(list)
-        self.states: Dict = defaultdict(lambda: [None] * len(self.skills))
+        self.history: DialogStore = history_store if history_store is not None else MemoryDialogStore()
+        self.history.default_factory = list
+        self.states: DialogStore = states_store if states_store is not None else MemoryDialogStore()
+        self.states.default_factory = lambda: [None] * len(self.skills)
         self.wrapped_skills: List[SkillWrapper] = \
             [SkillWrapper(skill, skill_id, self) for skill_id, skill in enumerate(self.skills)]
         self.dialog_logger: DialogLogger = DialogLogger()
@@ -81,6 +89,9 @@ class Agent(Component, metaclass=ABCMeta):
             self.history[utt_id].append(str(responses_batch[utt_batch_idx]))
             self.dialog_logger.log_out(responses_batch[utt_batch_idx], utt_id)
 
+            self.history.commit(utt_id)
+            self.states.commit(utt_id)
+
         return responses_batch
 
     @abstractmethod
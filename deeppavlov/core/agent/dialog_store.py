@@ -0,0 +1,360 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+import sqlite3
+import sys
+import time
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from itertools import islice
+from logging import getLogger
+from pathlib import Path
+from threading import RLock
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Union
+
+from deeppavlov.core.commands.utils import expand_path
+from deeppavlov.core.common.cache import LRUCache
+
+log = getLogger(__name__)
+
+_MISSING = object()
+
+
+def approximate_sizeof(value: Any) -> int:
+    """Size of a value in bytes together with the sizes of its direct items."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+class DialogStore(metaclass=ABCMeta):
+    """Abstract storage of per-dialog values of an agent, such as dialog histories or skills states.
+
+    Values are indexed by dialog ID and are created with ``default_factory`` on the first access. A value returned
+    by the store can be changed in place, such changes are guaranteed to be kept only after :meth:`commit` is called
+    for the dialog. Values returned by the store are not evicted until they are committed.
+
+    Args:
+        default_factory: a function without arguments that creates a value for a new dialog
+        max_turns: maximum number of the latest items kept in list values, lists are not truncated if it is ``None``
+
+    Attributes:
+        default_factory: a function without arguments that creates a value for a new dialog
+        max_turns: maximum number of the latest items kept in list values
+    """
+
+    def __init__(self, default_factory: Optional[Callable[[], Any]] = None, max_turns: Optional[int] = None) -> None:
+        self.default_factory = default_factory
+        self.max_turns = max_turns
+
+    @abstractmethod
+    def _get(self, dialog_id: Hashable) -> Any:
+        """Return a stored value of the dialog or ``_MISSING``, the returned value is pinned until it is committed."""
+
+    def _pin(self, dialog_id: Hashable) -> None:
+        """Keep the stored value of the dialog in memory until it is committed."""
+
+    @abstractmethod
+    def __setitem__(self, dialog_id: Hashable, value: Any) -> None:
+        pass
+
+    @abstractmethod
+    def __delitem__(self, dialog_id: Hashable) -> None:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def __getitem__(self, dialog_id: Hashable) -> Any:
+        value = self._get(dialog_id)
+        if value is _MISSING:
+            if self.default_factory is None:
+                raise KeyError(dialog_id)
+            value = self.default_factory()
+            self[dialog_id] = value
+            self._pin(dialog_id)
+        return value
+
+    def __contains__(self, dialog_id: Hashable) -> bool:
+        return self._get(dialog_id) is not _MISSING
+
+    def get(self, dialog_id: Hashable, default: Any = None) -> Any:
+        value = self._get(dialog_id)
+        return default if value is _MISSING else value
+
+    def commit(self, dialog_id: Hashable) -> None:
+        """Store in place changes of the dialog value and truncate it to :attr:`max_turns` latest items."""
+        value = self._get(dialog_id)
+        if value is _MISSING:
+            return
+        if self.max_turns is not None and isinstance(value, list) and len(value) > self.max_turns:
+            del value[:len(value) - self.max_turns]
+        self[dialog_id] = value
+
+
+class MemoryDialogStore(DialogStore):
+    """In-memory dialog store with eviction of least recently used dialogs.
+
+    Dialogs are evicted if there are more than ``max_dialogs`` of them, if their total approximate size is more than
+    ``max_size`` bytes, or if they were not accessed for ``ttl`` seconds. The store is unbounded with default
+    arguments. Dialogs returned by the store are not evicted until they are committed.
+
+    Args:
+        default_factory: a function without arguments that creates a value for a new dialog
+        max_turns: maximum number of the latest items kept in list values, lists are not truncated if it is ``None``
+        max_dialogs: maximum number of stored dialogs
+        ttl: number of seconds after the last access to a dialog before it is evicted
+        max_size: maximum total size of stored values in bytes
+        sizeof: a function that returns a size of a value in bytes
+
+    Attributes:
+        size: current total size of stored values in bytes as it was at their last commit
+    """
+
+    def __init__(self, default_factory: Optional[Callable[[], Any]] = None, max_turns: Optional[int] = None,
+                 max_dialogs: Optional[int] = None, ttl: Optional[float] = None, max_size: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = approximate_sizeof) -> None:
+        super().__init__(default_factory, max_turns)
+        self.max_dialogs = max_dialogs
+        self.ttl = ttl
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self.size = 0
+        # dialog ID -> [value, last access time, size]
+        self._data: Dict[Hashable, list] = OrderedDict()
+        # IDs of dialogs that were returned and not committed yet
+        self._uncommitted: Set[Hashable] = set()
+        self._lock = RLock()
+
+    def _access(self, dialog_id: Hashable) -> Optional[list]:
+        self._expire()
+        entry = self._data.get(dialog_id)
+        if entry is not None:
+            entry[1] = time.monotonic()
+            self._data.move_to_end(dialog_id)
+        return entry
+
+    def _get(self, dialog_id: Hashable) -> Any:
+        with self._lock:
+            entry = self._access(dialog_id)
+            if entry is None:
+                return _MISSING
+            self._uncommitted.add(dialog_id)
+            return entry[0]
+
+    def _pin(self, dialog_id: Hashable) -> None:
+        with self._lock:
+            if dialog_id in self._data:
+                self._uncommitted.add(dialog_id)
+
+    def __contains__(self, dialog_id: Hashable) -> bool:
+        with self._lock:
+            return self._access(dialog_id) is not None
+
+    def __setitem__(self, dialog_id: Hashable, value: Any) -> None:
+        size = self.sizeof(value)
+        with self._lock:
+            if dialog_id in self._data:
+                self.size -= self._data.pop(dialog_id)[2]
+            self._data[dialog_id] = [value, time.monotonic(), size]
+            self._uncommitted.discard(dialog_id)
+            self.size += size
+            self._expire()
+            self._evict()
+
+    def __delitem__(self, dialog_id: Hashable) -> None:
+        with self._lock:
+            self.size -= self._data.pop(dialog_id)[2]
+            self._uncommitted.discard(dialog_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._uncommitted.clear()
+            self.size = 0
+
+    def _expire(self) -> None:
+        if self.ttl is None:
+            return
+        deadline = time.monotonic() - self.ttl
+        # dialogs are ordered by the last access time
+        expired = []
+        for dialog_id, (_, accessed, _) in self._data.items():
+            if accessed >= deadline:
+                break
+            if dialog_id not in self._uncommitted:
+                expired.append(dialog_id)
+        for dialog_id in expired:
+            self.size -= self._data.pop(dialog_id)[2]
+
+    def _evict(self) -> None:
+        # the most recently used dialog and uncommitted dialogs are never evicted
+        while (self.max_dialogs is not None and len(self._data) > self.max_dialogs) or \
+                (self.max_size is not None and self.size > self.max_size):
+            victim = next((dialog_id for dialog_id in islice(self._data, len(self._data) - 1)
+                           if dialog_id not in self._uncommitted), None)
+            if victim is None:
+                break
+            self.size -= self._data.pop(victim)[2]
+
+
+class SQLiteDialogStore(DialogStore):
+    """Dialog store that keeps pickled values in an SQLite database, so that dialogs survive restarts.
+
+    The most recently used values are also kept in memory. Values returned by the store are additionally kept in
+    memory until they are committed, so that their in place changes are not lost if the cache evicts them.
+    Dialog IDs have to be integers or strings.
+
+    Args:
+        db_path: a path to an SQLite database file, it is created if it does not exist
+        default_factory: a function without arguments that creates a value for a new dialog
+        max_turns: maximum number of the latest items kept in list values, lists are not truncated if it is ``None``
+        ttl: number of seconds after the last change of a dialog before it is deleted
+        cache_size: maximum number of values kept in memory
+        table: a name of the table for values, several stores can share one database file with different tables
+
+    Attributes:
+        db_path: a path to an SQLite database file
+        table: a name of the table for values
+        cache: a cache of the most recently used values and their last change times
+    """
+
+    _sweep_interval = 60
+
+    def __init__(self, db_path: Union[str, Path], default_factory: Optional[Callable[[], Any]] = None,
+                 max_turns: Optional[int] = None, ttl: Optional[float] = None, cache_size: int = 1000,
+                 table: str = 'dialogs') -> None:
+        super().__init__(default_factory, max_turns)
+        self.db_path = expand_path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.table = table
+        self.cache = LRUCache(cache_size)
+        # dialog ID -> (value, last change time) of values that were returned and not committed yet
+        self._uncommitted: Dict[Hashable, tuple] = {}
+        self._lock = RLock()
+        self._last_sweep = 0.
+        self._connect = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._connect.execute('PRAGMA journal_mode=WAL')
+        self._connect.execute('PRAGMA synchronous=NORMAL')
+        self._connect.execute(f'CREATE TABLE IF NOT EXISTS {table} (id PRIMARY KEY, value BLOB, updated REAL)')
+        self._connect.execute(f'CREATE INDEX IF NOT EXISTS {table}_updated ON {table} (updated)')
+
+    def _is_expired(self, updated: float) -> bool:
+        return self.ttl is not None and updated < time.time() - self.ttl
+
+    def _load(self, dialog_id: Hashable) -> Optional[tuple]:
+        entry = self._uncommitted.get(dialog_id)
+        if entry is None:
+            entry = self.cache.get(dialog_id)
+        if entry is None:
+            row = self._connect.execute(f'SELECT value, updated FROM {self.table} WHERE id = ?',
+                                        (dialog_id,)).fetchone()
+            if row is None:
+                return None
+            entry = pickle.loads(row[0]), row[1]
+            self.cache[dialog_id] = entry
+        return None if self._is_expired(entry[1]) else entry
+
+    def _get(self, dialog_id: Hashable) -> Any:
+        with self._lock:
+            entry = self._load(dialog_id)
+            if entry is None:
+                return _MISSING
+            self._uncommitted[dialog_id] = entry
+            return entry[0]
+
+    def _pin(self, dialog_id: Hashable) -> None:
+        with self._lock:
+            entry = self.cache.get(dialog_id)
+            if entry is not None:
+                self._uncommitted[dialog_id] = entry
+
+    def __contains__(self, dialog_id: Hashable) -> bool:
+        with self._lock:
+            return self._load(dialog_id) is not None
+
+    def __setitem__(self, dialog_id: Hashable, value: Any) -> None:
+        updated = time.time()
+        with self._lock:
+            self._connect.execute(f'INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?)',
+                                  (dialog_id, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), updated))
+            self.cache[dialog_id] = value, updated
+            self._uncommitted.pop(dialog_id, None)
+            if self.ttl is not None and updated - self._last_sweep > self._sweep_interval:
+                self._connect.execute(f'DELETE FROM {self.table} WHERE updated < ?', (updated - self.ttl,))
+                self._last_sweep = updated
+
+    def __delitem__(self, dialog_id: Hashable) -> None:
+        with self._lock:
+            if dialog_id not in self:
+                raise KeyError(dialog_id)
+            self._connect.execute(f'DELETE FROM {self.table} WHERE id = ?', (dialog_id,))
+            self.cache.pop(dialog_id)
+            self._uncommitted.pop(dialog_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self.ttl is None:
+                return self._connect.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+            return self._connect.execute(f'SELECT COUNT(*) FROM {self.table} WHERE updated >= ?',
+                                         (time.time() - self.ttl,)).fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect.execute(f'DELETE FROM {self.table}')
+            self.cache.clear()
+            self._uncommitted.clear()
+
+    def close(self) -> None:
+        self._connect.close()
+
+
+def build_dialog_stores(max_turns: Optional[int] = None, max_dialogs: Optional[int] = None,
+                        ttl: Optional[float] = None, max_size: Optional[int] = None,
+                        db_path: Optional[Union[str, Path]] = None) -> Dict[str, DialogStore]:
+    """Create stores of dialogs histories and skills states for an agent.
+
+    Args:
+        max_turns: maximum number of the latest utterances and responses kept in every dialog history
+        max_dialogs: maximum number of dialogs kept in memory, it is ignored if ``db_path`` is set
+        ttl: number of seconds after the last activity in a dialog before it is forgotten
+        max_size: maximum total size of histories kept in memory in bytes, it is ignored if ``db_path`` is set
+        db_path: a path to an SQLite database, dialogs are kept in memory if it is ``None``
+
+    Returns:
+        a dictionary with ``history_store`` and ``states_store`` arguments of an agent
+    """
+    if db_path is not None:
+        if max_dialogs is not None or max_size is not None:
+            log.warning('Dialogs are stored in an SQLite database, "max_dialogs" and "max_size" are ignored')
+        return {'history_store': SQLiteDialogStore(db_path, max_turns=max_turns, ttl=ttl, table='history'),
+                'states_store': SQLiteDialogStore(db_path, ttl=ttl, table='states')}
+    return {'history_store': MemoryDialogStore(max_turns=max_turns, max_dialogs=max_dialogs, ttl=ttl,
+                                               max_size=max_size),
+            'states_store': MemoryDialogStore(max_dialogs=max_dialogs, ttl=ttl)}
@@ -14,10 +14,14 @@
 import json
 import pickle
 import sys
+from collections import deque
 from itertools import islice
 from logging import getLogger
+from multiprocessing import get_context
 from pathlib import Path
-from typing import Optional, Union
+from queue import Queue
+from threading import Thread
+from typing import Optional, Union, List
 
 from deeppavlov.core.commands.utils import import_packages, parse_config
 from deeppavlov.core.common.chainer import Chainer
@@ -43,7 +47,8 @@ def build_model(config: Union[str, Path, dict], mode: str = 'infer',
 
     model_config = config['chainer']
 
-    model = Chainer(model_config['in'], model_config['out'], model_config.get('in_y'))
+    model = Chainer(model_config['in'], model_config['out'], model_config.get('in_y'),
+                    parallel=model_config.get('parallel', False), max_workers=model_config.get('max_workers'))
 
     for component_config in model_config['pipe']:
         if load_trained and ('fit_on' in component_config or 'in_y' in component_config):
@@ -92,8 +97,80 @@ def interact_model(config: Union[str, Path, dict]) -> None:
         print('>>', *pred)
 
 
-def predict_on_stream(config: Union[str, Path, dict], batch_size: int = 1, file_path: Optional[str] = None) -> None:
-    """Make a prediction with the component described in corresponding configuration file."""
+def _read_batches(f, batch_size: int, args_count: int, batches: Queue, errors: list) -> None:
+    """Reads batches of model arguments from the file ``f`` and puts them into the ``batches`` queue.
+
+    ``None`` is put into the queue at the end of the file or after a failure, in the latter case the exception
+    is appended to ``errors``.
+    """
+    try:
+        while True:
+            batch = list((l.strip() for l in islice(f, batch_size * args_count)))
+
+            if not batch:
+                break
+
+            batches.put([batch[i::args_count] for i in range(args_count)])
+    except Exception as e:
+        errors.append(e)
+    finally:
+        batches.put(None)
+
+
+def _write_results(results: Queue, out, errors: list) -> None:
+    """Serializes model outputs from the ``results`` queue and writes them to ``out`` one batch at a time.
+
+    After the first failure the queue is only drained and the exception is appended to ``errors``.
+    """
+    while True:
+        res = results.get()
+        if res is None:
+            break
+        if errors:
+            continue
+        try:
+            out.write(''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in res))
+            out.flush()
+        except Exception as e:
+            errors.append(e)
+
+
+def _predict_batch(model: Chainer, args: List[list]) -> list:
+    res = model(*args)
+    if len(model.out_params) == 1:
+        res = [res]
+    return list(zip(*res))
+
+
+_worker_model: Optional[Chainer] = None
+
+
+def _init_worker(config: Union[str, Path, dict]) -> None:
+    global _worker_model
+    _worker_model = build_model(config)
+
+
+def _predict_batch_in_worker(args: List[list]) -> list:
+    return _predict_batch(_worker_model, args)
+
+
+def predict_on_stream(config: Union[str, Path, dict], batch_size: int = 1, file_path: Optional[str] = None,
+                      n_workers: int = 1, prefetch: int = 8) -> None:
+    """Make a prediction with the component described in corresponding configuration file.
+
+    Input lines are read ahead by a separate thread and output lines are serialized and written by another one,
+    so reading, inference and writing overlap. If ``n_workers`` is greater than 1, batches are distributed among
+    that many processes, each holding its own copy of the model, and at most ``max(prefetch, n_workers)`` batches
+    are submitted to them at a time. Output order always matches input order. Inference stops as soon as reading
+    or writing fails and the failure is raised.
+
+    Args:
+        config: model config path or dict
+        batch_size: inference batch size
+        file_path: path to the input file, ``stdin`` is used if it is ``None`` or ``'-'``
+        n_workers: number of model worker processes
+        prefetch: maximum number of batches waiting for inference and for writing
+    """
     if file_path is None or file_path == '-':
         if sys.stdin.isatty():
             raise RuntimeError('To process data from terminal please use interact mode')
@@ -101,25 +178,51 @@ def predict_on_stream(config: Union[str, Path, dict], batch_size: int = 1, file_
     else:
         f = open(file_path, encoding='utf8')
 
-    model: Chainer = build_model(config)
-
-    args_count = len(model.in_x)
-    while True:
-        batch = list((l.strip() for l in islice(f, batch_size * args_count)))
-
-        if not batch:
-            break
-
-        args = []
-        for i in range(args_count):
-            args.append(batch[i::args_count])
-
-        res = model(*args)
-        if len(model.out_params) == 1:
-            res = [res]
-        for res in zip(*res):
-            res = json.dumps(res, ensure_ascii=False)
-            print(res, flush=True)
-
-    if f is not sys.stdin:
-        f.close()
+    if n_workers > 1:
+        in_x = parse_config(config)['chainer']['in']
+        args_count = 1 if isinstance(in_x, str) else len(in_x)
+        pool = get_context('spawn').Pool(n_workers, initializer=_init_worker, initargs=(config,))
+        model = None
+    else:
+        model: Chainer = build_model(config)
+        args_count = len(model.in_x)
+        pool = None
+
+    batches = Queue(maxsize=prefetch)
+    results = Queue(maxsize=prefetch)
+    read_errors = []
+    reader = Thread(target=_read_batches, args=(f, batch_size, args_count, batches, read_errors), daemon=True)
+    write_errors = []
+    writer = Thread(target=_write_results, args=(results, sys.stdout, write_errors))
+    reader.start()
+    writer.start()
+
+    try:
+        if pool is not None:
+            # batches are submitted through a bounded window, so that the pool does not consume the whole input
+            window = deque()
+            for args in iter(batches.get, None):
+                if write_errors:
+                    break
+                window.append(pool.apply_async(_predict_batch_in_worker, (args,)))
+                if len(window) >= max(prefetch, n_workers):
+                    results.put(window.popleft().get())
+            while window and not write_errors:
+                results.put(window.popleft().get())
+        else:
+            for args in iter(batches.get, None):
+                if write_errors:
+                    break
+                results.put(_predict_batch(model, args))
+    finally:
+        results.put(None)
+        writer.join()
+        if pool is not None:
+            pool.terminate()
+        if f is not sys.stdin:
+            f.close()
+
+    if read_errors:
+        raise read_errors[0]
+    if write_errors:
+        raise write_errors[0]
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import pickle
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from itertools import islice
 from logging import getLogger
 from typing import Union, Tuple, List, Optional, Hashable, Reversible
@@ -44,9 +45,14 @@ class Chainer(Component):
         in_x: names of inputs for pipeline inference mode
         out_params: names of pipeline inference outputs
         in_y: names of additional inputs for pipeline training and evaluation modes
+        parallel: if ``True``, components of the inference pipe whose inputs are already computed are run
+            concurrently in a thread pool instead of one after another
+        max_workers: maximum number of threads used in the parallel mode (default is ``None`` which means
+            ``ThreadPoolExecutor`` default)
     """
     def __init__(self, in_x: Union[str, list] = None, out_params: Union[str, list] = None,
-                 in_y: Union[str, list] = None, *args, **kwargs) -> None:
+                 in_y: Union[str, list] = None, parallel: bool = False, max_workers: Optional[int] = None,
+                 *args, **kwargs) -> None:
         self.pipe: List[Tuple[Tuple[List[str], List[str]], List[str], Component]] = []
         self.train_pipe = []
         if isinstance(in_x, str):
@@ -66,6 +72,11 @@ class Chainer(Component):
 
         self.main = None
 
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._plans = {}
+
     def __getitem__(self, item):
         if isinstance(item, int):
             in_params, out_params, component = self.train_pipe[item]
@@ -170,6 +181,7 @@ class Chainer(Component):
             self.process_event = component.process_event
         if main:
             self.main = component
+        self._plans.clear()
         if self.forward_map.issuperset(in_x):
             self.pipe.append(((x_keys, in_x), out_params, component))
             self.forward_map = self.forward_map.union(out_params)
@@ -202,40 +214,103 @@ class Chainer(Component):
         return self._compute(*args, pipe=pipe, param_names=in_params, targets=targets)
 
     def __call__(self, *args):
-        return self._compute(*args, param_names=self.in_x, pipe=self.pipe, targets=self.out_params)
-
-    @staticmethod
-    def _compute(*args, param_names, pipe, targets):
-        expected = set(targets)
-        final_pipe = []
-        for (in_keys, in_params), out_params, component in reversed(pipe):
-            if expected.intersection(out_params):
-                expected = expected - set(out_params) | set(in_params)
-                final_pipe.append(((in_keys, in_params), out_params, component))
-        final_pipe.reverse()
-        if not expected.issubset(param_names):
-            raise RuntimeError(f'{expected} are required to compute {targets} but were not found in memory or inputs')
-        pipe = final_pipe
+        return self._compute(*args, param_names=self.in_x, pipe=self.pipe, targets=self.out_params,
+                             executor=self._get_executor())
 
-        mem = dict(zip(param_names, args))
+    def _get_executor(self) -> Optional[ThreadPoolExecutor]:
+        if not self.parallel:
+            return None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers)
+        return self._executor
+
+    def _get_plan(self, param_names: List[str], pipe: list, targets: List[str]) -> '_ExecutionPlan':
+        key = (tuple(param_names), id(pipe), tuple(targets))
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = _ExecutionPlan(param_names, pipe, targets)
+            self._plans[key] = plan
+        return plan
+
+    def _compute(self, *args, param_names, pipe, targets, executor: Optional[ThreadPoolExecutor] = None):
+        plan = self._get_plan(param_names, pipe, targets)
+
+        mem = [None] * plan.n_slots
+        n_args = min(len(args), len(param_names))
+        mem[:n_args] = args[:n_args]
         del args
 
-        for (in_keys, in_params), out_params, component in pipe:
-            x = [mem[k] for k in in_params]
-            if in_keys:
-                res = component(**dict(zip(in_keys, x)))
-            else:
-                res = component(*x)
-            if len(out_params) == 1:
-                mem[out_params[0]] = res
-            else:
-                mem.update(zip(out_params, res))
+        if executor is not None and len(plan.steps) > 1:
+            self._compute_parallel(mem, plan, executor)
+        else:
+            for component, in_keys, in_slots, out_slots in plan.steps:
+                x = [mem[i] for i in in_slots]
+                if in_keys:
+                    res = component(**dict(zip(in_keys, x)))
+                else:
+                    res = component(*x)
+                if len(out_slots) == 1:
+                    mem[out_slots[0]] = res
+                else:
+                    for i, r in zip(out_slots, res):
+                        mem[i] = r
 
-        res = [mem[k] for k in targets]
+        res = [mem[i] for i in plan.target_slots]
         if len(res) == 1:
             res = res[0]
         return res
 
+    @staticmethod
+    def _compute_parallel(mem: list, plan: '_ExecutionPlan', executor: ThreadPoolExecutor) -> None:
+        """Runs steps of the ``plan`` as a dependency graph and puts their outputs into ``mem``.
+
+        Every component input is bound to a memory slot written by exactly one step (or by the pipeline inputs),
+        so the results are the same as in the sequential mode even if some variable names are reused.
+        """
+        steps = plan.steps
+        dependants = [[] for _ in steps]
+        waiting = []
+        for i, (component, in_keys, in_slots, out_slots) in enumerate(steps):
+            deps = {plan.producers[s] for s in in_slots} - {None}
+            for j in deps:
+                dependants[j].append(i)
+            waiting.append(len(deps))
+
+        running = {}
+
+        def submit(i: int) -> None:
+            component, in_keys, in_slots, out_slots = steps[i]
+            x = [mem[s] for s in in_slots]
+            if in_keys:
+                future = executor.submit(component, **dict(zip(in_keys, x)))
+            else:
+                future = executor.submit(component, *x)
+            running[future] = i
+
+        for i, count in enumerate(waiting):
+            if count == 0:
+                submit(i)
+
+        try:
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    out_slots = steps[i][3]
+                    res = future.result()
+                    if len(out_slots) == 1:
+                        mem[out_slots[0]] = res
+                    else:
+                        for s, r in zip(out_slots, res):
+                            mem[s] = r
+                    for j in dependants[i]:
+                        waiting[j] -= 1
+                        if waiting[j] == 0:
+                            submit(j)
+        finally:
+            for future in running:
+                future.cancel()
+
     def batched_call(self, *args: Reversible, batch_size: int = 16) -> Union[list, Tuple[list, ...]]:
         """
         Partitions data into mini-batches and applies :meth:`__call__` to each batch.
@@ -296,6 +371,11 @@ class Chainer(Component):
             self.train_pipe.clear()
         if hasattr(self, 'pipe'):
             self.pipe.clear()
+        if hasattr(self, '_plans'):
+            self._plans.clear()
+        if getattr(self, '_executor', None) is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         super().destroy()
 
     def serialize(self) -> bytes:
@@ -308,3 +388,42 @@ class Chainer(Component):
         data = pickle.loads(data)
         for in_params, out_params, component in self.train_pipe:
             component.deserialize(data)
+
+
+class _ExecutionPlan:
+    """Compiled routine for computing ``targets`` from ``param_names`` with the ``pipe`` components.
+
+    Components that are not needed to compute ``targets`` are pruned, and every variable name is resolved to an index
+    of a slot in a flat memory list, so that no name lookups are made while computing.
+
+    Attributes:
+        steps: list of ``(component, in_keys, in_slots, out_slots)`` tuples in the order of execution
+        n_slots: size of the memory list
+        target_slots: memory slots of the ``targets``
+        producers: index of a step that writes each memory slot or ``None`` for the pipeline inputs
+    """
+    __slots__ = ('steps', 'n_slots', 'target_slots', 'producers')
+
+    def __init__(self, param_names: List[str], pipe: list, targets: List[str]) -> None:
+        expected = set(targets)
+        final_pipe = []
+        for (in_keys, in_params), out_params, component in reversed(pipe):
+            if expected.intersection(out_params):
+                expected = expected - set(out_params) | set(in_params)
+                final_pipe.append(((in_keys, in_params), out_params, component))
+        final_pipe.reverse()
+        if not expected.issubset(param_names):
+            raise RuntimeError(f'{expected} are required to compute {targets} but were not found in memory or inputs')
+
+        slots = {name: i for i, name in enumerate(param_names)}
+        self.producers: List[Optional[int]] = [None] * len(param_names)
+        self.steps = []
+        for (in_keys, in_params), out_params, component in final_pipe:
+            in_slots = tuple(slots[k] for k in in_params)
+            out_slots = tuple(range(len(self.producers), len(self.producers) + len(out_params)))
+            self.producers += [len(self.steps)] * len(out_params)
+            slots.update(zip(out_params, out_slots))
+            self.steps.append((component, tuple(in_keys), in_slots, out_slots))
+
+        self.n_slots = len(self.producers)
+        self.target_slots = tuple(slots[k] for k in targets)
@@ -15,7 +15,7 @@
 from collections import Counter, defaultdict, Iterable
 from itertools import chain
 from logging import getLogger
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Union
 
 import numpy as np
 
@@ -56,26 +56,27 @@ class SimpleVocabulary(Estimator):
         tokens = chain(*args)
         # filter(None, <>) -- to filter empty tokens
         self.freqs = Counter(filter(None, flatten_str_batch(tokens)))
-        for special_token in self.special_tokens:
-            self._t2i[special_token] = self.count
-            self._i2t.append(special_token)
-            self.count += 1
-        for token, freq in self.freqs.most_common()[:self._max_tokens]:
-            if freq >= self._min_freq:
-                self._t2i[token] = self.count
-                self._i2t.append(token)
-                self.count += 1
+        self._add_tokens(list(self.special_tokens) +
+                         [token for token, freq in self.freqs.most_common()[:self._max_tokens]
+                          if freq >= self._min_freq])
+
+    def _add_tokens(self, tokens: List[str]) -> None:
+        self._t2i.update(zip(tokens, range(self.count, self.count + len(tokens))))
+        self._i2t = np.concatenate([self._i2t, np.array(tokens, dtype=object)])
+        self.count += len(tokens)
 
     def _add_tokens_with_freqs(self, tokens, freqs):
         self.freqs = Counter()
         self.freqs.update(dict(zip(tokens, freqs)))
-        for token, freq in zip(tokens, freqs):
-            if freq >= self._min_freq or token in self.special_tokens:
-                self._t2i[token] = self.count
-                self._i2t.append(token)
-                self.count += 1
+        self._add_tokens([token for token, freq in zip(tokens, freqs)
+                          if freq >= self._min_freq or token in self.special_tokens])
 
     def __call__(self, batch, is_top=True, **kwargs):
+        if is_top:
+            looked_up_batch = self._fast_call(batch)
+            if looked_up_batch is not None:
+                return looked_up_batch
+
         if isinstance(batch, Iterable) and not isinstance(batch, str):
             looked_up_batch = [self(sample, is_top=False) for sample in batch]
         else:
@@ -85,6 +86,37 @@ class SimpleVocabulary(Estimator):
 
         return looked_up_batch
 
+    def _fast_call(self, batch) -> Optional[Union[list, np.ndarray]]:
+        """Look up the most common batches without recursion.
+
+        Indices of a numpy array are converted to nested lists of tokens and a two-level list of tokens or indices
+        is converted with one pass over its elements. Tokens batches are zero padded to a float32 matrix if
+        ``pad_with_zeros`` is set, the same way as :func:`~deeppavlov.core.data.utils.zero_pad` does.
+
+        Returns:
+            looked up batch or ``None`` if the batch has other structure
+        """
+        if isinstance(batch, np.ndarray) and batch.dtype.kind in 'iu' and batch.ndim:
+            return self._i2t[batch].tolist()
+        if not isinstance(batch, (list, tuple)) or not all(isinstance(sample, (list, tuple)) for sample in batch):
+            return None
+        first = next((token for sample in batch for token in sample), None)
+
+        if isinstance(first, str):
+            get, unk_index = self._t2i.get, self._unk_index
+            if not self._pad_with_zeros:
+                return [[get(token, unk_index) for token in sample] for sample in batch]
+            lengths = np.array([len(sample) for sample in batch])
+            indices = np.zeros((len(batch), lengths.max()), dtype=np.float32)
+            indices[np.arange(indices.shape[1]) < lengths[:, None]] = \
+                np.fromiter((get(token, unk_index) for sample in batch for token in sample),
+                            dtype=np.int32, count=lengths.sum())
+            return indices
+
+        if isinstance(first, (int, np.integer)) and not isinstance(first, bool):
+            return [self._i2t[np.asarray(sample, dtype=np.int64)].tolist() for sample in batch]
+        return None
+
     def save(self):
         log.info("[saving vocabulary to {}]".format(self.save_path))
         with self.save_path.open('wt', encoding='utf8') as f:
@@ -101,12 +133,15 @@ class SimpleVocabulary(Estimator):
         if self.load_path:
             if self.load_path.is_file():
                 log.info("[loading vocabulary from {}]".format(self.load_path))
-                tokens, counts = [], []
-                for ln in self.load_path.open('r', encoding='utf8'):
-                    token, cnt = self.load_line(ln)
-                    tokens.append(token)
-                    counts.append(int(cnt))
-                self._add_tokens_with_freqs(tokens, counts)
+                with self.load_path.open('r', encoding='utf8') as f:
+                    lines = f.read().split('\n')
+                if lines and not lines[-1]:
+                    lines.pop()
+                if self.freq_drop_load:
+                    tokens, counts = zip(*map(self.load_line, lines)) if lines else ((), ())
+                else:
+                    tokens, counts = zip(*(ln.split('\t', 1) for ln in lines)) if lines else ((), ())
+                self._add_tokens_with_freqs(tokens, list(map(int, counts)))
             elif not self.load_path.parent.is_dir():
                 raise ConfigError("Provided `load_path` for {} doesn't exist!".format(
                                   self.__class__.__name__))
@@ -159,6 +194,7 @@ class SimpleVocabulary(Estimator):
         unk_index = 0
         if self.unk_token in self.special_tokens:
             unk_index = self.special_tokens.index(self.unk_token)
+        self._unk_index = unk_index
         self._t2i = defaultdict(lambda: unk_index)
-        self._i2t = []
+        self._i2t = np.array([], dtype=object)
         self.count = 0
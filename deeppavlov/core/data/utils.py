@@ -284,10 +284,93 @@ def get_dimensions(batch) -> List[int]:
     return list(map(max, get_all_dimensions(batch)))
 
 
+# ragged batches with fewer rows than that are copied row by row, because fixed costs of a vectorized copy
+# are higher than the loop for them
+_MIN_VECTORIZED_ROWS = 16
+
+
+def _is_number(item) -> bool:
+    return isinstance(item, (int, float, np.number))
+
+
+def _is_sequence(item) -> bool:
+    # the check for common types goes first, because isinstance checks of ABCs are slow
+    return isinstance(item, (list, tuple, np.ndarray)) or isinstance(item, Sized) and not isinstance(item, str)
+
+
+def _has_many_tokens(batch) -> bool:
+    """Checks if a batch can be a batch of sequences of tokens with enough tokens for a vectorized copy."""
+    return bool(len(batch)) and _is_sequence(batch[0]) and bool(len(batch[0])) and _is_sequence(batch[0][0]) and \
+        sum(len(sample) for sample in batch if _is_sequence(sample)) >= _MIN_VECTORIZED_ROWS
+
+
+def _ragged_depth(batch) -> int:
+    """Returns 2 for a list of sequences of numbers, 3 for a list of sequences of sequences of numbers
+    and 0 for batches of any other structure."""
+    if isinstance(batch, np.ndarray) or not all(map(_is_sequence, batch)):
+        return 0
+    sample = next((sample for sample in batch if len(sample)), None)
+    if sample is None:
+        return 2
+    item = next(iter(sample))
+    if _is_number(item):
+        return 2
+    if _is_sequence(item):
+        leaf = next((leaf for token in sample for leaf in token), None)
+        if leaf is None or _is_number(leaf):
+            return 3
+    return 0
+
+
+def _flatten(batch: Sequence, depth: int, dtype, count: int) -> np.ndarray:
+    """All numbers of a ragged batch of the given depth in one flat array of ``count`` elements."""
+    sequences = batch
+    for level in range(1, depth):
+        sample = next((seq for seq in sequences if len(seq)), None)
+        if sample is None:
+            return np.empty(0, dtype=dtype)
+        if isinstance(sample, np.ndarray):
+            return np.concatenate(sequences, axis=None)
+        sequences = chain.from_iterable(sequences)
+        if level < depth - 1:
+            sequences = list(sequences)
+    return np.fromiter(sequences, dtype=dtype, count=count)
+
+
+def _flat_offsets(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Indices ``starts[i] + j`` for all ``i`` and ``0 <= j < lengths[i]`` in one flat array."""
+    total = lengths.sum()
+    return np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+
+
 def zero_pad(batch, zp_batch=None, dtype=np.float32, padding=0):
     if zp_batch is None:
+        depth = _ragged_depth(batch) if len(batch) >= _MIN_VECTORIZED_ROWS or _has_many_tokens(batch) else 0
+        if depth == 2 and len(batch) >= _MIN_VECTORIZED_ROWS:
+            lengths = np.fromiter(map(len, batch), dtype=np.int64, count=len(batch))
+            max_len = lengths.max()
+            zp_batch = np.full((len(batch), max_len), padding, dtype=dtype)
+            flat = _flatten(batch, 2, dtype, lengths.sum())
+            zp_batch.ravel()[_flat_offsets(np.arange(len(batch)) * max_len, lengths)] = flat
+            return zp_batch
+        if depth == 3 and sum(map(len, batch)) >= _MIN_VECTORIZED_ROWS:
+            lengths = np.fromiter(map(len, batch), dtype=np.int64, count=len(batch))
+            tokens = list(chain.from_iterable(batch))
+            token_lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+            max_len, max_token_len = lengths.max(), token_lengths.max(initial=0)
+            zp_batch = np.full((len(batch), max_len, max_token_len), padding, dtype=dtype)
+            if max_token_len == 0:
+                return zp_batch
+            token_offsets = _flat_offsets(np.arange(len(batch)) * max_len, lengths)
+            flat = _flatten(batch, 3, dtype, token_lengths.sum())
+            if len(tokens) and token_lengths.min() == max_token_len:
+                # all the tokens have the same length, so they are copied as whole rows
+                zp_batch.reshape(-1, max_token_len)[token_offsets] = flat.reshape(-1, max_token_len)
+            else:
+                zp_batch.ravel()[_flat_offsets(token_offsets * max_token_len, token_lengths)] = flat
+            return zp_batch
         dims = get_dimensions(batch)
-        zp_batch = np.ones(dims, dtype=dtype) * padding
+        zp_batch = np.full(dims, padding, dtype=dtype)
     if zp_batch.ndim == 1:
         zp_batch[:len(batch)] = batch
     else:
@@ -321,37 +404,48 @@ def flatten_str_batch(batch):
 
 def zero_pad_truncate(batch, max_len, pad='post', trunc='post', dtype=np.float32):
     batch_size = len(batch)
-    if isinstance(batch[0][0], (int, np.int)):
-        padded_batch = np.zeros([batch_size, max_len], dtype=np.int32)
-        for n, utterance in enumerate(batch):
-            if len(utterance) > max_len:
-                if trunc == 'post':
-                    padded_batch[n, :] = utterance[:max_len]
-                elif trunc == 'pre':
-                    padded_batch[n, :] = utterance[-max_len:]
-            else:
-                if pad == 'post':
-                    padded_batch[n, :len(utterance)] = utterance
-                elif pad == 'pre':
-                    padded_batch[n, -len(utterance):] = utterance
+    if isinstance(batch[0][0], (int, np.integer)) or batch_size < _MIN_VECTORIZED_ROWS:
+        # rows of integers are copied by a single slice assignment each, which is not slower than a vectorized copy
+        return _zero_pad_truncate_rows(batch, max_len, pad, trunc, dtype)
+
+    truncated = np.fromiter(map(len, batch), dtype=np.int64, count=batch_size) > max_len
+    kept = [utterance[-max_len:] if trunc == 'pre' else utterance[:max_len] for utterance in batch]
+    # rows with unknown padding or truncation modes are left empty
+    empty = truncated & (trunc not in ('post', 'pre')) | ~truncated & (pad not in ('post', 'pre'))
+    if empty.any():
+        kept = [utterance[:0] if e else utterance for utterance, e in zip(kept, empty)]
+    lengths = np.fromiter(map(len, kept), dtype=np.int64, count=batch_size)
+
+    starts = np.arange(batch_size) * max_len
+    if pad == 'pre':
+        starts += max_len - lengths
+    offsets = _flat_offsets(starts, lengths)
+
+    n_features = len(batch[0][0])
+    padded_batch = np.zeros([batch_size, max_len, n_features], dtype=dtype)
+    if n_features == 0:
+        return padded_batch
+    flat = _flatten(kept, 3, dtype, lengths.sum() * n_features)
+    padded_batch.reshape(-1, n_features)[offsets] = flat.reshape(-1, n_features)
+    return padded_batch
+
+
+def _zero_pad_truncate_rows(batch, max_len, pad, trunc, dtype):
+    if isinstance(batch[0][0], (int, np.integer)):
+        padded_batch = np.zeros([len(batch), max_len], dtype=np.int32)
     else:
-        n_features = len(batch[0][0])
-        padded_batch = np.zeros([batch_size, max_len, n_features], dtype=dtype)
-        for n, utterance in enumerate(batch):
-            if len(utterance) > max_len:
-                if trunc == 'post':
-                    for k, token_features in enumerate(utterance[:max_len]):
-                        padded_batch[n, k] = token_features
-                elif trunc == 'pre':
-                    for k, token_features in enumerate(utterance[-max_len:]):
-                        padded_batch[n, k] = token_features
-            else:
-                if pad == 'post':
-                    for k, token_features in enumerate(utterance):
-                        padded_batch[n, k] = token_features
-                elif pad == 'pre':
-                    for k, token_features in enumerate(utterance):
-                        padded_batch[n, k + max_len - len(utterance)] = token_features
+        padded_batch = np.zeros([len(batch), max_len, len(batch[0][0])], dtype=dtype)
+    for n, utterance in enumerate(batch):
+        if len(utterance) > max_len:
+            if trunc == 'post':
+                padded_batch[n] = utterance[:max_len]
+            elif trunc == 'pre':
+                padded_batch[n] = utterance[-max_len:]
+        elif len(utterance):
+            if pad == 'post':
+                padded_batch[n, :len(utterance)] = utterance
+            elif pad == 'pre':
+                padded_batch[n, max_len - len(utterance):] = utterance
     return padded_batch
 
 
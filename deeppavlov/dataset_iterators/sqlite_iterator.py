@@ -42,8 +42,8 @@ class SQLiteDataIterator(DataFittingIterator):
     Attributes:
         connect: a DB connection
         db_name: a DB name
-        doc_ids: DB document ids
-        doc2index: a dictionary of document indices and their titles
+        doc_ids: DB document ids, read from the DB on first access
+        doc2index: a dictionary of document indices and their titles, built on first access
         batch_size: a number of samples in a single batch
         shuffle: whether to shuffle data during batching
         random: an instance of :class:`Random` class.
@@ -67,12 +67,24 @@ class SQLiteDataIterator(DataFittingIterator):
                 'Check that DB path was created correctly and is not empty. '
                 'Check that a correct dataset_format is passed to the ODQAReader config',)
             raise e
-        self.doc_ids = self.get_doc_ids()
-        self.doc2index = self.map_doc2idx()
+        self._doc_ids: Optional[List[Any]] = None
+        self._doc2index: Optional[Dict[Any, int]] = None
         self.batch_size = batch_size
         self.shuffle = shuffle
         self.random = Random(seed)
 
+    @property
+    def doc_ids(self) -> List[Any]:
+        if self._doc_ids is None:
+            self._doc_ids = self.get_doc_ids()
+        return self._doc_ids
+
+    @property
+    def doc2index(self) -> Dict[Any, int]:
+        if self._doc2index is None:
+            self._doc2index = self.map_doc2idx()
+        return self._doc2index
+
     @overrides
     def get_doc_ids(self) -> List[Any]:
         """Get document ids.
@@ -132,6 +144,30 @@ class SQLiteDataIterator(DataFittingIterator):
         cursor.close()
         return result if result is None else result[0]
 
+    def get_docs_content(self, doc_ids: List[Any], chunk_size: int = 900) -> List[Optional[str]]:
+        """Get contents of several documents with ``WHERE id IN (...)`` queries.
+
+        Args:
+            doc_ids: document ids
+            chunk_size: maximum number of ids in a single query, it has to be less than SQLite host parameters limit
+
+        Returns:
+            documents contents in the order of ``doc_ids``, ``None`` for ids that are not found
+
+        """
+        unique_ids = list(dict.fromkeys(doc_ids))
+        contents = {}
+        cursor = self.connect.cursor()
+        for i in range(0, len(unique_ids), chunk_size):
+            chunk = unique_ids[i:i + chunk_size]
+            cursor.execute(
+                "SELECT id, text FROM {} WHERE id IN ({})".format(self.db_name, ', '.join('?' * len(chunk))),
+                chunk
+            )
+            contents.update(cursor.fetchall())
+        cursor.close()
+        return [contents.get(doc_id) for doc_id in doc_ids]
+
     @overrides
     def gen_batches(self, batch_size: int, shuffle: bool = None) \
             -> Generator[Tuple[List[str], List[int]], Any, None]:
@@ -160,13 +196,13 @@ class SQLiteDataIterator(DataFittingIterator):
             batches = [_doc_ids]
 
         for i, doc_ids in enumerate(batches):
-            docs = [self.get_doc_content(doc_id) for doc_id in doc_ids]
+            docs = self.get_docs_content(doc_ids)
             doc_nums = [self.doc2index[doc_id] for doc_id in doc_ids]
             yield docs, zip(doc_ids, doc_nums)
 
     def get_instances(self):
         """Get all data"""
         doc_ids = list(self.doc_ids)
-        docs = [self.get_doc_content(doc_id) for doc_id in doc_ids]
+        docs = self.get_docs_content(doc_ids)
         doc_nums = [self.doc2index[doc_id] for doc_id in doc_ids]
         return docs, zip(doc_ids, doc_nums)
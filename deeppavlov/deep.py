@@ -26,6 +26,7 @@ from deeppavlov.utils.alexa.server import run_alexa_default_agent
 from deeppavlov.utils.alice import start_alice_server
 from deeppavlov.utils.ms_bot_framework.server import run_ms_bf_default_agent
 from deeppavlov.utils.pip_wrapper import install_from_config
+from deeppavlov.utils.server.async_server import start_async_model_server
 from deeppavlov.utils.server.server import start_model_server
 from deeppavlov.utils.telegram.telegram_ui import interact_model_by_telegram
 
@@ -62,8 +63,11 @@ parser.add_argument("--cert", default=None, help="ssl certificate", type=str)
 
 parser.add_argument("-p", "--port", default=None, help="api port", type=str)
 
-parser.add_argument("--api-mode", help="rest api mode: 'basic' with batches or 'alice' for  Yandex.Dialogs format",
-                    type=str, default='basic', choices={'basic', 'alice'})
+parser.add_argument("--api-mode", help="rest api mode: 'basic' with batches, 'async' with batches and several model "
+                                       "worker processes or 'alice' for  Yandex.Dialogs format",
+                    type=str, default='basic', choices={'basic', 'async', 'alice'})
+parser.add_argument("-w", "--workers", default=None, help="number of model worker processes for the 'async' api mode "
+                                                         "and the predict mode", type=int)
 
 
 def main():
@@ -118,10 +122,13 @@ def main():
         alice = args.api_mode == 'alice'
         if alice:
             start_alice_server(pipeline_config_path, https, ssl_key, ssl_cert, port=args.port)
+        elif args.api_mode == 'async':
+            start_async_model_server(pipeline_config_path, https, ssl_key, ssl_cert, port=args.port,
+                                     n_workers=args.workers)
         else:
             start_model_server(pipeline_config_path, https, ssl_key, ssl_cert, port=args.port)
     elif args.mode == 'predict':
-        predict_on_stream(pipeline_config_path, args.batch_size, args.file_path)
+        predict_on_stream(pipeline_config_path, args.batch_size, args.file_path, n_workers=args.workers or 1)
     elif args.mode == 'install':
         install_from_config(pipeline_config_path)
     elif args.mode == 'crossval':
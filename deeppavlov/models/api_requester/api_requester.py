@@ -1,34 +1,141 @@
 import asyncio
-from typing import Any, List, Dict, AsyncIterable
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger, DEBUG
+from threading import Lock
+from typing import Any, List, Dict, AsyncIterable, Optional, Sequence
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from deeppavlov.core.common.registry import register
 from deeppavlov.core.models.component import Component
 
+log = getLogger(__name__)
+
+
+class LatencyHistogram:
+    """Thread-safe histogram of request latencies with fixed buckets.
+
+    Args:
+        buckets: ascending upper bounds of buckets in seconds, latencies above the last bound are counted in an extra
+            overflow bucket
+
+    Attributes:
+        buckets: upper bounds of buckets in seconds
+        counts: number of observed latencies in every bucket, the last one is the overflow bucket
+        count: total number of observed latencies
+        total: sum of observed latencies in seconds
+    """
+
+    default_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1., 2.5, 5., 10.)
+
+    def __init__(self, buckets: Sequence[float] = default_buckets) -> None:
+        self.buckets = tuple(buckets)
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.total = 0.
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.buckets, latency)] += 1
+            self.count += 1
+            self.total += latency
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket that contains the ``q`` quantile, ``inf`` if it is in the overflow bucket."""
+        with self._lock:
+            rank, seen = q * self.count, 0
+            for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+                seen += count
+                if seen >= rank and seen:
+                    return bound
+        return 0.
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = {f'le_{bound:g}': count for bound, count in zip(self.buckets, self.counts)}
+            buckets['le_inf'] = self.counts[-1]
+            return {'count': self.count, 'total': self.total, 'buckets': buckets}
+
 
 @register('api_requester')
 class ApiRequester(Component):
     """Component for forwarding parameters to APIs
 
+    Requests are sent through a persistent :class:`requests.Session`, so connections to the API are kept alive
+    and reused between calls.
+
     Args:
         url: url of the API.
         out: count of expected returned values or their names in a chainer.
         param_names: list of parameter names for API requests.
         debatchify: if ``True``, single instances will be sent to the API endpoint instead of batches.
+        n_workers: maximum number of concurrent requests in ``debatchify`` mode, it is also the size of the
+            connections pool.
+        timeout: number of seconds to wait for the API to respond, waits indefinitely if ``None``.
 
     Attributes:
         url: url of the API.
         out: count of expected returned values.
         param_names: list of parameter names for API requests.
         debatchify: if True, single instances will be sent to the API endpoint instead of batches.
+        n_workers: maximum number of concurrent requests in ``debatchify`` mode.
+        timeout: number of seconds to wait for the API to respond.
+        latency: histogram of latencies of single HTTP requests.
     """
     def __init__(self, url: str, out: [int, list], param_names: [list, tuple]=(), debatchify: bool=False,
-                 *args, **kwargs):
+                 n_workers: int = 10, timeout: Optional[float] = None, *args, **kwargs):
         self.url = url
         self.param_names = param_names
         self.out_count = out if isinstance(out, int) else len(out)
         self.debatchify = debatchify
+        self.n_workers = n_workers
+        self.timeout = timeout
+        self.latency = LatencyHistogram()
+        self._session: Optional[requests.Session] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._init_lock = Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session with a pool of :attr:`n_workers` keep-alive connections, created on the first use."""
+        if self._session is None:
+            with self._init_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(self.n_workers, 1))
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Bounded pool of threads that send requests in ``debatchify`` mode, created on the first use."""
+        if self._executor is None:
+            with self._init_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max(self.n_workers, 1))
+        return self._executor
+
+    def _post(self, data: Any) -> Any:
+        """Send a single request and return its result parsed as json."""
+        start = time.perf_counter()
+        try:
+            return self.session.post(self.url, json=data, timeout=self.timeout).json()
+        finally:
+            self.latency.observe(time.perf_counter() - start)
 
     def __call__(self, *args: List[Any], **kwargs: Dict[str, Any]):
         """
@@ -50,14 +157,15 @@ class ApiRequester(Component):
 
             assert batch_size > 0
 
-            async def collect():
-                return [j async for j in self.get_async_response(data, batch_size)]
-
-            loop = asyncio.get_event_loop()
-            response = loop.run_until_complete(collect())
+            response = list(self.executor.map(self._post, [{k: v[i] for k, v in data.items()}
+                                                           for i in range(batch_size)]))
 
         else:
-            response = requests.post(self.url, json=data).json()
+            response = self._post(data)
+
+        if log.isEnabledFor(DEBUG):
+            log.debug(f'{self.url} latency: mean {self.latency.mean:.3f}s, p95 {self.latency.quantile(0.95):g}s '
+                      f'over {self.latency.count} requests')
 
         if self.out_count > 1:
             response = list(zip(*response))
@@ -77,13 +185,20 @@ class ApiRequester(Component):
         loop = asyncio.get_event_loop()
         futures = [
             loop.run_in_executor(
-                None,
-                requests.post,
-                self.url,
-                None,
+                self.executor,
+                self._post,
                 {k: v[i] for k, v in data.items()}
             )
             for i in range(batch_size)
         ]
         for r in await asyncio.gather(*futures):
-            yield r.json()
+            yield r
+
+    def destroy(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        super().destroy()
@@ -1,11 +1,13 @@
 import concurrent
-from concurrent.futures import ProcessPoolExecutor
+import time
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
-from typing import List
+from threading import Lock
+from typing import List, Optional
 
 from deeppavlov.core.common.registry import register
 from deeppavlov.core.models.component import Component
-from deeppavlov.models.api_requester import ApiRequester
+from deeppavlov.models.api_requester import ApiRequester, LatencyHistogram
 
 logger = getLogger(__name__)
 
@@ -14,18 +16,32 @@ logger = getLogger(__name__)
 class ApiRouter(Component):
     """A helper class for running multiple API requesters on the same data in parallel
 
+    Requesters are run in a pool of threads that is created on the first call and reused by the following calls.
+
     Args:
         api_requesters: list of ApiRequester objects
-        n_workers: The maximum number of subprocesses to run
+        n_workers: The maximum number of threads to run
 
     Attributes:
         api_requesters: list of ApiRequester objects
-        n_workers: The maximum number of subprocesses to run
+        n_workers: The maximum number of threads to run
+        latency: histogram of latencies of calls to all the API requesters
     """
 
     def __init__(self, api_requesters: List[ApiRequester], n_workers: int=1, *args, **kwargs):
         self.api_requesters = api_requesters
         self.n_workers = n_workers
+        self.latency = LatencyHistogram()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._init_lock = Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._init_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max(self.n_workers, 1))
+        return self._executor
 
     def __call__(self, *args):
         """
@@ -36,18 +52,25 @@ class ApiRouter(Component):
         Returns:
             results of the requests
         """
-        with ProcessPoolExecutor(self.n_workers) as executor:
-            futures = [executor.submit(api_requester, *args) for api_requester
-                       in
-                       self.api_requesters]
-
-            concurrent.futures.wait(futures)
-            results = []
-            for future, api_requester in zip(futures, self.api_requesters):
-                result = future.result()
-                if api_requester.out_count > 1:
-                    results += result
-                else:
-                    results.append(result)
+        start = time.perf_counter()
+        futures = [self.executor.submit(api_requester, *args) for api_requester
+                   in
+                   self.api_requesters]
+
+        concurrent.futures.wait(futures)
+        results = []
+        for future, api_requester in zip(futures, self.api_requesters):
+            result = future.result()
+            if api_requester.out_count > 1:
+                results += result
+            else:
+                results.append(result)
+        self.latency.observe(time.perf_counter() - start)
 
         return results
+
+    def destroy(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        super().destroy()
@@ -13,10 +13,9 @@
 # limitations under the License.
 
 from logging import getLogger
-from typing import List, Dict, Union
+from typing import List, Dict, Union, Optional
 from collections import OrderedDict
 import re
-from operator import itemgetter
 
 import numpy as np
 import tensorflow as tf
@@ -28,6 +27,7 @@ from deeppavlov.core.commands.utils import expand_path
 from deeppavlov.core.common.registry import register
 from deeppavlov.models.bert.bert_classifier import BertClassifierModel
 from deeppavlov.core.models.tf_model import LRScheduledTFModel
+from deeppavlov.models.ranking.ann_index import IVFIndex, base_fingerprint, search_or_exact
 
 logger = getLogger(__name__)
 
@@ -359,11 +359,18 @@ class BertSepRankerPredictor(BertSepRankerModel):
         conts: list of strings containing the base of text contexts
         cont_vecs: BERT vector respresentations of `conts`, if is `None` it will be build
         cont_features: features of `conts` to build their BERT vector representations
+        resp_index: optional :class:`~deeppavlov.models.ranking.ann_index.IVFIndex` of `resp_vecs`, it is built
+            and saved if it is not loaded or was built over other vectors
+        cont_index: optional :class:`~deeppavlov.models.ranking.ann_index.IVFIndex` of `cont_vecs`, it is built
+            and saved if it is not loaded or was built over other vectors
+        top_n: number of candidates that are taken from the base to be reranked in `interact_mode` 1, 2 and 3
     """
 
     def __init__(self, bert_config_file, interact_mode=0, batch_size=32,
                  resps=None, resp_features=None,  resp_vecs=None,
-                 conts=None,  cont_features=None, cont_vecs=None, **kwargs) -> None:
+                 conts=None,  cont_features=None, cont_vecs=None,
+                 resp_index: Optional[IVFIndex] = None, cont_index: Optional[IVFIndex] = None, top_n: int = 10,
+                 **kwargs) -> None:
         super().__init__(bert_config_file=bert_config_file,
                          **kwargs)
 
@@ -375,6 +382,9 @@ class BertSepRankerPredictor(BertSepRankerModel):
         self.conts = conts
         self.cont_vecs = cont_vecs
         self.cont_features = cont_features
+        self.resp_index = resp_index
+        self.cont_index = cont_index
+        self.top_n = top_n
 
         if self.resps is not None and self.resp_vecs is None:
             logger.info("Building BERT vector representations for the response base...")
@@ -392,6 +402,20 @@ class BertSepRankerPredictor(BertSepRankerModel):
             self.cont_vecs /= np.linalg.norm(self.cont_vecs, axis=1, keepdims=True)
             np.save(self.save_path / "cont_vecs", self.resp_vecs)
 
+        self._fit_index(self.resp_index, self.resp_vecs)
+        self._fit_index(self.cont_index, self.cont_vecs)
+
+    @staticmethod
+    def _fit_index(index: Optional[IVFIndex], vecs: Optional[np.ndarray]) -> None:
+        if index is None or vecs is None:
+            return
+        fingerprint = base_fingerprint(np.asarray(vecs, dtype=np.float32))
+        if index.fingerprint == fingerprint:
+            return
+        index.fit(vecs, fingerprint)
+        if index.save_path is not None:
+            index.save()
+
     def train_on_batch(self, features, y):
         pass
 
@@ -436,33 +460,45 @@ class BertSepRankerPredictor(BertSepRankerModel):
 
         bs = ctx_vec.shape[0]
         if self.interact_mode == 0:
-            s = ctx_vec @ self.resp_vecs.T
-            ids = np.argmax(s, 1)
-            rsp = [[self.resps[ids[i]] for i in range(bs)], [s[i][ids[i]] for i in range(bs)]]
+            ids = self._top_n(ctx_vec, self.resp_vecs, self.resp_index, 1)
+            s = self._scores(ctx_vec, self.resp_vecs, ids)
+            rsp = [[self.resps[ids[i, 0]] for i in range(bs)], [s[i, 0] for i in range(bs)]]
         if self.interact_mode == 1:
-            sr = (ctx_vec @ self.resp_vecs.T + 1) / 2
-            sc = (ctx_vec @ self.cont_vecs.T + 1) / 2
-            ids = np.argsort(sr, 1)[:, -10:]
-            sc = [sc[i, ids[i]] for i in range(bs)]
-            ids = [sorted(zip(ids[i], sc[i]), key=itemgetter(1), reverse=True) for i in range(bs)]
-            sc = [list(map(lambda x: x[1], ids[i])) for i in range(bs)]
-            ids = [list(map(lambda x: x[0], ids[i])) for i in range(bs)]
-            rsp = [[self.resps[ids[i][0]] for i in range(bs)], [float(sc[i][0]) for i in range(bs)]]
+            ids = self._top_n(ctx_vec, self.resp_vecs, self.resp_index, self.top_n)
+            sc = (self._scores(ctx_vec, self.cont_vecs, ids) + 1) / 2
+            best = np.argmax(sc, 1)
+            rsp = [[self.resps[ids[i, best[i]]] for i in range(bs)], [float(sc[i, best[i]]) for i in range(bs)]]
         if self.interact_mode == 2:
-            sr = (ctx_vec @ self.resp_vecs.T + 1) / 2
-            sc = (ctx_vec @ self.cont_vecs.T + 1) / 2
-            ids = np.argsort(sc, 1)[:, -10:]
-            sr = [sr[i, ids[i]] for i in range(bs)]
-            ids = [sorted(zip(ids[i], sr[i]), key=itemgetter(1), reverse=True) for i in range(bs)]
-            sr = [list(map(lambda x: x[1], ids[i])) for i in range(bs)]
-            ids = [list(map(lambda x: x[0], ids[i])) for i in range(bs)]
-            rsp = [[self.resps[ids[i][0]] for i in range(bs)], [float(sr[i][0]) for i in range(bs)]]
+            ids = self._top_n(ctx_vec, self.cont_vecs, self.cont_index, self.top_n)
+            sr = (self._scores(ctx_vec, self.resp_vecs, ids) + 1) / 2
+            best = np.argmax(sr, 1)
+            rsp = [[self.resps[ids[i, best[i]]] for i in range(bs)], [float(sr[i, best[i]]) for i in range(bs)]]
         if self.interact_mode == 3:
-            sr = (ctx_vec @ self.resp_vecs.T + 1) / 2
-            sc = (ctx_vec @ self.cont_vecs.T + 1) / 2
+            if self.resp_index is None and self.cont_index is None:
+                sr = (ctx_vec @ self.resp_vecs.T + 1) / 2
+                sc = (ctx_vec @ self.cont_vecs.T + 1) / 2
+                ids = np.broadcast_to(np.arange(len(self.resp_vecs)), sr.shape)
+            else:
+                # candidates from both bases are reranked with the exact mean score
+                ids = np.concatenate([self._top_n(ctx_vec, self.resp_vecs, self.resp_index, self.top_n),
+                                      self._top_n(ctx_vec, self.cont_vecs, self.cont_index, self.top_n)], axis=1)
+                sr = (self._scores(ctx_vec, self.resp_vecs, ids) + 1) / 2
+                sc = (self._scores(ctx_vec, self.cont_vecs, ids) + 1) / 2
             s = (sr + sc) / 2
-            ids = np.argmax(s, 1)
-            rsp = [[self.resps[ids[i]] for i in range(bs)], [float(s[i][ids[i]]) for i in range(bs)]]
+            best = np.argmax(s, 1)
+            rsp = [[self.resps[ids[i, best[i]]] for i in range(bs)], [float(s[i, best[i]]) for i in range(bs)]]
         # remove special tokens if they are presented
         rsp = [[el.replace('__eou__', '').replace('__eot__', '').strip() for el in rsp[0]], rsp[1]]
         return rsp
+
+    @staticmethod
+    def _top_n(ctx_vec: np.ndarray, vecs: np.ndarray, index: Optional[IVFIndex], n: int) -> np.ndarray:
+        """Get ids of `n` vectors of the base with the highest similarity scores for every context."""
+        return search_or_exact(ctx_vec, vecs, n, index)
+
+    @staticmethod
+    def _scores(ctx_vec: np.ndarray, vecs: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        """Get similarity scores of contexts with the given vectors of the base, missing ``-1`` ids get ``-inf``."""
+        scores = np.einsum('bd,bkd->bk', ctx_vec, vecs[ids])
+        scores[ids < 0] = -np.inf
+        return scores
@@ -15,7 +15,7 @@
 import warnings
 from logging import getLogger
 from operator import itemgetter
-from typing import List, Union, Tuple
+from typing import List, Union, Tuple, Optional
 
 from deeppavlov.core.common.chainer import Chainer
 from deeppavlov.core.common.registry import register
@@ -26,25 +26,43 @@ logger = getLogger(__name__)
 
 @register("logit_ranker")
 class LogitRanker(Component):
-    """Select best answer using squad model logits. Make several batches for a single batch, send each batch
-     to the squad model separately and get a single best answer for each batch.
+    """Select best answer using squad model logits. (context, question) pairs of all the questions of a batch
+     are regrouped into full batches of contexts of similar length, sent to the squad model and scattered back
+     to get a single best answer for each question.
 
      Args:
         squad_model: a loaded squad model
         batch_size: batch size to use with squad model
         sort_noans: whether to downgrade noans tokens in the most possible answers
+        confidence_threshold: if set, contexts are scored in the order they are given and the remaining contexts
+         of a question are skipped as soon as it gets an answer with a logit not less than the threshold
 
      Attributes:
         squad_model: a loaded squad model
         batch_size: batch size to use with squad model
+        confidence_threshold: a logit threshold for an early stop of scoring a question contexts
 
     """
 
     def __init__(self, squad_model: Union[Chainer, Component], batch_size: int = 50,
-                 sort_noans: bool = False, **kwargs):
+                 sort_noans: bool = False, confidence_threshold: Optional[float] = None, **kwargs):
         self.squad_model = squad_model
         self.batch_size = batch_size
         self.sort_noans = sort_noans
+        self.confidence_threshold = confidence_threshold
+
+    def _score(self, pairs: List[Tuple[int, int]], contexts_batch: List[List[str]],
+               questions_batch: List[List[str]], results: List[list]) -> None:
+        """Run the squad model on the ``pairs`` of (question number, context number) and put predictions
+        to ``results``."""
+        c_batch = [contexts_batch[i][j] for i, j in pairs]
+        q_batch = [questions_batch[i][j] for i, j in pairs]
+        for (i, j), prediction in zip(pairs, zip(*self.squad_model(c_batch, q_batch))):
+            results[i][j] = prediction
+
+    def _is_confident(self, results: list) -> bool:
+        return any(r is not None and r[2] >= self.confidence_threshold and (not self.sort_noans or r[0] != '')
+                   for r in results)
 
     def __call__(self, contexts_batch: List[List[str]], questions_batch: List[List[str]]) -> \
             Tuple[List[str], List[float]]:
@@ -64,19 +82,31 @@ class LogitRanker(Component):
                       ' Instead of returning Tuple(List[str], List[float] will return'
                       ' Tuple(List[List[str]], List[List[float]]).', FutureWarning)
 
+        results = [[None] * len(contexts) for contexts in contexts_batch]
+        pairs = [(i, j) for i, contexts in enumerate(contexts_batch) for j in range(len(contexts))]
+
+        if self.confidence_threshold is None:
+            # group contexts of similar length to minimize padding
+            pairs.sort(key=lambda p: len(contexts_batch[p[0]][p[1]]))
+            for start in range(0, len(pairs), self.batch_size):
+                self._score(pairs[start:start + self.batch_size], contexts_batch, questions_batch, results)
+        else:
+            pairs.sort(key=itemgetter(1))
+            while pairs:
+                batch, pairs = pairs[:self.batch_size], pairs[self.batch_size:]
+                self._score(batch, contexts_batch, questions_batch, results)
+                confident = {i for i, _ in batch if self._is_confident(results[i])}
+                if confident:
+                    pairs = [p for p in pairs if p[0] not in confident]
+
         batch_best_answers = []
         batch_best_answers_scores = []
-        for contexts, questions in zip(contexts_batch, questions_batch):
-            results = []
-            for i in range(0, len(contexts), self.batch_size):
-                c_batch = contexts[i: i + self.batch_size]
-                q_batch = questions[i: i + self.batch_size]
-                batch_predict = zip(*self.squad_model(c_batch, q_batch))
-                results += batch_predict
+        for instance_results in results:
+            instance_results = [r for r in instance_results if r is not None]
             if self.sort_noans:
-                results = sorted(results, key=lambda x: (x[0] != '', x[2]), reverse=True)
+                instance_results = sorted(instance_results, key=lambda x: (x[0] != '', x[2]), reverse=True)
             else:
-                results = sorted(results, key=itemgetter(2), reverse=True)
-            batch_best_answers.append(results[0][0])
-            batch_best_answers_scores.append(results[0][2])
+                instance_results = sorted(instance_results, key=itemgetter(2), reverse=True)
+            batch_best_answers.append(instance_results[0][0])
+            batch_best_answers_scores.append(instance_results[0][2])
         return batch_best_answers, batch_best_answers_scores
@@ -13,7 +13,6 @@
 # limitations under the License.
 
 from logging import getLogger
-from operator import itemgetter
 from typing import List, Any, Tuple
 
 import numpy as np
@@ -46,8 +45,9 @@ class PopRanker(Component):
          (``False``)
 
     Attributes:
-        pop_dict: a map of article titles to their popularity
-        mean_pop: mean popularity of all popularities in :attr:`pop_dict`, use it when popularity is not found
+        pop_index: a map of article titles to their positions in :attr:`pops`
+        pops: an array of article popularities followed by :attr:`mean_pop`
+        mean_pop: mean popularity of all articles, use it when popularity is not found
         clf: a loaded logistic regression classifier
         top_n: a number of doc ids to return
         active: whether to return a number specified by :attr:`top_n` or all ids
@@ -58,8 +58,13 @@ class PopRanker(Component):
                  **kwargs) -> None:
         pop_dict_path = expand_path(pop_dict_path)
         logger.info(f"Reading popularity dictionary from {pop_dict_path}")
-        self.pop_dict = read_json(pop_dict_path)
-        self.mean_pop = np.mean(list(self.pop_dict.values()))
+        pop_dict = read_json(pop_dict_path)
+        self.pop_index = {title: i for i, title in enumerate(pop_dict)}
+        self.pops = np.empty(len(pop_dict) + 1)
+        self.pops[:-1] = list(pop_dict.values())
+        self.mean_pop = np.mean(self.pops[:-1])
+        self.pops[-1] = self.mean_pop
+        del pop_dict
         load_path = expand_path(load_path)
         logger.info(f"Loading popularity ranker from {load_path}")
         self.clf = joblib.load(load_path)
@@ -79,25 +84,27 @@ class PopRanker(Component):
             top doc ids of pop ranker and their corresponding scores
 
         """
+        lengths = [len(instance_ids) for instance_ids in input_doc_ids]
+        flat_ids = [idx for instance_ids in input_doc_ids for idx in instance_ids]
+        if not flat_ids:
+            return [[] for _ in input_doc_ids], [[] for _ in input_doc_ids]
+
+        missing = len(self.pops) - 1
+        pops = self.pops[np.fromiter((self.pop_index.get(idx, missing) for idx in flat_ids),
+                                     dtype=np.int64, count=len(flat_ids))]
+        scores = np.fromiter((score for instance_scores, length in zip(input_doc_scores, lengths)
+                              for score in instance_scores[:length]), dtype=float, count=len(flat_ids))
+        features = np.stack([scores, pops, scores * pops], axis=1)
+        probas = self.clf.predict_proba(features)[:, 1]
+
         batch_ids = []
         batch_scores = []
-        for instance_ids, instance_scores in zip(input_doc_ids, input_doc_scores):
-            instance_probas = []
-            for idx, score in zip(instance_ids, instance_scores):
-                pop = self.pop_dict.get(idx, self.mean_pop)
-                features = [score, pop, score * pop]
-                prob = self.clf.predict_proba([features])
-                instance_probas.append(prob[0][1])
-
-            sort = sorted(enumerate(instance_probas), key=itemgetter(1), reverse=True)
-            sorted_probas = [item[1] for item in sort]
-            sorted_ids = [instance_ids[item[0]] for item in sort]
-
+        for instance_ids, instance_probas in zip(input_doc_ids, np.split(probas, np.cumsum(lengths)[:-1])):
+            order = np.argsort(-instance_probas, kind='mergesort')
             if self.active:
-                sorted_ids = sorted_ids[:self.top_n]
-                sorted_probas = sorted_probas[:self.top_n]
+                order = order[:self.top_n]
 
-            batch_ids.append(sorted_ids)
-            batch_scores.append(sorted_probas)
+            batch_ids.append([instance_ids[i] for i in order])
+            batch_scores.append(instance_probas[order].tolist())
 
         return batch_ids, batch_scores
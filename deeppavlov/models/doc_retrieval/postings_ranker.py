@@ -0,0 +1,179 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from logging import getLogger
+from typing import List, Any, Tuple, Optional
+
+import numpy as np
+
+from deeppavlov.core.common.registry import register
+from deeppavlov.core.models.serializable import Serializable
+from deeppavlov.models.doc_retrieval.tfidf_ranker import TfidfRanker
+from deeppavlov.models.vectorizers.hashing_tfidf_vectorizer import HashingTfIdfVectorizer
+
+logger = getLogger(__name__)
+
+
+@register("tfidf_postings_ranker")
+class TfidfPostingsRanker(TfidfRanker, Serializable):
+    """Rank documents according to input strings using impact-ordered postings lists of a tfidf matrix.
+
+    Every row of the :class:`~deeppavlov.models.vectorizers.hashing_tfidf_vectorizer.HashingTfIdfVectorizer`
+    matrix is a postings list of a hash bucket. Postings of every bucket are sorted by decreasing tfidf value, and a
+    query is answered by reading postings of its hashes block by block until no unread posting can change the top
+    documents (a MaxScore-style early termination). Returned documents and scores are the same as the ones
+    of :class:`~deeppavlov.models.doc_retrieval.tfidf_ranker.TfidfRanker`, but only postings of the query hashes
+    are touched.
+
+    Args:
+        vectorizer: a vectorizer class
+        top_n: a number of doc ids to return
+        active: whether to return a number specified by :attr:`top_n` (``True``) or all ids
+         (``False``)
+        block_size: a number of postings of every query hash that are read before the first check for termination,
+         it is doubled after every next check
+        save_path: a path to a directory where sorted postings are saved
+        load_path: a path to a directory where sorted postings are loaded from, postings are built from
+         the vectorizer matrix if it doesn't exist
+
+    Attributes:
+        postings_docs: column numbers of postings of every hash in the order of decreasing tfidf values
+        postings_impacts: tfidf values of postings in the same order
+        postings_indptr: offsets of postings of every hash
+    """
+
+    def __init__(self, vectorizer: HashingTfIdfVectorizer, top_n=5, active: bool = True, block_size: int = 256,
+                 save_path: Optional[str] = None, load_path: Optional[str] = None, **kwargs):
+        TfidfRanker.__init__(self, vectorizer, top_n, active)
+        Serializable.__init__(self, save_path, load_path, mode=kwargs.get('mode', 'infer'))
+        self.block_size = block_size
+
+        if kwargs.get('mode', 'infer') == 'infer':
+            if self.load_path is not None and self.load_path.is_dir():
+                self.load()
+            else:
+                self.build()
+                if self.save_path is not None:
+                    self.save()
+
+    def build(self) -> None:
+        """Sort postings of every hash of the vectorizer matrix by decreasing tfidf values."""
+        logger.info("Building impact-ordered postings lists")
+        matrix = self.vectorizer.tfidf_matrix
+        rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+        order = np.lexsort((-matrix.data, rows))
+        self.postings_docs = matrix.indices[order]
+        self.postings_impacts = matrix.data[order]
+        self.postings_indptr = np.asarray(matrix.indptr)
+
+    def save(self) -> None:
+        """Save sorted postings as **.npy** files."""
+        logger.info("Saving postings lists to {}".format(self.save_path))
+        self.save_path.mkdir(parents=True, exist_ok=True)
+        np.save(self.save_path / 'docs.npy', self.postings_docs)
+        np.save(self.save_path / 'impacts.npy', self.postings_impacts)
+        np.save(self.save_path / 'indptr.npy', self.postings_indptr)
+
+    def load(self) -> None:
+        """Load sorted postings with memory mapping."""
+        logger.info("Loading postings lists from {}".format(self.load_path))
+        self.postings_docs = np.load(self.load_path / 'docs.npy', mmap_mode='r')
+        self.postings_impacts = np.load(self.load_path / 'impacts.npy', mmap_mode='r')
+        self.postings_indptr = np.load(self.load_path / 'indptr.npy', mmap_mode='r')
+
+    def __call__(self, questions: List[str]) -> Tuple[List[Any], List[float]]:
+        """Rank documents and return top n document titles with scores.
+
+        Args:
+            questions: list of queries used in ranking
+
+        Returns:
+            a tuple of selected doc ids and their scores
+        """
+
+        batch_doc_ids, batch_docs_scores = [], []
+
+        q_tfidfs = self.vectorizer(questions).tocsr()
+        n_docs = self.vectorizer.tfidf_matrix.shape[1]
+        index2doc = self.index2doc
+
+        if self.active:
+            thresh = min(self.top_n, n_docs)
+        else:
+            thresh = n_docs
+
+        for i in range(q_tfidfs.shape[0]):
+            hashes = q_tfidfs.indices[q_tfidfs.indptr[i]:q_tfidfs.indptr[i + 1]]
+            weights = q_tfidfs.data[q_tfidfs.indptr[i]:q_tfidfs.indptr[i + 1]]
+
+            doc_nums, doc_scores, scored_nums = self._rank(hashes, weights, thresh)
+            doc_nums, doc_scores = self._pad_with_zero_scores(doc_nums, doc_scores + 0.0001, scored_nums, thresh)
+
+            batch_doc_ids.append(index2doc[doc_nums].tolist())
+            batch_docs_scores.append(doc_scores)
+
+        return batch_doc_ids, batch_docs_scores
+
+    def _rank(self, hashes: np.ndarray, weights: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Select top ``k`` documents for a single query.
+
+        Returns:
+            a tuple of top documents numbers, their scores sorted in decreasing order and numbers of all the
+            documents with nonzero scores that were found
+        """
+        pos = self.postings_indptr[hashes].astype(np.int64)
+        ends = self.postings_indptr[hashes + 1].astype(np.int64)
+        cand_docs = np.empty(0, dtype=self.postings_docs.dtype)
+        cand_scores = np.empty(0)
+        block = self.block_size
+
+        while True:
+            docs, scores = [cand_docs], [cand_scores]
+            for j in range(len(hashes)):
+                end = min(pos[j] + block, ends[j])
+                docs.append(self.postings_docs[pos[j]:end])
+                scores.append(self.postings_impacts[pos[j]:end] * weights[j])
+                pos[j] = end
+            cand_docs, inverse = np.unique(np.concatenate(docs), return_inverse=True)
+            cand_scores = np.bincount(inverse, weights=np.concatenate(scores))
+
+            unread = pos < ends
+            if not unread.any():
+                exact = True
+                break
+
+            # the largest score that unread postings can add to a document
+            bound = np.dot(self.postings_impacts[pos[unread]], weights[unread])
+            if len(cand_docs) > k:
+                part = np.argpartition(-cand_scores, k)
+                if cand_scores[part[:k]].min() >= cand_scores[part[k:]].max() + bound:
+                    exact = False
+                    break
+            elif len(cand_docs) == k and cand_scores.min() >= bound:
+                exact = False
+                break
+            block *= 2
+
+        if len(cand_docs) > k:
+            top = np.argpartition(-cand_scores, k)[:k]
+        else:
+            top = np.arange(len(cand_docs))
+        top_docs, top_scores = cand_docs[top], cand_scores[top]
+
+        if not exact:
+            # scores of the top documents may still miss some unread postings
+            top_scores = weights @ self.vectorizer.tfidf_matrix[hashes][:, top_docs].toarray()
+
+        o_sort = np.argsort(-top_scores)
+        return top_docs[o_sort], top_scores[o_sort], cand_docs
@@ -48,10 +48,35 @@ class TfidfRanker(Component):
         self.top_n = top_n
         self.vectorizer = vectorizer
         self.active = active
+        self._index2doc_source = None
+        self._index2doc = None
+
+    @property
+    def index2doc(self) -> np.ndarray:
+        """An array of doc ids indexed by their tfidf matrix column numbers."""
+        source = self.vectorizer.index2doc
+        if source is not self._index2doc_source:
+            index2doc = np.empty(max(source, default=-1) + 1, dtype=object)
+            index2doc[list(source.keys())] = list(source.values())
+            self._index2doc, self._index2doc_source = index2doc, source
+        return self._index2doc
+
+    @staticmethod
+    def _pad_with_zero_scores(doc_nums: np.ndarray, doc_scores: np.ndarray, scored_nums: np.ndarray,
+                              thresh: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Fill up selected documents with zero score documents up to :attr:`thresh` as dense scoring does."""
+        if len(doc_nums) >= thresh:
+            return doc_nums, doc_scores
+        n_pad = thresh - len(doc_nums)
+        pad = np.setdiff1d(np.arange(n_pad + len(scored_nums)), scored_nums, assume_unique=True)[0:n_pad]
+        return np.concatenate([doc_nums, pad]), np.concatenate([doc_scores, np.full(n_pad, 0.0001)])
 
     def __call__(self, questions: List[str]) -> Tuple[List[Any], List[float]]:
         """Rank documents and return top n document titles with scores.
 
+        Scores for the whole batch are computed with a single sparse matrix product, and top n documents are
+        selected among nonzero scores of every row without densifying it.
+
         Args:
             questions: list of queries used in ranking
 
@@ -62,26 +87,28 @@ class TfidfRanker(Component):
         batch_doc_ids, batch_docs_scores = [], []
 
         q_tfidfs = self.vectorizer(questions)
+        scores = (q_tfidfs * self.vectorizer.tfidf_matrix).tocsr()
+        n_docs = scores.shape[1]
+        index2doc = self.index2doc
 
-        for q_tfidf in q_tfidfs:
-            scores = q_tfidf * self.vectorizer.tfidf_matrix
-            scores = np.squeeze(
-                scores.toarray() + 0.0001)  # add a small value to eliminate zero scores
+        if self.active:
+            thresh = min(self.top_n, n_docs)
+        else:
+            thresh = n_docs
 
-            if self.active:
-                thresh = self.top_n
-            else:
-                thresh = len(self.vectorizer.doc_index)
+        for i in range(scores.shape[0]):
+            row_ids = scores.indices[scores.indptr[i]:scores.indptr[i + 1]]
+            row_scores = scores.data[scores.indptr[i]:scores.indptr[i + 1]] + 0.0001  # eliminate zero scores
 
-            if thresh >= len(scores):
-                o = np.argpartition(-scores, len(scores) - 1)[0:thresh]
+            if thresh < len(row_scores):
+                o = np.argpartition(-row_scores, thresh)[0:thresh]
             else:
-                o = np.argpartition(-scores, thresh)[0:thresh]
-            o_sort = o[np.argsort(-scores[o])]
+                o = np.arange(len(row_scores))
+            o_sort = o[np.argsort(-row_scores[o])]
+
+            doc_nums, doc_scores = self._pad_with_zero_scores(row_ids[o_sort], row_scores[o_sort], row_ids, thresh)
 
-            doc_scores = scores[o_sort]
-            doc_ids = [self.vectorizer.index2doc[i] for i in o_sort]
-            batch_doc_ids.append(doc_ids)
+            batch_doc_ids.append(index2doc[doc_nums].tolist())
             batch_docs_scores.append(doc_scores)
 
         return batch_doc_ids, batch_docs_scores
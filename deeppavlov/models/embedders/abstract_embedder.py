@@ -15,12 +15,12 @@
 from abc import ABCMeta, abstractmethod
 from logging import getLogger
 from pathlib import Path
-from typing import List, Union, Iterator
+from typing import List, Union, Iterator, Tuple
 
 import numpy as np
 from overrides import overrides
 
-from deeppavlov.core.data.utils import zero_pad
+from deeppavlov.core.common.cache import LRUCache
 from deeppavlov.core.models.component import Component
 from deeppavlov.core.models.serializable import Serializable
 
@@ -34,21 +34,24 @@ class Embedder(Component, Serializable, metaclass=ABCMeta):
     Args:
         load_path: path where to load pre-trained embedding model from
         pad_zero: whether to pad samples or not
+        mean: whether to return one mean embedding vector per sample
+        cache_size: maximum number of already embedded tokens to keep
 
     Attributes:
         model: model instance
-        tok2emb: dictionary with already embedded tokens
+        tok2emb: a bounded cache of already embedded tokens
         dim: dimension of embeddings
         pad_zero: whether to pad sequence of tokens with zeros or not
         mean: whether to return one mean embedding vector per sample
         load_path: path with pre-trained fastText binary model
     """
-    def __init__(self, load_path: Union[str, Path], pad_zero: bool = False, mean: bool = False, **kwargs) -> None:
+    def __init__(self, load_path: Union[str, Path], pad_zero: bool = False, mean: bool = False,
+                 cache_size: int = 100000, **kwargs) -> None:
         """
         Initialize embedder with given parameters
         """
         super().__init__(save_path=None, load_path=load_path)
-        self.tok2emb = {}
+        self.tok2emb = LRUCache(cache_size)
         self.pad_zero = pad_zero
         self.mean = mean
         self.dim = None
@@ -74,10 +77,23 @@ class Embedder(Component, Serializable, metaclass=ABCMeta):
         Returns:
             embedded batch
         """
-        batch = [self._encode(sample, mean) for sample in batch]
+        if mean is None:
+            mean = self.mean
+
+        if not batch:
+            return batch
+
+        embedded, lengths = self._encode_batch(batch)
+
+        if mean:
+            mask = np.any(embedded, axis=2)
+            counts = np.maximum(mask.sum(axis=1, keepdims=True), 1).astype(np.float32)
+            means = embedded.sum(axis=1) / counts
+            return means if self.pad_zero else list(means)
+
         if self.pad_zero:
-            batch = zero_pad(batch)
-        return batch
+            return embedded
+        return [list(sample[:length]) for sample, length in zip(embedded, lengths)]
 
     @abstractmethod
     def __iter__(self) -> Iterator[str]:
@@ -100,36 +116,43 @@ class Embedder(Component, Serializable, metaclass=ABCMeta):
             embedding vector
         """
 
-    def _encode(self, tokens: List[str], mean: bool) -> Union[List[np.ndarray], np.ndarray]:
+    def _get_cached_vector(self, token: str) -> np.ndarray:
+        try:
+            return self.tok2emb[token]
+        except KeyError:
+            try:
+                emb = self._get_word_vector(token)
+            except KeyError:
+                emb = np.zeros(self.dim, dtype=np.float32)
+            self.tok2emb[token] = emb
+            return emb
+
+    def _encode_batch(self, batch: List[List[str]]) -> Tuple[np.ndarray, List[int]]:
         """
-        Embed one text sample
+        Embed a batch of text samples
+
+        Every distinct token of the batch is embedded once, then all tokens are mapped to rows of a matrix of
+        distinct tokens embeddings and gathered with a single ``np.take``.
 
         Args:
-            tokens: tokenized text sample
-            mean: whether to return mean embedding of tokens per sample
+            batch: list of tokenized text samples
 
         Returns:
-            list of embedded tokens or array of mean values
+            zero padded float32 array of embeddings of shape ``(batch_size, max_len, dim)`` and lengths of samples
         """
-        embedded_tokens = []
-        for t in tokens:
-            try:
-                emb = self.tok2emb[t]
-            except KeyError:
-                try:
-                    emb = self._get_word_vector(t)
-                except KeyError:
-                    emb = np.zeros(self.dim, dtype=np.float32)
-                self.tok2emb[t] = emb
-            embedded_tokens.append(emb)
-
-        if mean is None:
-            mean = self.mean
-
-        if mean:
-            filtered = [et for et in embedded_tokens if np.any(et)]
-            if filtered:
-                return np.mean(filtered, axis=0)
-            return np.zeros(self.dim, dtype=np.float32)
-
-        return embedded_tokens
+        lengths = [len(sample) for sample in batch]
+        vocab = {}
+        ids = np.fromiter((vocab.setdefault(t, len(vocab)) for sample in batch for t in sample),
+                          dtype=np.int64, count=sum(lengths))
+
+        vectors = np.zeros((len(vocab) + 1, self.dim), dtype=np.float32)
+        for t, row in vocab.items():
+            vectors[row] = self._get_cached_vector(t)
+
+        max_len = max(lengths)
+        indices = np.full((len(batch), max_len), len(vocab), dtype=np.int64)
+        indices[np.arange(max_len) < np.array(lengths)[:, None]] = ids
+
+        embedded = np.empty((len(batch), max_len, self.dim), dtype=np.float32)
+        np.take(vectors, indices, axis=0, out=embedded)
+        return embedded, lengths
@@ -48,10 +48,11 @@ class FasttextEmbedder(Embedder):
     Args:
         load_path: path where to load pre-trained embedding model from
         pad_zero: whether to pad samples or not
+        cache_size: maximum number of already embedded tokens to keep
 
     Attributes:
         model: fastText model instance
-        tok2emb: dictionary with already embedded tokens
+        tok2emb: a bounded cache of already embedded tokens
         dim: dimension of embeddings
         pad_zero: whether to pad sequence of tokens with zeros or not
         load_path: path with pre-trained fastText binary model
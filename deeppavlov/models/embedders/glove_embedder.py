@@ -33,10 +33,11 @@ class GloVeEmbedder(Embedder):
     Args:
         load_path: path where to load pre-trained embedding model from
         pad_zero: whether to pad samples or not
+        cache_size: maximum number of already embedded tokens to keep
 
     Attributes:
         model: GloVe model instance
-        tok2emb: dictionary with already embedded tokens
+        tok2emb: a bounded cache of already embedded tokens
         dim: dimension of embeddings
         pad_zero: whether to pad sequence of tokens with zeros or not
         load_path: path with pre-trained GloVe model
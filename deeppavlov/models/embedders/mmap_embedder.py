@@ -0,0 +1,203 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hashlib import blake2b
+from logging import getLogger
+from pathlib import Path
+from typing import Iterator, List, Union
+
+import numpy as np
+from overrides import overrides
+
+from deeppavlov.core.commands.utils import expand_path
+from deeppavlov.core.common.file import read_json, save_json
+from deeppavlov.core.common.registry import register
+from deeppavlov.models.embedders.abstract_embedder import Embedder
+
+log = getLogger(__name__)
+
+
+def word_hash(word: str) -> int:
+    """64-bit hash of a word that is used as a key of the vocabulary index."""
+    return int.from_bytes(blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def fasttext_hash(ngram: str) -> int:
+    """32-bit FNV-1a hash of a character n-gram exactly as it is computed by fastText."""
+    h = 2166136261
+    for byte in ngram.encode('utf-8'):
+        # fastText xors the hash with a signed char value
+        h = (h ^ (byte if byte < 128 else byte | 0xffffff00)) * 16777619 & 0xffffffff
+    return h
+
+
+def char_ngrams(word: str, minn: int, maxn: int) -> List[str]:
+    """Character n-grams of a word wrapped with ``<`` and ``>`` in the same order as fastText computes them."""
+    word = f'<{word}>'
+    ngrams = []
+    for i in range(len(word)):
+        for n in range(1, min(maxn, len(word) - i) + 1):
+            if n >= minn and not (n == 1 and (i == 0 or i + n == len(word))):
+                ngrams.append(word[i:i + n])
+    return ngrams
+
+
+def _save_vocab(path: Path, words: List[str]) -> None:
+    hashes = np.fromiter((word_hash(w) for w in words), dtype=np.uint64, count=len(words))
+    order = np.argsort(hashes, kind='stable')
+    sorted_hashes = hashes[order]
+    collisions = np.flatnonzero(sorted_hashes[1:] == sorted_hashes[:-1])
+    if len(collisions):
+        log.warning(f'{len(collisions)} words have colliding hashes, only the first of them will be used')
+        keep = np.ones(len(order), dtype=bool)
+        keep[collisions + 1] = False
+        order, sorted_hashes = order[keep], sorted_hashes[keep]
+    np.save(path / 'hashes.npy', sorted_hashes)
+    np.save(path / 'rows.npy', order.astype(np.int64))
+    with open(path / 'vocab.txt', 'w', encoding='utf8') as f:
+        f.writelines(f'{w}\n' for w in words)
+
+
+def convert_glove_to_mmap(load_path: Union[str, Path], save_path: Union[str, Path], dtype: str = 'float32') -> None:
+    """Convert GloVe embeddings in word2vec text format to a directory that is used by :class:`MmapEmbedder`.
+
+    The file is read line by line and vectors are written directly to a memory-mapped **.npy** file, so the whole
+    matrix is never held in memory.
+
+    Args:
+        load_path: a path to a text file with the ``<number of words> <dimension>`` header line
+        save_path: a path to a target directory
+        dtype: ``'float32'`` or ``'float16'`` type of the saved vectors
+
+    Returns:
+        None
+
+    """
+    save_path = expand_path(save_path)
+    save_path.mkdir(parents=True, exist_ok=True)
+    words = []
+    with open(expand_path(load_path), encoding='utf8') as f:
+        n_words, dim = map(int, f.readline().split())
+        vectors = np.lib.format.open_memmap(save_path / 'vectors.npy', mode='w+', dtype=dtype, shape=(n_words, dim))
+        for i, line in enumerate(f):
+            word, *values = line.rstrip().split(' ')
+            words.append(word)
+            vectors[i] = np.asarray(values, dtype=np.float32)
+        vectors.flush()
+    _save_vocab(save_path, words)
+    save_json({'dim': dim, 'dtype': dtype}, save_path / 'meta.json')
+
+
+def convert_fasttext_to_mmap(load_path: Union[str, Path], save_path: Union[str, Path], dtype: str = 'float32') -> None:
+    """Convert a fastText binary model to a directory that is used by :class:`MmapEmbedder`.
+
+    Vectors of the vocabulary words are precomputed with ``get_word_vector``, rows of the subword hash buckets are
+    saved as a separate table to compose vectors of out-of-vocabulary words.
+
+    Args:
+        load_path: a path to a fastText **.bin** model
+        save_path: a path to a target directory
+        dtype: ``'float32'`` or ``'float16'`` type of the saved vectors
+
+    Returns:
+        None
+
+    """
+    import fastText
+
+    save_path = expand_path(save_path)
+    save_path.mkdir(parents=True, exist_ok=True)
+    model = fastText.load_model(str(expand_path(load_path)))
+    words = model.get_words()
+    dim = model.get_dimension()
+
+    vectors = np.lib.format.open_memmap(save_path / 'vectors.npy', mode='w+', dtype=dtype, shape=(len(words), dim))
+    for i, w in enumerate(words):
+        vectors[i] = model.get_word_vector(w)
+    vectors.flush()
+    _save_vocab(save_path, words)
+
+    input_matrix = model.get_input_matrix()
+    np.save(save_path / 'subwords.npy', input_matrix[len(words):].astype(dtype))
+
+    # fastText python bindings do not expose minn and maxn, they are restored from subwords of an unknown word
+    probe = 'ǂ' * 16
+    ngrams = [s for s in model.get_subwords(probe)[0] if s != probe]
+    lengths = [len(s) for s in ngrams] or [0]
+    save_json({'dim': dim, 'dtype': dtype, 'minn': min(lengths), 'maxn': max(lengths),
+               'bucket': input_matrix.shape[0] - len(words)}, save_path / 'meta.json')
+
+
+@register('mmap_embedder')
+class MmapEmbedder(Embedder):
+    """
+    Class implements an embedding model stored as memory-mapped arrays
+
+    Embeddings are read from a directory made by :func:`convert_glove_to_mmap` or :func:`convert_fasttext_to_mmap`.
+    Vectors and the vocabulary index are opened with ``mmap_mode='r'``, so loading is almost instant and all
+    the processes that use the same directory share one copy of it in the OS page cache. Out-of-vocabulary words
+    are composed from the subword hash table as fastText does, if the table is present.
+
+    Args:
+        load_path: path to a directory with converted embeddings
+        pad_zero: whether to pad samples or not
+        cache_size: maximum number of already embedded tokens to keep
+
+    Attributes:
+        vectors: matrix of vocabulary words embeddings
+        subwords: matrix of subword hash buckets embeddings or ``None``
+        tok2emb: a bounded cache of already embedded tokens
+        dim: dimension of embeddings
+        pad_zero: whether to pad sequence of tokens with zeros or not
+        load_path: path with converted embeddings
+    """
+
+    def load(self) -> None:
+        """
+        Open memory-mapped embeddings from self.load_path
+        """
+        log.info(f"[loading memory-mapped embeddings from `{self.load_path}`]")
+        meta = read_json(self.load_path / 'meta.json')
+        self.dim = meta['dim']
+        self.vectors = np.load(self.load_path / 'vectors.npy', mmap_mode='r')
+        self._hashes = np.load(self.load_path / 'hashes.npy', mmap_mode='r')
+        self._rows = np.load(self.load_path / 'rows.npy', mmap_mode='r')
+
+        subwords_path = self.load_path / 'subwords.npy'
+        self.subwords = np.load(subwords_path, mmap_mode='r') if subwords_path.exists() else None
+        self._minn, self._maxn = meta.get('minn', 0), meta.get('maxn', 0)
+        self._bucket = meta.get('bucket', 0)
+
+    def _get_word_vector(self, w: str) -> np.ndarray:
+        h = word_hash(w)
+        i = np.searchsorted(self._hashes, h)
+        if i < len(self._hashes) and self._hashes[i] == h:
+            return np.asarray(self.vectors[self._rows[i]], dtype=np.float32)
+        if self.subwords is None or self._bucket == 0:
+            raise KeyError(w)
+        ids = [fasttext_hash(ngram) % self._bucket for ngram in char_ngrams(w, self._minn, self._maxn)]
+        if not ids:
+            raise KeyError(w)
+        return self.subwords[np.sort(ids)].astype(np.float32).mean(axis=0)
+
+    @overrides
+    def __iter__(self) -> Iterator[str]:
+        """
+        Iterate over all words from the vocabulary
+
+        Returns:
+            iterator
+        """
+        with open(self.load_path / 'vocab.txt', encoding='utf8') as f:
+            yield from (line.rstrip('\n') for line in f)
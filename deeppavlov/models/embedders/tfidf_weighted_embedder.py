@@ -17,11 +17,11 @@ from typing import List, Union, Optional, Tuple
 
 import numpy as np
 from overrides import overrides
+from scipy.sparse import issparse
 
 from deeppavlov.core.commands.utils import expand_path
 from deeppavlov.core.common.errors import ConfigError
 from deeppavlov.core.common.registry import register
-from deeppavlov.core.data.utils import zero_pad
 from deeppavlov.core.models.component import Component
 
 log = getLogger(__name__)
@@ -57,6 +57,8 @@ class TfidfWeightedEmbedder(Component):
         mean: whether to return mean token embedding
         tags_vocab: vocabulary with weigths for tags
         vectorizer: vectorizer instance
+        vocabulary: feature names of the vectorizer
+        token2column: mapping from a feature name to its column in vectorized samples
         counter_vocab_path: path to counter vocabulary
         counter_vocab: counter vocabulary
         idf_base_count: minimal idf value (less time occured are not counted)
@@ -100,6 +102,7 @@ class TfidfWeightedEmbedder(Component):
         elif vectorizer:
             self.vectorizer = vectorizer
             self.vocabulary = np.array(self.vectorizer.model.get_feature_names())
+            self.token2column = {token: i for i, token in enumerate(self.vocabulary)}
         elif counter_vocab_path:
             self.counter_vocab_path = expand_path(counter_vocab_path)
             self.counter_vocab, self.min_count = self.load_counter_vocab(self.counter_vocab_path)
@@ -134,7 +137,7 @@ class TfidfWeightedEmbedder(Component):
 
         for line in lines:
             key, val = line[:-1].split(' ')  # "\t"
-            tags_vocab[key] = val
+            tags_vocab[key] = float(val)
 
         return tags_vocab
 
@@ -197,108 +200,98 @@ class TfidfWeightedEmbedder(Component):
         if self.tags_vocab:
             if tags_batch is None:
                 raise ConfigError("TfidfWeightedEmbedder got 'tags_vocab_path' but __call__ did not get tags_batch.")
-            batch = [self._tags_encode(sample, tags_sample, mean=mean) for sample, tags_sample in zip(batch, tags_batch)]
-        else:
-            if tags_batch:
-                raise ConfigError("TfidfWeightedEmbedder got tags batch, but 'tags_vocab_path' is empty.")
-            batch = [self._encode(sample, mean=mean) for sample in batch]
-
-        if self.pad_zero:
-            batch = zero_pad(batch)
-
-        return batch
-
-    def _encode(self, tokens: List[str], mean: bool) -> Union[List[np.ndarray], np.ndarray]:
-        """
-        Embed one text sample
+        elif tags_batch:
+            raise ConfigError("TfidfWeightedEmbedder got tags batch, but 'tags_vocab_path' is empty.")
 
-        Args:
-            tokens: tokenized text sample
-            mean: whether to return mean token embedding (does not depend on self.mean)
-
-        Returns:
-            list of embedded tokens or array of mean values
-        """
-        if self.vectorizer:
-            detokenized_sample = self.tokenizer([tokens])[0]  # str
-            vectorized_sample = self.vectorizer([detokenized_sample])  # (voc_size,)
+        if mean is None:
+            mean = self.mean
 
-            weights = np.array([vectorized_sample[0, np.where(self.vocabulary == token)[0][0]]
-                                if len(np.where(self.vocabulary == token)[0]) else 0.
-                                for token in tokens])
-        else:
-            weights = np.array([self.get_weight(max(self.counter_vocab.get(token, 0), self.idf_base_count))
-                                for token in tokens])
+        if not batch:
+            return batch
 
-        if sum(weights) == 0:
-            weights = np.ones(len(tokens))
+        lengths = [len(tokens) for tokens in batch]
+        mask = np.arange(max(lengths)) < np.array(lengths)[:, None]
 
-        embedded_tokens = np.array(self.embedder([tokens]))[0, :, :]
+        embedded = self._embed(batch, mask)
+        weights = np.zeros(mask.shape)
+        weights[mask] = self._get_weights(batch)
+        if self.tags_vocab:
+            tags_weights = np.ones(mask.shape)
+            tags_weights[mask] = [self.tags_vocab.get(tag, 1.0) for tags in tags_batch for tag in tags]
+            weights *= tags_weights
 
-        if mean is None:
-            mean = self.mean
+        # samples without any weighted token are averaged with equal weights
+        unweighted = weights.sum(axis=1) == 0
+        weights[unweighted] = mask[unweighted]
 
         if mean:
-            embedded_tokens = np.average(embedded_tokens, weights=weights, axis=0)
-        else:
-            embedded_tokens = np.array([weights[i] * embedded_tokens[i] for i in range(len(tokens))])
+            weights_sum = weights.sum(axis=1, keepdims=True)
+            weights_sum[weights_sum == 0] = 1.
+            batch = np.einsum('bl,bld->bd', weights, embedded) / weights_sum
+            return batch if self.pad_zero else list(batch)
 
-        return embedded_tokens
+        batch = weights[:, :, None] * embedded
+        if self.pad_zero:
+            return batch
+        return [sample[:length] for sample, length in zip(batch, lengths)]
 
-    def get_weight(self, count: int) -> float:
+    def _embed(self, batch: List[List[str]], mask: np.ndarray) -> np.ndarray:
         """
-        Calculate the weight corresponding to the given count
+        Embed all tokens of the batch with one call of the embedder
 
         Args:
-            count: the number of occurences of particular token
+            batch: tokenized text samples
+            mask: boolean matrix of positions of tokens in the zero padded batch
 
         Returns:
-            weight
+            zero padded array of token embeddings of shape ``(batch_size, max_len, dim)``
         """
-        log_count = np.log(count) / np.log(self.log_base)
-        log_base_count = np.log(self.idf_base_count) / np.log(self.log_base)
-        weight = max(1.0 / (1.0 + log_count - log_base_count), self.min_idf_weight)
-        return weight
-
-    def _tags_encode(self, tokens: List[str], tags: List[str], mean: bool) -> Union[List[np.ndarray], np.ndarray]:
+        embedded = self.embedder(batch)
+        if isinstance(embedded, np.ndarray) and embedded.shape[:2] == mask.shape:
+            return embedded
+        padded = np.zeros((*mask.shape, self.dim), dtype=np.float32)
+        padded[mask] = [emb for sample in embedded for emb in sample]
+        return padded
+
+    def _get_weights(self, batch: List[List[str]]) -> np.ndarray:
         """
-        Embed one text sample
+        Calculate weights of all tokens of the batch
 
         Args:
-            tokens: tokenized text sample
-            tags: tokenized tags sample
-            mean: whether to return mean token embedding (does not depend on self.mean)
+            batch: tokenized text samples
 
         Returns:
-            list of embedded tokens or array of mean values
+            flat array of tokens weights
         """
-
-        embedded_tokens = np.array(self.embedder([tokens]))[0, :, :]
-
-        tags_weights = np.array([self.tags_vocab.get(tag, 1.0) for tag in tags])
-
-        detokenized_sample = self.tokenizer([tokens])[0]  # str
-        vectorized_sample = self.vectorizer([detokenized_sample])  # (voc_size,)
-
+        tokens = [token for sample in batch for token in sample]
         if self.vectorizer:
-            weights = np.array([vectorized_sample[0, np.where(self.vocabulary == token)[0][0]]
-                                if len(np.where(self.vocabulary == token)[0]) else 0.
-                                for token in tokens])
-        else:
-            weights = np.array([self.get_weight(max(self.counter_vocab.get(token, 0), self.idf_base_count))
-                                for token in tokens])
-
-        weights = np.multiply(weights, tags_weights)
-        if sum(weights) == 0:
-            weights = np.ones(len(tokens))
-
-        if mean is None:
-            mean = self.mean
-
-        if mean:
-            embedded_tokens = np.average(embedded_tokens, weights=weights, axis=0)
-        else:
-            embedded_tokens = np.array([weights[i] * embedded_tokens[i] for i in range(len(tokens))])
+            vectorized = self.vectorizer(self.tokenizer(batch))  # (batch_size, voc_size)
+            rows = np.repeat(np.arange(len(batch)), [len(sample) for sample in batch])
+            cols = np.fromiter((self.token2column.get(token, -1) for token in tokens), dtype=np.int64,
+                               count=len(tokens))
+            known = cols >= 0
+            weights = np.zeros(len(tokens))
+            if known.any():
+                if issparse(vectorized):
+                    vectorized = vectorized.tocsr()
+                weights[known] = np.asarray(vectorized[rows[known], cols[known]]).ravel()
+            return weights
+
+        counts = np.fromiter((self.counter_vocab.get(token, 0) for token in tokens), dtype=np.float64,
+                             count=len(tokens))
+        return self.get_weight(np.maximum(counts, self.idf_base_count))
+
+    def get_weight(self, count: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Calculate the weight corresponding to the given count
 
-        return embedded_tokens
+        Args:
+            count: the number of occurences of particular token or an array of such numbers
 
+        Returns:
+            weight or an array of weights
+        """
+        log_count = np.log(count) / np.log(self.log_base)
+        log_base_count = np.log(self.idf_base_count) / np.log(self.log_base)
+        weight = np.maximum(1.0 / (1.0 + log_count - log_base_count), self.min_idf_weight)
+        return weight
@@ -11,19 +11,23 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import pickle
 from logging import getLogger
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union
 import itertools
 
 from fuzzywuzzy import fuzz
 import pymorphy2
 import nltk
 
+from deeppavlov.core.common.file import read_json, save_json
 from deeppavlov.core.common.registry import register
 from deeppavlov.core.models.serializable import Serializable
 from deeppavlov.core.models.component import Component
+from deeppavlov.models.kbqa.kb_store import SQLiteDict, get_many, load_kb_dict
+from deeppavlov.models.kbqa.ngram_index import NgramIndex
+from deeppavlov.models.ranking.ann_index import base_fingerprint
 from deeppavlov.models.spelling_correction.levenshtein.levenshtein_searcher import LevenshteinSearcher
+from deeppavlov.models.spelling_correction.levenshtein.tabled_trie import load_trie
 
 log = getLogger(__name__)
 
@@ -37,13 +41,20 @@ class EntityLinker(Component, Serializable):
         number_of_relations). First candidate entities are searched in the dictionary by keys where the keys are
         entities extracted from the question, if nothing is found entities are searched in the dictionary using
         Levenstein distance between the entity and keys (titles) in the dictionary.
+
+        Every dictionary file can be either a pickle or an SQLite store made by
+        :func:`~deeppavlov.models.kbqa.kb_store.convert_pickle_to_sqlite`. Stores are not loaded into memory,
+        their entries are read lazily and the most recently used ones are cached.
     """
 
     LANGUAGES = set(['rus'])
+    ALPHABET = "abcdefghijklmnopqrstuvwxyzабвгдеёжзийклмнопрстуфхцчшщъыьэюя1234567890-_()=+!?.,/;:&@<>|#$%^*"
 
     def __init__(self, load_path: str, wiki_filename: str, entities_filename: str, inverted_index_filename: str,
                  id_to_name_file: str, lemmatize: bool = True, debug: bool = False, rule_filter_entities: bool = True,
-                 use_inverted_index: bool = True, language: str = 'rus', *args, **kwargs) -> None:
+                 use_inverted_index: bool = True, language: str = 'rus', cache_size: int = 10000,
+                 fuzzy_candidates: int = 300, ngram_index_path: Optional[str] = None, trie_path: Optional[str] = None,
+                 *args, **kwargs) -> None:
         """
 
         Args:
@@ -57,6 +68,14 @@ class EntityLinker(Component, Serializable):
             rule_filter_entities: whether to filter entities which do not fit the question
             use_inverted_index: whether to use inverted index for entity linking
             language - the language of the linker (used for filtration of some questions to improve overall performance)
+            cache_size: maximum number of entries to cache for every dictionary stored in SQLite
+            fuzzy_candidates: number of entity titles that are selected by character trigrams overlap for fuzzy
+                search, every title is compared with the entity if it is 0
+            ngram_index_path: directory with the trigram index of entity titles relative to ``load_path``,
+                the index is loaded from it if it was built for the same titles, otherwise it is built and saved
+                there
+            trie_path: directory with the trie of inverted index words relative to ``load_path``, the trie is
+                memory-mapped from it if it was built for the same words, otherwise it is built and saved there
             *args:
             **kwargs:
         """
@@ -74,32 +93,53 @@ class EntityLinker(Component, Serializable):
         self._entities_filename = entities_filename
         self.inverted_index_filename = inverted_index_filename
         self.id_to_name_file = id_to_name_file
-
-        self.name_to_q: Optional[Dict[str, List[Tuple[str]]]] = None
-        self.wikidata: Optional[Dict[str, List[List[str]]]] = None
-        self.inverted_index: Optional[Dict[str, List[Tuple[str]]]] = None
-        self.id_to_name: Optional[Dict[str, Dict[List[str]]]] = None
+        self.cache_size = cache_size
+        self.fuzzy_candidates = fuzzy_candidates
+        self.ngram_index_path = ngram_index_path
+        self.trie_path = trie_path
+
+        self.name_to_q: Optional[Union[Dict[str, List[Tuple[str]]], SQLiteDict]] = None
+        self.wikidata: Optional[Union[Dict[str, List[List[str]]], SQLiteDict]] = None
+        self.inverted_index: Optional[Union[Dict[str, List[Tuple[str]]], SQLiteDict]] = None
+        self.id_to_name: Optional[Union[Dict[str, Dict[List[str]]], SQLiteDict]] = None
+        self.ngram_index: Optional[NgramIndex] = None
         self.load()
         if self.use_inverted_index:
-            alphabet = "abcdefghijklmnopqrstuvwxyzабвгдеёжзийклмнопрстуфхцчшщъыьэюя1234567890-_()=+!?.,/;:&@<>|#$%^*"
-            dictionary_words = list(self.inverted_index.keys())
-            self.searcher = LevenshteinSearcher(alphabet, dictionary_words)
+            self.searcher = self._load_searcher()
 
     def load(self) -> None:
         if self.use_inverted_index:
-            with open(self.load_path / self.inverted_index_filename, 'rb') as inv:
-                self.inverted_index = pickle.load(inv)
-                self.inverted_index: Dict[str, List[Tuple[str]]]
-            with open(self.load_path / self.id_to_name_file, 'rb') as i2n:
-                self.id_to_name = pickle.load(i2n)
-                self.id_to_name: Dict[str, Dict[List[str]]]
+            self.inverted_index = load_kb_dict(self.load_path / self.inverted_index_filename, self.cache_size)
+            self.id_to_name = load_kb_dict(self.load_path / self.id_to_name_file, self.cache_size)
         else:
-            with open(self.load_path / self._entities_filename, 'rb') as e:
-                self.name_to_q = pickle.load(e)
-                self.name_to_q: Dict[str, List[Tuple[str]]]
-        with open(self.load_path / self._wiki_filename, 'rb') as w:
-            self.wikidata = pickle.load(w)
-            self.wikidata: Dict[str, List[List[str]]]
+            self.name_to_q = load_kb_dict(self.load_path / self._entities_filename, self.cache_size)
+            if self.fuzzy_candidates > 0:
+                self.ngram_index = self._load_ngram_index()
+        self.wikidata = load_kb_dict(self.load_path / self._wiki_filename, self.cache_size)
+
+    def _load_ngram_index(self) -> NgramIndex:
+        index_path = self.load_path / self.ngram_index_path if self.ngram_index_path is not None else None
+        if index_path is not None and NgramIndex.saved_fingerprint(index_path) == base_fingerprint(self.name_to_q):
+            return NgramIndex.load(index_path)
+        log.info('Building a trigram index of entity titles')
+        index = NgramIndex(self.name_to_q)
+        if index_path is not None:
+            index.save(index_path)
+        return index
+
+    def _load_searcher(self) -> LevenshteinSearcher:
+        trie_path = self.load_path / self.trie_path if self.trie_path is not None else None
+        fingerprint = base_fingerprint(self.inverted_index) if trie_path is not None else None
+        if trie_path is not None and (trie_path / 'source.json').is_file() and \
+                read_json(trie_path / 'source.json').get('fingerprint') == fingerprint:
+            log.info(f'Loading a trie of inverted index words from {trie_path}')
+            return LevenshteinSearcher(self.ALPHABET, load_trie(trie_path))
+        log.info('Building a trie of inverted index words')
+        searcher = LevenshteinSearcher(self.ALPHABET, list(self.inverted_index.keys()))
+        if trie_path is not None:
+            searcher.dictionary.save_binary(trie_path)
+            save_json({'fingerprint': fingerprint}, trie_path / 'source.json')
+        return searcher
 
     def save(self) -> None:
         pass
@@ -177,8 +217,12 @@ class EntityLinker(Component, Serializable):
 
     def fuzzy_entity_search(self, entity: str) -> List[Tuple[Tuple, str]]:
         word_length = len(entity)
+        if self.ngram_index is not None:
+            titles = self.ngram_index.search(entity, self.fuzzy_candidates, 0.75, 1.25)
+        else:
+            titles = self.name_to_q
         candidates = []
-        for title in self.name_to_q:
+        for title in titles:
             length_ratio = len(title) / word_length
             if length_ratio > 0.75 and length_ratio < 1.25:
                 ratio = fuzz.ratio(title, entity)
@@ -189,13 +233,9 @@ class EntityLinker(Component, Serializable):
         return candidates
 
     def extract_triplets_from_wiki(self, entity_ids: List[str]) -> List[List[List[str]]]:
-        entity_triplets = []
-        for entity_id in entity_ids:
-            if entity_id in self.wikidata and entity_id.startswith('Q'):
-                triplets_for_entity = self.wikidata[entity_id]
-                entity_triplets.append(triplets_for_entity)
-            else:
-                entity_triplets.append([])
+        q_ids = [entity_id for entity_id in entity_ids if entity_id.startswith('Q')]
+        triplets = dict(zip(q_ids, get_many(self.wikidata, q_ids, [])))
+        entity_triplets = [triplets.get(entity_id, []) for entity_id in entity_ids]
 
         return entity_triplets
 
@@ -258,11 +298,13 @@ class EntityLinker(Component, Serializable):
 
     def candidate_entities_names(self, candidate_entities: List[Tuple[str]]) -> List[List[str]]:
         candidate_names = []
-        for candidate in candidate_entities:
-            entity_id = candidate[0]
-            entity_names = [self.id_to_name[entity_id]["name"]]
-            if "aliases" in self.id_to_name[entity_id].keys():
-                aliases = self.id_to_name[entity_id]["aliases"]
+        entity_ids = [candidate[0] for candidate in candidate_entities]
+        for entity_id, names in zip(entity_ids, get_many(self.id_to_name, entity_ids)):
+            if names is None:
+                raise KeyError(entity_id)
+            entity_names = [names["name"]]
+            if "aliases" in names.keys():
+                aliases = names["aliases"]
                 for alias in aliases:
                     entity_names.append(alias)
             candidate_names.append(entity_names)
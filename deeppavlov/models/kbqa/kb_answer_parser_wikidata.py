@@ -16,7 +16,7 @@ import pickle
 from pathlib import Path
 from string import punctuation
 from logging import getLogger
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict, Union
 
 import numpy as np
 
@@ -24,6 +24,7 @@ from deeppavlov.core.models.serializable import Serializable
 from deeppavlov.core.common.registry import register
 from deeppavlov.core.models.component import Component
 from deeppavlov.models.kbqa.entity_linking import EntityLinker
+from deeppavlov.models.kbqa.kb_store import SQLiteDict, load_kb_dict
 
 log = getLogger(__name__)
 
@@ -41,7 +42,7 @@ class KBAnswerParserWikidata(Component, Serializable):
 
     def __init__(self, load_path: str, top_k_classes: int, linker: EntityLinker, classes_vocab_keys: Tuple,
                  debug: bool = False, relations_maping_filename: str = None, templates_filename: str = None,
-                 return_confidences: bool = True, *args, **kwargs) -> None:
+                 return_confidences: bool = True, cache_size: int = 10000, *args, **kwargs) -> None:
         """
 
         Args:
@@ -55,6 +56,7 @@ class KBAnswerParserWikidata(Component, Serializable):
             templates_filename: file with the dictionary of question templates(keys) and relations for these templates
             (values)
             return_confidences: whether to return confidences of answers
+            cache_size: maximum number of entity names to cache if they are stored in SQLite
             *args:
             **kwargs:
         """
@@ -64,7 +66,8 @@ class KBAnswerParserWikidata(Component, Serializable):
         self._debug = debug
         self._relations_filename = relations_maping_filename
         self._templates_filename = templates_filename
-        self._q_to_name: Optional[Dict[str, Dict[str, str]]] = None
+        self._cache_size = cache_size
+        self._q_to_name: Optional[Union[Dict[str, Dict[str, str]], SQLiteDict]] = None
         self._relations_mapping: Optional[Dict[str, str]] = None
         self.templates: Optional[Dict[str, str]] = None
         self.return_confidences = return_confidences
@@ -72,8 +75,7 @@ class KBAnswerParserWikidata(Component, Serializable):
         self.load()
 
     def load(self) -> None:
-        with open(self.load_path, 'rb') as fl:
-            self._q_to_name = pickle.load(fl)
+        self._q_to_name = load_kb_dict(self.load_path, self._cache_size)
         if self._relations_filename is not None:
             with open(self.load_path.parent / self._relations_filename, 'rb') as f:
                 self._relations_mapping = pickle.load(f)
@@ -139,8 +141,9 @@ class KBAnswerParserWikidata(Component, Serializable):
         for n, obj in enumerate(objects_batch):
             if len(obj) > 0:
                 if obj.startswith('Q'):
-                    if obj in self._q_to_name:
-                        parsed_object = self._q_to_name[obj]["name"]
+                    names = self._q_to_name.get(obj)
+                    if names is not None:
+                        parsed_object = names["name"]
                         parsed_objects.append(parsed_object)
                     else:
                         parsed_objects.append('Not Found')
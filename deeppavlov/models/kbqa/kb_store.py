@@ -0,0 +1,196 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import sqlite3
+from collections.abc import Mapping
+from itertools import islice
+from logging import getLogger
+from pathlib import Path
+from threading import Lock
+from typing import Any, Hashable, Iterator, List, Union
+
+from deeppavlov.core.commands.utils import expand_path
+from deeppavlov.core.common.cache import LRUCache
+
+log = getLogger(__name__)
+
+_MISSING = object()
+_SQLITE_HEADER = b'SQLite format 3\x00'
+
+
+def is_sqlite_file(path: Union[str, Path]) -> bool:
+    """Check whether a file is an SQLite database by its header."""
+    path = Path(path)
+    if not path.is_file():
+        return False
+    with path.open('rb') as f:
+        return f.read(len(_SQLITE_HEADER)) == _SQLITE_HEADER
+
+
+def convert_pickle_to_sqlite(load_path: Union[str, Path], save_path: Union[str, Path],
+                             chunk_size: int = 100000) -> None:
+    """Convert a pickled dictionary to a read-only SQLite store that is used by :class:`SQLiteDict`.
+
+    Keys are stored in an indexed column and values are stored pickled, so every entry is read from disk only when
+    it is looked up.
+
+    Args:
+        load_path: a path to a pickled dictionary
+        save_path: a path to a target database file, it is overwritten if it exists
+        chunk_size: number of entries inserted with a single statement
+
+    Returns:
+        None
+
+    """
+    load_path, save_path = expand_path(load_path), expand_path(save_path)
+    log.info(f'Converting {load_path} to an SQLite store {save_path}')
+    with load_path.open('rb') as f:
+        data = pickle.load(f)
+
+    save_path.parent.mkdir(parents=True, exist_ok=True)
+    if save_path.exists():
+        save_path.unlink()
+    connect = sqlite3.connect(str(save_path))
+    connect.execute('CREATE TABLE kv (key PRIMARY KEY, value BLOB) WITHOUT ROWID')
+    items = iter(data.items())
+    while True:
+        chunk = [(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+                 for key, value in islice(items, chunk_size)]
+        if not chunk:
+            break
+        connect.executemany('INSERT INTO kv VALUES (?, ?)', chunk)
+    connect.commit()
+    connect.execute('VACUUM')
+    connect.close()
+
+
+class SQLiteDict(Mapping):
+    """Read-only mapping over an SQLite store made by :func:`convert_pickle_to_sqlite`.
+
+    Values are unpickled lazily on lookup and the most recently used of them are kept in a cache. The database is
+    opened read-only and reopened after a fork, so several worker processes share it through the OS page cache.
+
+    Args:
+        load_path: a path to a database file
+        cache_size: maximum number of values to keep in the cache
+
+    Attributes:
+        load_path: a path to a database file
+        cache: a cache of recently looked up values
+    """
+
+    def __init__(self, load_path: Union[str, Path], cache_size: int = 10000) -> None:
+        self.load_path = expand_path(load_path)
+        self.cache = LRUCache(cache_size)
+        self._lock = Lock()
+        self._pid = None
+        self._connect = None
+        self._len = None
+
+    @property
+    def connect(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            self._connect = sqlite3.connect(f'file:{self.load_path}?mode=ro', uri=True, check_same_thread=False)
+            self._pid = os.getpid()
+        return self._connect
+
+    def _fetch(self, key: Hashable) -> Any:
+        with self._lock:
+            row = self.connect.execute('SELECT value FROM kv WHERE key = ?', (key,)).fetchone()
+        return _MISSING if row is None else pickle.loads(row[0])
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self.cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._fetch(key)
+            if value is _MISSING:
+                return default
+            self.cache[key] = value
+        return value
+
+    def get_many(self, keys: List[Hashable], default: Any = None, chunk_size: int = 900) -> List[Any]:
+        """Look up several keys with ``WHERE key IN (...)`` queries.
+
+        Args:
+            keys: keys to look up
+            default: a value for keys that are not found
+            chunk_size: maximum number of keys in a single query, it has to be less than SQLite host parameters limit
+
+        Returns:
+            values in the order of ``keys``
+        """
+        found = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self.cache.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        for i in range(0, len(missing), chunk_size):
+            chunk = missing[i:i + chunk_size]
+            with self._lock:
+                rows = self.connect.execute(f'SELECT key, value FROM kv WHERE key IN ({", ".join("?" * len(chunk))})',
+                                            chunk).fetchall()
+            for key, value in rows:
+                found[key] = self.cache[key] = pickle.loads(value)
+        return [found.get(key, default) for key in keys]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[Hashable]:
+        with self._lock:
+            keys = [row[0] for row in self.connect.execute('SELECT key FROM kv')]
+        return iter(keys)
+
+    def __len__(self) -> int:
+        if self._len is None:
+            with self._lock:
+                self._len = self.connect.execute('SELECT COUNT(*) FROM kv').fetchone()[0]
+        return self._len
+
+
+def get_many(mapping: Mapping, keys: List[Hashable], default: Any = None) -> List[Any]:
+    """Look up several keys in a dictionary or in :class:`SQLiteDict` with batched queries."""
+    if isinstance(mapping, SQLiteDict):
+        return mapping.get_many(keys, default)
+    return [mapping.get(key, default) for key in keys]
+
+
+def load_kb_dict(load_path: Union[str, Path], cache_size: int = 10000) -> Union[dict, SQLiteDict]:
+    """Open a dictionary of a knowledge base.
+
+    Args:
+        load_path: a path to a pickled dictionary or to an SQLite store made by :func:`convert_pickle_to_sqlite`
+        cache_size: maximum number of values to keep in the cache of an SQLite store
+
+    Returns:
+        :class:`SQLiteDict` for an SQLite store, otherwise the unpickled dictionary
+    """
+    load_path = expand_path(load_path)
+    if is_sqlite_file(load_path):
+        log.info(f'Opening an SQLite store {load_path}')
+        return SQLiteDict(load_path, cache_size)
+    with load_path.open('rb') as f:
+        return pickle.load(f)
@@ -0,0 +1,137 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from logging import getLogger
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Union
+
+import numpy as np
+
+from deeppavlov.core.commands.utils import expand_path
+from deeppavlov.core.common.file import read_json, save_json
+from deeppavlov.models.ranking.ann_index import base_fingerprint
+
+log = getLogger(__name__)
+
+
+def char_ngrams(text: str, n: int) -> Set[str]:
+    """Set of character n-grams of a text padded with a space on both sides."""
+    text = f' {text} '
+    return {text[i:i + n] for i in range(max(len(text) - n + 1, 1))}
+
+
+class NgramIndex:
+    """Inverted index from character n-grams to titles that contain them.
+
+    The index selects titles that share the most n-grams with a query, so that an exact but slow similarity such as
+    ``fuzz.ratio`` is computed only for a few candidates instead of every title. Posting lists are stored as numpy
+    arrays and can be saved to a directory and memory-mapped from it.
+
+    Args:
+        titles: all indexed titles
+        n: length of character n-grams
+
+    Attributes:
+        titles: all indexed titles
+        n: length of character n-grams
+        lengths: lengths of titles
+    """
+
+    def __init__(self, titles: Iterable[str], n: int = 3) -> None:
+        self.titles = list(titles)
+        self.n = n
+        self.lengths = np.fromiter(map(len, self.titles), dtype=np.int32, count=len(self.titles))
+
+        ngram_ids = {}
+        title_ids, ngrams = [], []
+        for i, title in enumerate(self.titles):
+            for ngram in char_ngrams(title, n):
+                title_ids.append(i)
+                ngrams.append(ngram_ids.setdefault(ngram, len(ngram_ids)))
+        ngrams, title_ids = np.array(ngrams, dtype=np.int32), np.array(title_ids, dtype=np.int32)
+
+        order = np.argsort(ngrams, kind='stable')
+        self._ngram_ids = ngram_ids
+        self._postings = title_ids[order]
+        self._offsets = np.zeros(len(ngram_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ngrams, minlength=len(ngram_ids)), out=self._offsets[1:])
+        self._counts = np.bincount(title_ids, minlength=len(self.titles)).astype(np.int32)
+
+    def search(self, query: str, top_k: int, min_length_ratio: float = 0.0,
+               max_length_ratio: float = np.inf) -> List[str]:
+        """Find titles with the highest Dice coefficient of n-gram sets with the query.
+
+        Args:
+            query: a text to search for
+            top_k: maximum number of returned titles
+            min_length_ratio: minimum ratio of a title length to the query length
+            max_length_ratio: maximum ratio of a title length to the query length
+
+        Returns:
+            at most ``top_k`` titles that share at least one n-gram with the query, in no particular order
+        """
+        query_ngrams = char_ngrams(query, self.n)
+        ids = [self._ngram_ids[ngram] for ngram in query_ngrams if ngram in self._ngram_ids]
+        if not ids or not query:
+            return []
+        postings = np.concatenate([self._postings[self._offsets[i]:self._offsets[i + 1]] for i in ids])
+        candidates, overlap = np.unique(postings, return_counts=True)
+
+        length_ratio = self.lengths[candidates] / len(query)
+        fits = (length_ratio > min_length_ratio) & (length_ratio < max_length_ratio)
+        candidates, overlap = candidates[fits], overlap[fits]
+        if len(candidates) > top_k:
+            dice = overlap / (self._counts[candidates] + len(query_ngrams))
+            candidates = candidates[np.argpartition(-dice, top_k - 1)[:top_k]]
+        return [self.titles[i] for i in candidates]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save the index to a directory."""
+        path = expand_path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        # titles and n-grams are stored as JSON lists, so that they can contain line breaks
+        with open(path / 'titles.json', 'w', encoding='utf8') as f:
+            json.dump(self.titles, f, ensure_ascii=False)
+        with open(path / 'ngrams.json', 'w', encoding='utf8') as f:
+            json.dump(list(self._ngram_ids), f, ensure_ascii=False)
+        np.save(path / 'postings.npy', self._postings)
+        np.save(path / 'offsets.npy', self._offsets)
+        np.save(path / 'counts.npy', self._counts)
+        save_json({'n': self.n, 'fingerprint': base_fingerprint(self.titles)}, path / 'meta.json')
+
+    @staticmethod
+    def saved_fingerprint(path: Union[str, Path]) -> Optional[str]:
+        """Fingerprint of titles of an index saved to a directory, see
+        :func:`~deeppavlov.models.ranking.ann_index.base_fingerprint`, or ``None`` if there is no index saved there."""
+        path = expand_path(path)
+        if not (path / 'meta.json').is_file() or not (path / 'titles.json').is_file():
+            return None
+        return read_json(path / 'meta.json').get('fingerprint')
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'NgramIndex':
+        """Load an index saved with :meth:`save`, posting lists are memory-mapped."""
+        path = expand_path(path)
+        index = cls.__new__(cls)
+        index.n = read_json(path / 'meta.json')['n']
+        with open(path / 'titles.json', encoding='utf8') as f:
+            index.titles = json.load(f)
+        with open(path / 'ngrams.json', encoding='utf8') as f:
+            index._ngram_ids = {ngram: i for i, ngram in enumerate(json.load(f))}
+        index.lengths = np.fromiter(map(len, index.titles), dtype=np.int32, count=len(index.titles))
+        index._postings = np.load(path / 'postings.npy', mmap_mode='r')
+        index._offsets = np.load(path / 'offsets.npy', mmap_mode='r')
+        index._counts = np.load(path / 'counts.npy', mmap_mode='r')
+        return index
@@ -0,0 +1,274 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+from logging import getLogger
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from deeppavlov.core.common.errors import ConfigError
+from deeppavlov.core.common.file import read_json, save_json
+from deeppavlov.core.common.registry import register
+from deeppavlov.core.models.estimator import Estimator
+
+log = getLogger(__name__)
+
+
+def kmeans(vectors: np.ndarray, n_clusters: int, n_iter: int = 20, seed: int = 0,
+           max_points_per_centroid: int = 256) -> np.ndarray:
+    """Find centroids of vectors with Lloyd's k-means algorithm.
+
+    Args:
+        vectors: matrix of vectors of shape ``(n, dim)``
+        n_clusters: number of centroids, it has to be not more than ``n``
+        n_iter: number of iterations
+        seed: random seed for centroids initialization
+        max_points_per_centroid: centroids are trained on a random sample of at most
+            ``n_clusters * max_points_per_centroid`` vectors
+
+    Returns:
+        matrix of centroids of shape ``(n_clusters, dim)``
+    """
+    rng = np.random.RandomState(seed)
+    if len(vectors) > n_clusters * max_points_per_centroid:
+        vectors = vectors[rng.choice(len(vectors), n_clusters * max_points_per_centroid, replace=False)]
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].astype(np.float32)
+    for _ in range(n_iter):
+        assignment = nearest_centroids(vectors, centroids)
+        counts = np.bincount(assignment, minlength=n_clusters)
+        one_hot = csr_matrix((np.ones(len(vectors), dtype=np.float32), (assignment, np.arange(len(vectors)))),
+                             shape=(n_clusters, len(vectors)))
+        sums = np.asarray(one_hot @ vectors, dtype=np.float32)
+        empty = counts == 0
+        # empty clusters are restarted from random vectors
+        sums[empty] = vectors[rng.choice(len(vectors), empty.sum())]
+        counts[empty] = 1
+        centroids = sums / counts[:, None].astype(np.float32)
+    return centroids
+
+
+def nearest_centroids(vectors: np.ndarray, centroids: np.ndarray, batch_size: int = 65536) -> np.ndarray:
+    """Indices of the closest by euclidean distance centroid for every vector."""
+    half_norms = (centroids ** 2).sum(axis=1) / 2
+    return np.concatenate([np.argmax(vectors[i:i + batch_size] @ centroids.T - half_norms, axis=1)
+                           for i in range(0, len(vectors), batch_size)]) if len(vectors) else np.array([], dtype=int)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of ``k`` highest scores in every row of a matrix sorted by descending scores."""
+    k = min(k, scores.shape[1])
+    rows = np.arange(len(scores))[:, None]
+    ids = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k < scores.shape[1] else \
+        np.tile(np.arange(k), (len(scores), 1))
+    return ids[rows, np.argsort(-scores[rows, ids], axis=1, kind='mergesort')]
+
+
+def search_or_exact(queries: np.ndarray, vectors: np.ndarray, k: int, index: Optional['IVFIndex'] = None) -> np.ndarray:
+    """Ids of ``k`` vectors with the highest inner products with every query sorted by descending scores.
+
+    Queries are searched with the index if it is given. Queries for which the index finds less than ``k`` vectors
+    in the probed lists are searched exactly among all ``vectors``.
+    """
+    if index is None:
+        return top_k(queries @ vectors.T, k)
+    ids = index.search(queries, k)[0]
+    missing = ids[:, -1] < 0
+    if missing.any():
+        exact = top_k(queries[missing] @ vectors.T, k)
+        ids[missing, :exact.shape[1]] = exact
+    return ids
+
+
+def base_fingerprint(base: Union[np.ndarray, Iterable[str]]) -> str:
+    """SHA-1 hex digest of a matrix of vectors or a sequence of texts that identifies the base an index is built over."""
+    sha = hashlib.sha1()
+    if isinstance(base, np.ndarray):
+        sha.update(f'{base.dtype.str}{base.shape}'.encode())
+        sha.update(np.ascontiguousarray(base).data)
+    else:
+        for text in base:
+            sha.update(text.encode('utf8'))
+            sha.update(b'\0')
+    return sha.hexdigest()
+
+
+@register('ivf_index')
+class IVFIndex(Estimator):
+    """Inverted file index for maximum inner product search over a fixed base of vectors.
+
+    Vectors are clustered with k-means and a query is scored only against vectors of ``n_probe`` clusters
+    with the closest centroids. In product quantization mode residuals of vectors to their centroids are split into
+    ``pq_subspaces`` parts and every part is replaced with one byte code of its closest subspace centroid, so
+    the base takes ``pq_subspaces`` bytes per vector and queries are scored with lookup tables. The index is exact if
+    ``n_lists`` is not more than 1.
+
+    Args:
+        n_lists: number of k-means clusters
+        n_probe: number of clusters that are scored for every query
+        pq_subspaces: number of product quantization subspaces, vectors are stored as is if it is 0
+        n_iter: number of k-means iterations
+        train_size: maximum number of vectors that centroids are trained on
+        seed: random seed for centroids initialization
+        save_path: a directory to save the index to
+        load_path: a directory to load the index from if it exists
+
+    Attributes:
+        n_lists: number of k-means clusters
+        n_probe: number of clusters that are scored for every query
+        pq_subspaces: number of product quantization subspaces
+        centroids: matrix of k-means centroids
+        fingerprint: an identifier of the base the index is built over, see :func:`base_fingerprint`
+    """
+
+    def __init__(self, n_lists: int = 1024, n_probe: int = 16, pq_subspaces: int = 0, n_iter: int = 20,
+                 train_size: int = 262144, seed: int = 0, save_path: Optional[str] = None,
+                 load_path: Optional[str] = None, **kwargs) -> None:
+        super().__init__(save_path=save_path, load_path=load_path, **kwargs)
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.pq_subspaces = pq_subspaces
+        self.n_iter = n_iter
+        self.train_size = train_size
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.fingerprint: Optional[str] = None
+        self._vectors: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._codebooks: Optional[np.ndarray] = None
+        self._ids: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        if self.load_path is not None and (self.load_path / 'meta.json').is_file():
+            self.load()
+
+    @property
+    def is_fitted(self) -> bool:
+        return self._ids is not None
+
+    def __len__(self) -> int:
+        return 0 if self._ids is None else len(self._ids)
+
+    def fit(self, vectors: np.ndarray, fingerprint: Optional[str] = None) -> None:
+        """Build the index over a matrix of vectors, their row numbers are returned as ids by :meth:`search`.
+
+        Args:
+            vectors: matrix of vectors of shape ``(n, dim)``
+            fingerprint: an identifier of the base of the vectors that is saved with the index, a digest of the
+                vectors is used if it is ``None``
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.fingerprint = base_fingerprint(vectors) if fingerprint is None else fingerprint
+        rng = np.random.RandomState(self.seed)
+        train = vectors[rng.choice(len(vectors), self.train_size, replace=False)] \
+            if len(vectors) > self.train_size else vectors
+
+        n_lists = max(1, min(self.n_lists, len(train)))
+        if n_lists > 1:
+            log.info(f'Training {n_lists} centroids of an IVF index on {len(train)} vectors')
+            self.centroids = kmeans(train, n_lists, self.n_iter, self.seed)
+        else:
+            self.centroids = vectors.mean(axis=0, keepdims=True) if len(vectors) else \
+                np.zeros((1, vectors.shape[1]), dtype=np.float32)
+        assignment = nearest_centroids(vectors, self.centroids)
+        self._ids = np.argsort(assignment, kind='stable')
+        self._offsets = np.zeros(len(self.centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=len(self.centroids)), out=self._offsets[1:])
+
+        if self.pq_subspaces:
+            if vectors.shape[1] % self.pq_subspaces:
+                raise ConfigError(f'Vectors dimension {vectors.shape[1]} is not divisible by '
+                                  f'pq_subspaces={self.pq_subspaces}')
+            residuals = (vectors - self.centroids[assignment])[self._ids]
+            parts = np.split(residuals, self.pq_subspaces, axis=1)
+            train_parts = np.split(residuals[rng.choice(len(residuals), min(len(residuals), self.train_size),
+                                                        replace=False)], self.pq_subspaces, axis=1)
+            n_codes = min(256, len(train_parts[0]))
+            self._codebooks = np.stack([kmeans(part, n_codes, self.n_iter, self.seed) for part in train_parts])
+            self._codes = np.stack([nearest_centroids(part, codebook).astype(np.uint8)
+                                    for part, codebook in zip(parts, self._codebooks)], axis=1)
+            self._vectors = None
+        else:
+            self._vectors = vectors[self._ids]
+            self._codes = self._codebooks = None
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Find vectors with the highest inner products with every query of a batch.
+
+        Args:
+            queries: matrix of queries of shape ``(batch_size, dim)``
+            k: number of returned vectors for every query
+
+        Returns:
+            matrices of ids and scores of shape ``(batch_size, k)`` sorted by descending scores, rows are padded
+            with ``-1`` ids and ``-inf`` scores if less than ``k`` vectors are found
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+
+        coarse = queries @ self.centroids.T
+        n_probe = min(self.n_probe, len(self.centroids))
+        probes = top_k(coarse - (self.centroids ** 2).sum(axis=1) / 2, n_probe)
+        subspaces = np.arange(self.pq_subspaces)
+        for i, (query, lists) in enumerate(zip(queries, probes)):
+            bounds = [(self._offsets[j], self._offsets[j + 1]) for j in lists if self._offsets[j] < self._offsets[j + 1]]
+            if not bounds:
+                continue
+            rows = np.concatenate([np.arange(start, end) for start, end in bounds])
+            if self._codes is None:
+                row_scores = np.concatenate([self._vectors[start:end] @ query for start, end in bounds])
+            else:
+                tables = np.einsum('msd,md->ms', self._codebooks, query.reshape(self.pq_subspaces, -1))
+                row_scores = tables[subspaces, self._codes[rows]].sum(axis=1)
+                row_scores += np.repeat(coarse[i, lists], np.diff(self._offsets)[lists])
+            best = top_k(row_scores[None], k)[0]
+            ids[i, :len(best)] = self._ids[rows[best]]
+            scores[i, :len(best)] = row_scores[best]
+        return ids, scores
+
+    def __call__(self, queries: np.ndarray, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        return self.search(queries, k)
+
+    def save(self) -> None:
+        """Save the index to :attr:`save_path` directory."""
+        log.info(f'Saving an IVF index to {self.save_path}')
+        self.save_path.mkdir(parents=True, exist_ok=True)
+        np.save(self.save_path / 'centroids.npy', self.centroids)
+        np.save(self.save_path / 'ids.npy', self._ids)
+        np.save(self.save_path / 'offsets.npy', self._offsets)
+        if self._codes is None:
+            np.save(self.save_path / 'vectors.npy', self._vectors)
+        else:
+            np.save(self.save_path / 'codes.npy', self._codes)
+            np.save(self.save_path / 'codebooks.npy', self._codebooks)
+        save_json({'pq_subspaces': self.pq_subspaces if self._codes is not None else 0,
+                   'fingerprint': self.fingerprint}, self.save_path / 'meta.json')
+
+    def load(self) -> None:
+        """Load the index from :attr:`load_path` directory, stored vectors or codes are memory-mapped."""
+        log.info(f'Loading an IVF index from {self.load_path}')
+        meta = read_json(self.load_path / 'meta.json')
+        self.pq_subspaces = meta['pq_subspaces']
+        self.fingerprint = meta.get('fingerprint')
+        self.centroids = np.load(self.load_path / 'centroids.npy')
+        self._ids = np.load(self.load_path / 'ids.npy', mmap_mode='r')
+        self._offsets = np.load(self.load_path / 'offsets.npy')
+        if self.pq_subspaces:
+            self._codes = np.load(self.load_path / 'codes.npy', mmap_mode='r')
+            self._codebooks = np.load(self.load_path / 'codebooks.npy')
+            self._vectors = None
+        else:
+            self._vectors = np.load(self.load_path / 'vectors.npy', mmap_mode='r')
+            self._codes = self._codebooks = None
@@ -13,13 +13,14 @@
 # limitations under the License.
 
 from logging import getLogger
-from typing import List, Iterable, Callable, Union
+from typing import List, Iterable, Callable, Union, Optional
 
 import numpy as np
 
 from deeppavlov.core.common.registry import register
 from deeppavlov.core.data.simple_vocab import SimpleVocabulary
 from deeppavlov.core.models.component import Component
+from deeppavlov.models.ranking.ann_index import IVFIndex, base_fingerprint, search_or_exact, top_k
 from deeppavlov.models.ranking.keras_siamese_model import SiameseModel
 
 log = getLogger(__name__)
@@ -46,6 +47,9 @@ class SiamesePredictor(Component):
             :class:`~deeppavlov.models.preprocessors.siamese_preprocessor.SiamesePreprocessor`.
         interact_pred_num: The number of the most relevant ``responses`` which will be returned.
             Will be used if the ``ranking`` is set to ``True``.
+        index: An optional :class:`~deeppavlov.models.ranking.ann_index.IVFIndex` of ``responses`` vectors.
+            It is built and saved if it is not loaded or was built over other ``responses`` vectors.
+            Will be used if the ``ranking`` is set to ``True`` and the ``attention`` is set to ``False``.
         **kwargs: Other parameters.
     """
 
@@ -58,6 +62,7 @@ class SiamesePredictor(Component):
                  responses: SimpleVocabulary = None,
                  preproc_func: Callable = None,
                  interact_pred_num: int = 3,
+                 index: Optional[IVFIndex] = None,
                  *args, **kwargs) -> None:
 
         super().__init__()
@@ -71,51 +76,66 @@ class SiamesePredictor(Component):
         self.preproc_func = preproc_func
         self.interact_pred_num = interact_pred_num
         self.model = model
+        self.index = index
         if self.ranking:
             self.responses = {el[1]: el[0] for el in responses.items()}
             self._build_preproc_responses()
             if not self.attention:
                 self._build_response_embeddings()
-
-    def __call__(self, batch: Iterable[List[np.ndarray]]) -> List[Union[List[str],str]]:
-        context = next(batch)
-        try:
-            next(batch)
-            log.error("It is not intended to use the `%s` with the batch size greater then 1." % self.__class__)
-        except StopIteration:
-            pass
-
+                if self.index is not None:
+                    fingerprint = base_fingerprint(np.asarray(self.response_embeddings, dtype=np.float32))
+                    if self.index.fingerprint == fingerprint:
+                        log.info("Using the loaded index of responses vectors")
+                    else:
+                        self.index.fit(self.response_embeddings, fingerprint)
+                        if self.index.save_path is not None:
+                            self.index.save()
+
+    def __call__(self, batch: Iterable[List[np.ndarray]]) -> List[Union[List[str], str]]:
+        contexts = list(batch)
 
         if self.ranking:
-            if len(context) == self.num_context_turns:
-                scores = []
-                if self.attention:
-                    for i in range(len(self.preproc_responses) // self.batch_size + 1):
-                        responses = self.preproc_responses[i*self.batch_size: (i+1)*self.batch_size]
-                        b = [context + el for el in responses]
-                        b = self.model._make_batch(b)
-                        sc = self.model._predict_on_batch(b)
-                        scores += list(sc)
-                else:
-                    b = self.model._make_batch([context])
-                    context_emb = self.model._predict_context_on_batch(b)
-                    context_emb = np.squeeze(context_emb, axis=0)
-                    scores = context_emb @ self.response_embeddings.T
-                ids = np.flip(np.argsort(scores), -1)
-                return [[self.responses[el] for el in ids[:self.interact_pred_num]]]
-            else:
-                return ["Please, provide contexts separated by '&' in the number equal to that used while training."]
-
-        else:
+            valid = [len(context) == self.num_context_turns for context in contexts]
+            ids = iter(self._rank([context for context, v in zip(contexts, valid) if v]))
+            return [[self.responses[el] for el in next(ids)] if v else
+                    "Please, provide contexts separated by '&' in the number equal to that used while training."
+                    for v in valid]
+
+        results = []
+        for context in contexts:
             if len(context) == 2:
                 b = self.model._make_batch([context])
                 sc = self.model._predict_on_batch(b)[0]
                 if sc > 0.5:
-                    return ["This is a paraphrase."]
+                    results.append("This is a paraphrase.")
                 else:
-                    return ["This is not a paraphrase."]
+                    results.append("This is not a paraphrase.")
             else:
-                return ["Please, provide two sentences separated by '&'."]
+                results.append("Please, provide two sentences separated by '&'.")
+        return results
+
+    def _rank(self, contexts: List[List[np.ndarray]]) -> List[np.ndarray]:
+        """Get ids of ``interact_pred_num`` the most relevant responses for every context."""
+        if not contexts:
+            return []
+        if self.attention:
+            ids = []
+            for context in contexts:
+                scores = []
+                for i in range(len(self.preproc_responses) // self.batch_size + 1):
+                    responses = self.preproc_responses[i*self.batch_size: (i+1)*self.batch_size]
+                    b = [context + el for el in responses]
+                    b = self.model._make_batch(b)
+                    sc = self.model._predict_on_batch(b)
+                    scores += list(sc)
+                ids.append(top_k(np.array(scores).reshape(1, -1), self.interact_pred_num)[0])
+            return ids
+
+        b = self.model._make_batch(contexts)
+        context_emb = self.model._predict_context_on_batch(b)
+        ids = search_or_exact(context_emb, self.response_embeddings, self.interact_pred_num, self.index)
+        # rows are padded with -1 ids if there are less than ``interact_pred_num`` responses
+        return [el[el >= 0] for el in ids]
 
     def reset(self) -> None:
         pass
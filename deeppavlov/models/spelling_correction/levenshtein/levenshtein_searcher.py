@@ -1,10 +1,11 @@
-import copy
 import itertools
+from collections import defaultdict
+from pathlib import Path
 
 import numpy as np
 from sortedcontainers import SortedListWithKey
 
-from .tabled_trie import Trie, make_trie
+from .tabled_trie import Trie, make_trie, load_trie, pack_future_symbols
 
 
 class LevenshteinSearcher:
@@ -12,6 +13,8 @@ class LevenshteinSearcher:
     Класс для поиска близких слов
     в соответствии с расстоянием Левенштейна
 
+    dictionary может быть списком слов, готовым бором или путём к бору,
+    сохранённому методом Trie.save или Trie.save_binary
     """
     def __init__(self, alphabet, dictionary, operation_costs=None,
                  allow_spaces=False, euristics='none'):
@@ -29,6 +32,9 @@ class LevenshteinSearcher:
         if isinstance(dictionary, Trie):
             # словарь передан уже в виде бора
             self.dictionary = dictionary
+        elif isinstance(dictionary, (str, Path)):
+            # словарь передан в виде пути к сохранённому бору
+            self.dictionary = load_trie(dictionary)
         else:
             self.dictionary = make_trie(alphabet, dictionary, make_cashed=True,
                                         precompute_symbols=self.euristics,
@@ -146,14 +152,30 @@ class LevenshteinSearcher:
                     insertion_cost = cost / len(low)
                     for a in low:
                         insertion_costs[a] = min(insertion_costs[a], insertion_cost)
-        # предвычисление возможных будущих символов в узлах дерева
-        # precompute_future_symbols(self.dictionary, self.euristics, self.allow_spaces)
-        # предвычисление стоимостей потери символа в узлах дерева
-        self._absense_costs_by_node = _precompute_absense_costs(
-            self.dictionary, removal_costs, insertion_costs,
-            self.euristics, self.allow_spaces)
+        # стоимости хранятся в массивах по символам алфавита и пробелу, как и битовые маски будущих символов
+        symbols = list(self.dictionary.alphabet) + [' ']
+        self._symbol_codes = {a: i for i, a in enumerate(symbols)}
+        self._removal_costs = np.array([removal_costs.get(a, np.inf) for a in symbols])
+        self._insertion_costs = np.array([insertion_costs.get(a, np.inf) for a in symbols])
+        # предвычисленные будущие символы в узлах дерева в виде упакованных битовых масок
+        self._future_symbols = pack_future_symbols(self.dictionary)[:, :self.euristics]
+        # стоимости потери символа в узлах дерева вычисляются при первом обращении к узлу
+        self._absense_costs_by_node = dict()
         # массив для сохранения эвристик
-        self._temporary_euristics = [dict() for i in range(len(self.dictionary))]
+        self._temporary_euristics = defaultdict(dict)
+
+    def _get_absense_costs(self, index):
+        """
+        Возвращает массив shape=(число символов, euristics) минимальных штрафов
+        за появление символа на j-ой позиции в вершине с номером index
+        """
+        costs = self._absense_costs_by_node.get(index)
+        if costs is None:
+            symbols = np.unpackbits(self._future_symbols[index], axis=-1,
+                                    count=len(self._symbol_codes)).astype(bool)
+            costs = _precompute_absense_costs(symbols, self._removal_costs, self._insertion_costs)
+            self._absense_costs_by_node[index] = costs
+        return costs
 
     def _define_h_function(self):
         if self.euristics in [None, 0]:
@@ -188,12 +210,11 @@ class LevenshteinSearcher:
         if cost is not None:
             return cost
         # извлечение нужных данных из массивов
-        absense_costs = self._absense_costs_by_node[index]
-        data = self.dictionary.data[index]
+        absense_costs = self._get_absense_costs(index)
         costs = np.zeros(dtype=np.float64, shape=(self.euristics,))
         # costs[j] --- оценка штрафа при предпросмотре вперёд на j символов
         for i, a in enumerate(suffix):
-            costs[i:] += absense_costs[a][i:]
+            costs[i:] += absense_costs[self._symbol_codes[a], i:]
         cost = max(costs)
         index_temporary_euristics[suffix] = cost
         return cost
@@ -211,62 +232,38 @@ class LevenshteinSearcher:
         return min(removal_cost, insertion_cost)
 
 
-def _precompute_absense_costs(dictionary, removal_costs, insertion_costs, n,
-                              allow_spaces=False):
+def _precompute_absense_costs(symbols, removal_costs, insertion_costs):
     """
-    Вычисляет минимальную стоимость появления нового символа в узлах словаря
+    Вычисляет минимальную стоимость появления нового символа в узле словаря
     в соответствии со штрафами из costs
 
     Аргументы:
     ---------------
-    dictionary : Trie
-        словарь, хранящийся в виде ациклического автомата
+    symbols : array, type=bool, shape=(n, число символов)
+        symbols[j, a] = True <-> символ с кодом a может стоять на j-ой позиции после узла,
+        n --- глубина ``заглядывания вперёд'' в словаре
 
-    removal_costs : dict
+    removal_costs : array, shape=(число символов,)
         штрафы за удаление символов
 
-    insertion_costs : dict
+    insertion_costs : array, shape=(число символов,)
         штрафы за вставку символов
 
-    n : int
-        глубина ``заглядывания вперёд'' в словаре
-
     Возвращает
     ---------------
-    answer : list of dicts, len(answer)=len(dictionary)
-        answer[i][a][j] равно минимальному штрафу за появление символа a
-        в j-ой позиции в вершине с номером i
+    answer : array, shape=(число символов, n)
+        answer[a][j] равно минимальному штрафу за появление символа с кодом a
+        в j-ой позиции в узле
     """
-    answer = [dict() for node in dictionary.data]
-    if n == 0:
-        return answer
-    curr_alphabet = copy.copy(dictionary.alphabet)
-    if allow_spaces:
-        curr_alphabet += [' ']
-    for l, (costs_in_node, node) in enumerate(zip(answer, dictionary.data)):
-        # определение минимальной стоимости удаления символов
-        curr_node_removal_costs = np.empty(dtype=np.float64, shape=(n,))
-        if len(node[0]) > 0:
-            curr_node_removal_costs[0] = min(removal_costs[symbol] for symbol in node[0])
-            for j, symbols in enumerate(node[1:], 1):
-                if len(symbols) == 0:
-                    curr_node_removal_costs[j:] = curr_node_removal_costs[j-1]
-                    break
-                curr_cost = min(removal_costs[symbol] for symbol in symbols)
-                curr_node_removal_costs[j] = min(curr_node_removal_costs[j-1], curr_cost)
-        else:
-            curr_node_removal_costs[:] = np.inf
-        # определение минимальной стоимости вставки
-        for a in curr_alphabet:
-            curr_symbol_costs = np.empty(dtype=np.float64, shape=(n,))
-            curr_symbol_costs.fill(insertion_costs[a])
-            for j, symbols in enumerate(node):
-                if a in symbols:
-                    curr_symbol_costs[j:] = 0.0
-                    break
-                curr_symbol_costs[j] = min(curr_symbol_costs[j], curr_node_removal_costs[j])
-            costs_in_node[a] = curr_symbol_costs
-    return answer
+    # определение минимальной стоимости удаления символов,
+    # после первой пустой позиции все следующие позиции тоже пусты
+    node_removal_costs = np.minimum.accumulate(
+        np.where(symbols, removal_costs, np.inf).min(axis=1, initial=np.inf))
+    # определение минимальной стоимости вставки,
+    # начиная с первой позиции, на которой символ может встретиться, штраф нулевой
+    seen = np.logical_or.accumulate(symbols, axis=0)
+    answer = np.where(seen, 0.0, np.minimum(insertion_costs, node_removal_costs[:, None]))
+    return answer.T
 
 
 class SegmentTransducer:
@@ -14,14 +14,32 @@
 import string
 from logging import getLogger
 from math import log10
+from multiprocessing import Pool
 from typing import Iterable, List, Tuple, Optional
 
+from deeppavlov.core.commands.utils import expand_path
+from deeppavlov.core.common.cache import LRUCache
+from deeppavlov.core.common.errors import ConfigError
 from deeppavlov.core.common.registry import register
 from deeppavlov.core.models.component import Component
 from .levenshtein_searcher import LevenshteinSearcher
+from .tabled_trie import load_trie
 
 logger = getLogger(__name__)
 
+_worker_searcher: Optional[LevenshteinSearcher] = None
+_worker_max_distance: Optional[int] = None
+
+
+def _init_search_worker(searcher: LevenshteinSearcher, max_distance: int) -> None:
+    global _worker_searcher, _worker_max_distance
+    _worker_searcher = searcher
+    _worker_max_distance = max_distance
+
+
+def _search_words(words: List[str]) -> List[List[Tuple[str, float]]]:
+    return [_worker_searcher.search(word, d=_worker_max_distance) for word in words]
+
 
 @register('spelling_levenshtein')
 class LevenshteinSearcherComponent(Component):
@@ -32,33 +50,86 @@ class LevenshteinSearcherComponent(Component):
         max_distance: maximum allowed Damerau-Levenshtein distance between source words and candidates
         error_probability: assigned probability for every edit
         vocab_penalty: assigned probability of an out of vocabulary token being the correct one without changes
+        trie_path: path to a directory with a binary trie of the words; the trie is loaded from it with memory
+         mapping if it exists, otherwise the trie is built from ``words`` and saved there
+        cache_size: maximum number of words to keep found candidates for
+        n_workers: a number of processes that search candidates for words of a batch missing from the cache
 
     Attributes:
         max_distance: maximum allowed Damerau-Levenshtein distance between source words and candidates
         error_probability: assigned logarithmic probability for every edit
         vocab_penalty: assigned logarithmic probability of an out of vocabulary token being the correct one without
          changes
+        cache: a bounded cache of found candidates for ``(word, max_distance)`` pairs
+        n_workers: a number of processes that search candidates for words of a batch missing from the cache
     """
 
     _punctuation = frozenset(string.punctuation)
 
-    def __init__(self, words: Iterable[str], max_distance: int = 1, error_probability: float = 1e-4,
-                 vocab_penalty: Optional[float] = None, **kwargs):
-        words = list({word.strip().lower().replace('ё', 'е') for word in words})
-        alphabet = sorted({letter for word in words for letter in word})
+    def __init__(self, words: Optional[Iterable[str]] = None, max_distance: int = 1, error_probability: float = 1e-4,
+                 vocab_penalty: Optional[float] = None, trie_path: Optional[str] = None, cache_size: int = 100000,
+                 n_workers: int = 1, **kwargs):
         self.max_distance = max_distance
         self.error_probability = log10(error_probability)
         self.vocab_penalty = self.error_probability if vocab_penalty is None else log10(vocab_penalty)
-        self.searcher = LevenshteinSearcher(alphabet, words, allow_spaces=True, euristics=2)
 
-    def _infer_instance(self, tokens: Iterable[str]) -> List[List[Tuple[float, str]]]:
+        trie_path = expand_path(trie_path) if trie_path is not None else None
+        if trie_path is not None and trie_path.is_dir():
+            logger.info(f'Loading a words trie from {trie_path}')
+            trie = load_trie(trie_path)
+            self.searcher = LevenshteinSearcher(trie.alphabet, trie, allow_spaces=True, euristics=2)
+        else:
+            if words is None:
+                raise ConfigError('LevenshteinSearcherComponent needs `words` if a trie does not exist in `trie_path`')
+            words = list({word.strip().lower().replace('ё', 'е') for word in words})
+            alphabet = sorted({letter for word in words for letter in word})
+            self.searcher = LevenshteinSearcher(alphabet, words, allow_spaces=True, euristics=2)
+            if trie_path is not None:
+                logger.info(f'Saving a words trie to {trie_path}')
+                self.searcher.dictionary.save_binary(trie_path)
+
+        self.cache = LRUCache(cache_size)
+        self.n_workers = n_workers
+        self._pool: Optional[Pool] = None
+
+    def _search(self, words: List[str]) -> List[List[Tuple[str, float]]]:
+        """Search candidates for words, possibly splitting them among :attr:`n_workers` processes."""
+        if self.n_workers <= 1 or len(words) < 2:
+            return [self.searcher.search(word, d=self.max_distance) for word in words]
+
+        if self._pool is None:
+            self._pool = Pool(self.n_workers, initializer=_init_search_worker,
+                              initargs=(self.searcher, self.max_distance))
+        chunk_size = -(-len(words) // self.n_workers)
+        chunks = [words[i:i + chunk_size] for i in range(0, len(words), chunk_size)]
+        return [found for chunk in self._pool.map(_search_words, chunks) for found in chunk]
+
+    def _find_candidates(self, batch: List[List[str]]) -> dict:
+        """Find candidates for every unique word of the batch that is not a punctuation mark.
+
+        Candidates are taken from the cache where possible and only the rest of the words are searched.
+        """
+        found, missing = {}, []
+        for word in {word for tokens in batch for word in tokens} - self._punctuation:
+            candidates = self.cache.get((word, self.max_distance))
+            if candidates is None:
+                missing.append(word)
+            else:
+                found[word] = candidates
+        for word, candidates in zip(missing, self._search(missing)):
+            self.cache[(word, self.max_distance)] = candidates
+            found[word] = candidates
+        logger.debug(f'{len(found) - len(missing)} of {len(found)} unique words were found in the cache, '
+                     f'cache hit rate is {self.cache.hit_rate:.3f}')
+        return found
+
+    def _infer_instance(self, tokens: Iterable[str], found: dict) -> List[List[Tuple[float, str]]]:
         candidates = []
         for word in tokens:
             if word in self._punctuation:
                 candidates.append([(0, word)])
             else:
-                c = {candidate: self.error_probability * distance
-                     for candidate, distance in self.searcher.search(word, d=self.max_distance)}
+                c = {candidate: self.error_probability * distance for candidate, distance in found[word]}
                 c[word] = c.get(word, self.vocab_penalty)
                 candidates.append([(score, candidate) for candidate, score in c.items()])
         return candidates
@@ -66,10 +137,21 @@ class LevenshteinSearcherComponent(Component):
     def __call__(self, batch: Iterable[Iterable[str]], *args, **kwargs) -> List[List[List[Tuple[float, str]]]]:
         """Propose candidates for tokens in sentences
 
+        Every unique token of the batch is searched only once and found candidates are cached between calls.
+
         Args:
             batch: batch of tokenized sentences
 
         Returns:
             batch of lists of probabilities and candidates for every token
         """
-        return [self._infer_instance(tokens) for tokens in batch]
+        batch = [list(tokens) for tokens in batch]
+        found = self._find_candidates(batch)
+        return [self._infer_instance(tokens, found) for tokens in batch]
+
+    def destroy(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        super().destroy()
@@ -1,5 +1,7 @@
 import copy
+import json
 from collections import defaultdict
+from pathlib import Path
 
 import numpy as np
 
@@ -81,11 +83,40 @@ class Trie:
                         map(str, symbols)) for symbols in elem) + "\n")
         return
 
+    def save_binary(self, outdir):
+        """
+        Сохраняет дерево в каталог outdir в бинарном формате:
+        матрица потомков --- в graph.npy, битовая маска финальных вершин --- в final.npy,
+        предвычисленные будущие символы --- в data.npy в виде упакованных битовых масок,
+        остальные атрибуты --- в meta.json.
+        Массивы можно загрузить функцией load_trie с отображением в память.
+        """
+        outdir = Path(outdir)
+        outdir.mkdir(parents=True, exist_ok=True)
+        if self.dict_storage:
+            graph = np.full(shape=(self.nodes_number, len(self.alphabet)),
+                            fill_value=Trie.NO_NODE, dtype=np.int32)
+            for index in range(self.nodes_number):
+                for code, child in self._get_children_and_letters(index, return_indexes=True):
+                    graph[index, code] = child
+        else:
+            graph = np.asarray(self.graph, dtype=np.int32)
+        np.save(outdir / "graph.npy", graph)
+        np.save(outdir / "final.npy", np.packbits(np.asarray(self.final, dtype=bool)))
+        has_data = self.precompute_symbols is not None and any(x is not None for x in self.data)
+        if has_data:
+            np.save(outdir / "data.npy", pack_future_symbols(self))
+        meta = {attr: getattr(self, attr) for attr in Trie.ATTRS}
+        meta.update(alphabet=list(self.alphabet), root=int(self.root),
+                    nodes_number=int(self.nodes_number), has_data=has_data)
+        with open(outdir / "meta.json", "w", encoding="utf8") as fout:
+            json.dump(meta, fout, ensure_ascii=False)
+
     def make_cashed(self):
         """
         Включает кэширование запросов к descend
         """
-        self._descendance_cash = [dict() for _ in self.graph]
+        self._descendance_cash = defaultdict(dict)
         self.descend = self._descend_cashed
 
     def make_numpied(self):
@@ -150,7 +181,7 @@ class Trie:
                 letters_with_children.pop()
                 branch.pop()
                 if len(indexes) == 0:
-                    raise StopIteration()
+                    return
                 word.pop()
             next_letter, next_child = letters_with_children[-1][indexes[-1]]
             indexes[-1] += 1
@@ -237,7 +268,7 @@ class Trie:
         Спуск из вершины curr по строке s
         """
         for a in s:
-            curr = self.graph[curr][self.alphabet_codes[a]]
+            curr = int(self.graph[curr][self.alphabet_codes[a]])
             if curr == Trie.NO_NODE:
                 break
         return curr
@@ -255,7 +286,7 @@ class Trie:
         # для оптимизации дублируем код
         res = curr
         for a in s:
-            res = self.graph[res][self.alphabet_codes[a]]
+            res = int(self.graph[res][self.alphabet_codes[a]])
             # res = self.graph[res][a]
             if res == Trie.NO_NODE:
                 break
@@ -400,7 +431,84 @@ class TrieMinimizer:
         return order
 
 
-def load_trie(infile):
+class PackedFutureSymbols:
+    """
+    Будущие символы вершин, хранящиеся в виде упакованных битовых масок
+
+    Атрибуты
+    --------
+    packed: array, type=uint8, shape=(число вершин, глубина, (len(symbols) + 7) // 8)
+    packed[i, j] --- упакованная маска символов, которые могут стоять на j-ой позиции после вершины i
+    symbols: list, символы, соответствующие битам масок
+    """
+    def __init__(self, packed, symbols):
+        self.packed = packed
+        self.symbols = symbols
+
+    def unpack(self, index):
+        """
+        Возвращает булеву матрицу shape=(глубина, len(symbols)) будущих символов вершины index
+        """
+        return np.unpackbits(self.packed[index], axis=-1, count=len(self.symbols)).astype(bool)
+
+    def __getitem__(self, index):
+        return [{self.symbols[i] for i in np.flatnonzero(level)} for level in self.unpack(index)]
+
+    def __len__(self):
+        return len(self.packed)
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+
+def pack_future_symbols(trie):
+    """
+    Упаковывает предвычисленные будущие символы trie.data в битовые маски
+    по символам trie.alphabet и пробелу
+    """
+    if isinstance(trie.data, PackedFutureSymbols):
+        return trie.data.packed
+    symbols = list(trie.alphabet) + [" "]
+    codes = {a: i for i, a in enumerate(symbols)}
+    depth = max((len(node_data) for node_data in trie.data if node_data is not None), default=0)
+    bits = np.zeros(shape=(len(trie.data), depth, len(symbols)), dtype=bool)
+    for index, node_data in enumerate(trie.data):
+        for j, level in enumerate(node_data or []):
+            bits[index, j, [codes[a] for a in level]] = True
+    return np.packbits(bits, axis=-1)
+
+
+def _load_binary_trie(indir, mmap=True):
+    indir = Path(indir)
+    mmap_mode = "r" if mmap else None
+    with open(indir / "meta.json", "r", encoding="utf8") as fin:
+        meta = json.load(fin)
+    trie = Trie(meta["alphabet"], make_sorted=False)
+    for attr in Trie.ATTRS:
+        setattr(trie, attr, meta[attr])
+    trie.is_numpied = True
+    trie.nodes_number = meta["nodes_number"]
+    trie.root = meta["root"]
+    trie.graph = np.load(indir / "graph.npy", mmap_mode=mmap_mode)
+    trie.final = np.unpackbits(np.load(indir / "final.npy"), count=trie.nodes_number).astype(bool)
+    if meta["has_data"]:
+        trie.data = PackedFutureSymbols(np.load(indir / "data.npy", mmap_mode=mmap_mode),
+                                        list(trie.alphabet) + [" "])
+    else:
+        trie.data = [None] * trie.nodes_number
+    if trie.to_make_cashed:
+        trie.make_cashed()
+    return trie
+
+
+def load_trie(infile, mmap=True):
+    """
+    Загружает дерево, сохранённое методом save в файл infile
+    или методом save_binary в каталог infile.
+    Массивы бинарного формата отображаются в память, если mmap=True.
+    """
+    if Path(infile).is_dir():
+        return _load_binary_trie(infile, mmap=mmap)
     with open(infile, "r", encoding="utf8") as fin:
         line = fin.readline().strip()
         flags = [x=='T' for x in line.split()]
@@ -12,15 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from collections import Counter
+from array import array
+from itertools import chain
 from logging import getLogger
-from typing import List, Any, Generator, Tuple, KeysView, ValuesView, Dict, Optional
+from multiprocessing import Pool
+from pathlib import Path
+from typing import List, Any, Generator, Tuple, Dict, Optional, Union
 
 import numpy as np
 import scipy as sp
 from scipy import sparse
 from sklearn.utils import murmurhash3_32
 
+from deeppavlov.core.commands.utils import expand_path
+from deeppavlov.core.common.file import read_json, save_json
 from deeppavlov.core.common.registry import register
 from deeppavlov.core.models.component import Component
 from deeppavlov.core.models.estimator import Estimator
@@ -43,6 +48,117 @@ def hash_(token: str, hash_size: int) -> int:
     return murmurhash3_32(token, positive=True) % hash_size
 
 
+def count_hashes(batch_ngrams: List[List[str]], hash_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Count hashed n-grams of a batch of documents.
+
+    Every distinct n-gram of the batch is hashed only once, and counting is done with numpy.
+
+    Args:
+        batch_ngrams: a list of n-grams lists, one for each document
+        hash_size: hash size
+
+    Returns:
+        a tuple of n-gram hashes, positions of documents in the batch and count values
+
+    """
+    flat = list(chain.from_iterable(batch_ngrams))
+    vocab = {}
+    token_ids = np.fromiter((vocab.setdefault(token, len(vocab)) for token in flat), dtype=np.int64, count=len(flat))
+    vocab_hashes = np.fromiter((hash_(token, hash_size) for token in vocab), dtype=np.int64, count=len(vocab))
+    positions = np.repeat(np.arange(len(batch_ngrams), dtype=np.int64), [len(ngrams) for ngrams in batch_ngrams])
+    keys, counts = np.unique(positions * hash_size + vocab_hashes[token_ids], return_counts=True)
+    return keys % hash_size, keys // hash_size, counts
+
+
+_worker_tokenizer: Optional[Component] = None
+_worker_hash_size: Optional[int] = None
+
+
+def _init_counting_worker(tokenizer: Component, hash_size: int) -> None:
+    global _worker_tokenizer, _worker_hash_size
+    _worker_tokenizer = tokenizer
+    _worker_hash_size = hash_size
+
+
+def _tokenize_and_count(docs: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return count_hashes(list(_worker_tokenizer(docs)), _worker_hash_size)
+
+
+def save_mmap_matrix(path: Union[str, Path], matrix: Sparse, opts: Dict[str, Any]) -> None:
+    """Save a tfidf matrix to a directory in a memory-mappable format.
+
+    The ``data``, ``indices`` and ``indptr`` arrays of the matrix and the term frequencies are saved as separate
+    **.npy** files, the document index is saved as a pair of ``doc_ids.json`` and ``doc_nums.npy`` files.
+
+    Args:
+        path: a path to a directory
+        matrix: a tfidf csr_matrix
+        opts: a dictionary with ``hash_size``, ``ngram_range``, ``doc_index`` and ``term_freqs`` keys
+
+    Returns:
+        None
+
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    np.save(path / 'data.npy', matrix.data)
+    np.save(path / 'indices.npy', matrix.indices)
+    np.save(path / 'indptr.npy', matrix.indptr)
+    np.save(path / 'term_freqs.npy', np.asarray(opts['term_freqs']))
+
+    doc_ids, doc_nums = zip(*opts['doc_index'].items()) if opts['doc_index'] else ((), ())
+    np.save(path / 'doc_nums.npy', np.array(doc_nums, dtype=np.int64))
+    save_json(list(doc_ids), path / 'doc_ids.json')
+
+    save_json({'shape': list(matrix.shape),
+               'hash_size': opts['hash_size'],
+               'ngram_range': list(opts['ngram_range'])}, path / 'meta.json')
+
+
+def load_mmap_matrix(path: Union[str, Path]) -> Tuple[Sparse, Dict[str, Any]]:
+    """Load a tfidf matrix saved by :func:`save_mmap_matrix`.
+
+    Matrix arrays and term frequencies are opened with ``mmap_mode='r'``, so they are not copied into process memory
+    and are shared through the OS page cache between all the processes that use the same files.
+
+    Args:
+        path: a path to a directory
+
+    Returns:
+        a tuple of tfidf matrix and options dictionary
+
+    """
+    path = Path(path)
+    meta = read_json(path / 'meta.json')
+    matrix = Sparse((np.load(path / 'data.npy', mmap_mode='r'),
+                     np.load(path / 'indices.npy', mmap_mode='r'),
+                     np.load(path / 'indptr.npy', mmap_mode='r')), shape=tuple(meta['shape']), copy=False)
+    doc_ids = read_json(path / 'doc_ids.json')
+    doc_nums = np.load(path / 'doc_nums.npy').tolist()
+    opts = {'hash_size': meta['hash_size'],
+            'ngram_range': meta['ngram_range'],
+            'doc_index': dict(zip(doc_ids, doc_nums)),
+            'term_freqs': np.load(path / 'term_freqs.npy', mmap_mode='r')}
+    return matrix, opts
+
+
+def convert_npz_to_mmap(npz_path: Union[str, Path], mmap_path: Union[str, Path]) -> None:
+    """Convert a tfidf matrix saved by :class:`HashingTfIdfVectorizer` in **.npz** format to
+    a memory-mappable directory.
+
+    Args:
+        npz_path: a path to **.npz** file
+        mmap_path: a path to a target directory
+
+    Returns:
+        None
+
+    """
+    loader = np.load(expand_path(npz_path), allow_pickle=True)
+    matrix = Sparse((loader['data'], loader['indices'], loader['indptr']), shape=loader['shape'])
+    save_mmap_matrix(expand_path(mmap_path), matrix, loader['opts'].item(0))
+
+
 @register('hashing_tfidf_vectorizer')
 class HashingTfIdfVectorizer(Estimator):
     """Create a tfidf matrix from collection of documents of size [n_documents X n_features(hash_size)].
@@ -51,30 +167,36 @@ class HashingTfIdfVectorizer(Estimator):
         tokenizer: a tokenizer class
         hash_size: a hash size, power of two
         doc_index: a dictionary of document ids and their titles
-        save_path: a path to **.npz** file where tfidf matrix is saved
-        load_path: a path to **.npz** file where tfidf matrix is loaded from
+        n_workers: a number of processes that tokenize and count documents while fitting, every batch passed to
+            :meth:`partial_fit` is split among them
+        save_path: a path to **.npz** file where tfidf matrix is saved or to a directory if matrix should be saved
+            in a memory-mappable format (see :func:`save_mmap_matrix`)
+        load_path: a path to **.npz** file or a directory with a memory-mapped matrix where tfidf matrix is
+            loaded from
 
     Attributes:
         hash_size: a hash size
         tokenizer: instance of a tokenizer class
         term_freqs: a dictionary with tfidf terms and their frequences
         doc_index: provided by a user ids or generated automatically ids
-        rows: tfidf matrix rows corresponding to terms
-        cols: tfidf matrix cols corresponding to docs
-        data: tfidf matrix data corresponding to tfidf values
+        rows: tfidf matrix rows corresponding to terms, a typed int32 array
+        cols: tfidf matrix cols corresponding to docs, a typed int32 array
+        data: tfidf matrix data corresponding to tfidf values, a typed int32 array
 
     """
 
     def __init__(self, tokenizer: Component, hash_size=2 ** 24, doc_index: Optional[dict] = None,
-                 save_path: Optional[str] = None, load_path: Optional[str] = None, **kwargs):
+                 n_workers: int = 1, save_path: Optional[str] = None, load_path: Optional[str] = None, **kwargs):
 
         super().__init__(save_path=save_path, load_path=load_path, mode=kwargs.get('mode', 'infer'))
 
         self.hash_size = hash_size
         self.tokenizer = tokenizer
-        self.rows = []
-        self.cols = []
-        self.data = []
+        self.n_workers = n_workers
+        self._pool: Optional[Pool] = None
+        self.rows = array('i')
+        self.cols = array('i')
+        self.data = array('i')
 
         if kwargs.get('mode', 'infer') == 'infer':
             self.tfidf_matrix, opts = self.load()
@@ -135,36 +257,6 @@ class HashingTfIdfVectorizer(Estimator):
         """
         return dict(zip(self.doc_index.values(), self.doc_index.keys()))
 
-    def get_counts(self, docs: List[str], doc_ids: List[Any]) \
-            -> Generator[Tuple[KeysView, ValuesView, List[int]], Any, None]:
-        """Get term counts for a list of documents.
-
-        Args:
-            docs: a list of input documents
-            doc_ids: a list of document ids corresponding to input documents
-
-        Yields:
-            a tuple of term hashes, count values and column ids
-
-        Returns:
-            None
-
-        """
-        logger.info("Tokenizing batch...")
-        batch_ngrams = list(self.tokenizer(docs))
-        logger.info("Counting hash...")
-        doc_id = iter(doc_ids)
-        for ngrams in batch_ngrams:
-            counts = Counter([hash_(gram, self.hash_size) for gram in ngrams])
-            hashes = counts.keys()
-            values = counts.values()
-            _id = self.doc_index[next(doc_id)]
-            if values:
-                col_id = [_id] * len(values)
-            else:
-                col_id = []
-            yield hashes, values, col_id
-
     def get_count_matrix(self, row: List[int], col: List[int], data: List[int], size: int) \
             -> Sparse:
         """Get count matrix.
@@ -205,14 +297,18 @@ class HashingTfIdfVectorizer(Estimator):
         return tfidfs, term_freqs
 
     def save(self) -> None:
-        """Save tfidf matrix into **.npz** format.
+        """Save tfidf matrix into **.npz** format or into a memory-mappable directory if :attr:`save_path`
+        doesn't have **.npz** suffix.
 
         Returns:
             None
 
         """
         logger.info("Saving tfidf matrix to {}".format(self.save_path))
-        count_matrix = self.get_count_matrix(self.rows, self.cols, self.data,
+        self._close_pool()
+        count_matrix = self.get_count_matrix(np.frombuffer(self.rows, dtype=np.int32),
+                                             np.frombuffer(self.cols, dtype=np.int32),
+                                             np.frombuffer(self.data, dtype=np.int32),
                                              size=len(self.doc_index))
         tfidf_matrix, term_freqs = self.get_tfidf_matrix(count_matrix)
         self.term_freqs = term_freqs
@@ -222,14 +318,17 @@ class HashingTfIdfVectorizer(Estimator):
                 'doc_index': self.doc_index,
                 'term_freqs': self.term_freqs}
 
-        data = {
-            'data': tfidf_matrix.data,
-            'indices': tfidf_matrix.indices,
-            'indptr': tfidf_matrix.indptr,
-            'shape': tfidf_matrix.shape,
-            'opts': opts
-        }
-        np.savez(self.save_path, **data)
+        if self.save_path.suffix == '.npz':
+            data = {
+                'data': tfidf_matrix.data,
+                'indices': tfidf_matrix.indices,
+                'indptr': tfidf_matrix.indptr,
+                'shape': tfidf_matrix.shape,
+                'opts': opts
+            }
+            np.savez(self.save_path, **data)
+        else:
+            save_mmap_matrix(self.save_path, tfidf_matrix, opts)
 
         # release memory
         self.reset()
@@ -241,9 +340,39 @@ class HashingTfIdfVectorizer(Estimator):
             None
 
         """
-        self.rows.clear()
-        self.cols.clear()
-        self.data.clear()
+        self.rows = array('i')
+        self.cols = array('i')
+        self.data = array('i')
+
+    def destroy(self) -> None:
+        self._close_pool()
+        super().destroy()
+
+    def _close_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def _count_batch(self, docs: List[str]) -> Generator[Tuple[int, Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                                                           Any, None]:
+        """Tokenize and count a batch of documents, possibly splitting it among :attr:`n_workers` processes.
+
+        Yields:
+            a tuple of a chunk offset in the batch and :func:`count_hashes` results for the chunk
+
+        """
+        if self.n_workers <= 1:
+            yield 0, count_hashes(list(self.tokenizer(docs)), self.hash_size)
+            return
+
+        if self._pool is None:
+            self._pool = Pool(self.n_workers, initializer=_init_counting_worker,
+                              initargs=(self.tokenizer, self.hash_size))
+        chunk_size = -(-len(docs) // self.n_workers)
+        offsets = range(0, len(docs), chunk_size)
+        chunks = [docs[i:i + chunk_size] for i in offsets]
+        yield from zip(offsets, self._pool.imap(_tokenize_and_count, chunks))
 
     def load(self) -> Tuple[Sparse, Dict]:
         """Load a tfidf matrix as csr_matrix.
@@ -262,6 +391,8 @@ class HashingTfIdfVectorizer(Estimator):
             raise FileNotFoundError("HashingTfIdfVectorizer path doesn't exist!")
 
         logger.info("Loading tfidf matrix from {}".format(self.load_path))
+        if self.load_path.is_dir():
+            return load_mmap_matrix(self.load_path)
         loader = np.load(self.load_path, allow_pickle=True)
         matrix = Sparse((loader['data'], loader['indices'],
                          loader['indptr']), shape=loader['shape'])
@@ -282,10 +413,12 @@ class HashingTfIdfVectorizer(Estimator):
         for doc_id, i in zip(doc_ids, doc_nums):
             self.doc_index[doc_id] = i
 
-        for batch_rows, batch_data, batch_cols in self.get_counts(docs, doc_ids):
-            self.rows.extend(batch_rows)
-            self.cols.extend(batch_cols)
-            self.data.extend(batch_data)
+        batch_cols = np.array([self.doc_index[doc_id] for doc_id in doc_ids], dtype=np.int32)
+        logger.info("Tokenizing and counting batch...")
+        for offset, (hashes, positions, counts) in self._count_batch(docs):
+            self.rows.frombytes(hashes.astype(np.int32).tobytes())
+            self.cols.frombytes(batch_cols[positions + offset].tobytes())
+            self.data.frombytes(counts.astype(np.int32).tobytes())
 
     def fit(self, docs: List[str], doc_ids: List[Any], doc_nums: List[int]) -> None:
         """Fit the vectorizer.
@@ -300,7 +433,5 @@ class HashingTfIdfVectorizer(Estimator):
 
         """
         self.doc_index = {}
-        self.rows = []
-        self.cols = []
-        self.data = []
+        self.reset()
         return self.partial_fit(docs, doc_ids, doc_nums)
@@ -25,6 +25,7 @@ from flask_cors import CORS
 
 from deeppavlov.agents.default_agent.default_agent import DefaultAgent
 from deeppavlov.agents.processors.default_rich_content_processor import DefaultRichContentWrapper
+from deeppavlov.core.agent.dialog_store import build_dialog_stores
 from deeppavlov.core.commands.infer import build_model
 from deeppavlov.core.common.file import read_json
 from deeppavlov.core.common.paths import get_settings_path
@@ -69,7 +70,9 @@ def run_alexa_default_agent(model_config: Union[str, Path, dict],
     def get_default_agent() -> DefaultAgent:
         model = build_model(model_config)
         skill = DefaultStatelessSkill(model) if default_skill_wrap else model
-        agent = DefaultAgent([skill], skills_processor=DefaultRichContentWrapper())
+        server_params = read_json(Path(get_settings_path(), SERVER_CONFIG_FILENAME))
+        agent = DefaultAgent([skill], skills_processor=DefaultRichContentWrapper(),
+                             **build_dialog_stores(**server_params['common_defaults'].get('dialog_store', {})))
         return agent
 
     run_alexa_server(agent_generator=get_default_agent,
@@ -25,6 +25,7 @@ from flask_cors import CORS
 from deeppavlov import build_model
 from deeppavlov.agents.default_agent.default_agent import DefaultAgent
 from deeppavlov.agents.processors.default_rich_content_processor import DefaultRichContentWrapper
+from deeppavlov.core.agent.dialog_store import build_dialog_stores
 from deeppavlov.core.agent import Agent
 from deeppavlov.core.agent.rich_content import RichMessage
 from deeppavlov.core.common.paths import get_settings_path
@@ -110,7 +111,8 @@ def start_alice_server(model_config, https=False, ssl_key=None, ssl_cert=None, p
 
     model = build_model(model_config)
     skill = DefaultStatelessSkill(model, lang='ru')
-    agent = DefaultAgent([skill], skills_processor=DefaultRichContentWrapper())
+    agent = DefaultAgent([skill], skills_processor=DefaultRichContentWrapper(),
+                         **build_dialog_stores(**server_params.get('dialog_store', {})))
 
     start_agent_server(agent, host, port, model_endpoint, ssl_key, ssl_cert)
 
@@ -10,6 +10,7 @@ from flask_cors import CORS
 
 from deeppavlov.agents.default_agent.default_agent import DefaultAgent
 from deeppavlov.agents.processors.default_rich_content_processor import DefaultRichContentWrapper
+from deeppavlov.core.agent.dialog_store import build_dialog_stores
 from deeppavlov.core.commands.infer import build_model
 from deeppavlov.core.common.file import read_json
 from deeppavlov.core.common.paths import get_settings_path
@@ -45,7 +46,9 @@ def run_ms_bf_default_agent(model_config: Union[str, Path, dict],
     def get_default_agent():
         model = build_model(model_config)
         skill = DefaultStatelessSkill(model) if default_skill_wrap else model
-        agent = DefaultAgent([skill], skills_processor=DefaultRichContentWrapper())
+        server_params = read_json(Path(get_settings_path(), SERVER_CONFIG_FILENAME))
+        agent = DefaultAgent([skill], skills_processor=DefaultRichContentWrapper(),
+                             **build_dialog_stores(**server_params['common_defaults'].get('dialog_store', {})))
         return agent
 
     run_ms_bot_framework_server(agent_generator=get_default_agent,
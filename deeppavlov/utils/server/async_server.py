@@ -0,0 +1,359 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import re
+import multiprocessing
+from http import HTTPStatus
+from itertools import count
+from logging import getLogger
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from threading import Thread
+from typing import Union, Optional, List, Tuple
+from urllib.parse import urlsplit
+
+from deeppavlov.core.commands.infer import build_model
+from deeppavlov.core.commands.utils import parse_config
+from deeppavlov.core.common.paths import get_settings_path
+from deeppavlov.core.data.utils import jsonify_data
+from deeppavlov.utils.server.server import SERVER_CONFIG_FILENAME, dialog_logger, get_model_args, \
+    get_server_params, get_ssl_context
+
+log = getLogger(__name__)
+
+
+def _worker_loop(model_config: Union[str, Path, dict], worker_id: int,
+                 requests: multiprocessing.Queue, results: Connection) -> None:
+    """Builds a model and runs it on batches from the ``requests`` queue until ``None`` is received.
+
+    Readiness of the worker is reported to ``results`` as ``(None, None, error)`` message, where ``error``
+    is ``None`` if the model was built successfully.
+    """
+    try:
+        model = build_model(model_config)
+    except Exception as e:
+        log.exception(f'Worker {worker_id} failed to build the model')
+        results.send((None, None, f'{type(e).__name__}: {e}'))
+        return
+    results.send((None, None, None))
+    while True:
+        message = requests.get()
+        if message is None:
+            break
+        request_id, model_args = message
+        try:
+            prediction = model(*model_args)
+            if len(model.out_params) == 1:
+                prediction = [prediction]
+            results.send((request_id, jsonify_data(list(zip(*prediction))), None))
+        except Exception as e:
+            log.exception(f'Worker {worker_id} failed to process a request')
+            results.send((request_id, None, repr(e)))
+
+
+class WorkerPool:
+    """Pool of processes that each hold their own copy of a model built with
+    :func:`~deeppavlov.core.commands.infer.build_model`.
+
+    Every call is dispatched to the live worker with the least number of unfinished requests. Every worker sends
+    results through its own pipe, so a worker that dies cannot block the others. If a worker process exits, its
+    unfinished requests fail with :class:`RuntimeError`.
+
+    Args:
+        model_config: model config path or dict
+        n_workers: number of worker processes
+    """
+
+    def __init__(self, model_config: Union[str, Path, dict], n_workers: int = 1) -> None:
+        context = multiprocessing.get_context('spawn')
+        self._requests = [context.Queue() for _ in range(n_workers)]
+        pipes = [context.Pipe(duplex=False) for _ in range(n_workers)]
+        self._results = [reader for reader, _ in pipes]
+        self._processes = [context.Process(target=_worker_loop, args=(model_config, i, queue, writer))
+                           for i, (queue, (_, writer)) in enumerate(zip(self._requests, pipes))]
+        self._writers = [writer for _, writer in pipes]
+        self._stop_reader, self._stop_writer = context.Pipe(duplex=False)
+        self._load = [0] * n_workers
+        self._alive = [False] * n_workers
+        self._futures = {}
+        self._ids = count()
+        self._stopping = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._collector = Thread(target=self._collect, daemon=True)
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Starts worker processes and blocks until all of them have built their models.
+
+        Raises:
+            RuntimeError: if any worker fails to build the model or exits before it is ready
+        """
+        self._loop = loop
+        for process in self._processes:
+            process.start()
+        # the parent keeps only reading ends, so a pipe reports EOF as soon as its worker exits
+        for writer in self._writers:
+            writer.close()
+        for worker_id, results in enumerate(self._results):
+            try:
+                _, _, error = results.recv()
+            except EOFError:
+                self._processes[worker_id].join()
+                error = f'the process exited with code {self._processes[worker_id].exitcode}'
+            if error is not None:
+                self.stop()
+                raise RuntimeError(f'Worker {worker_id} failed to build the model: {error}')
+            self._alive[worker_id] = True
+            log.info(f'Worker {worker_id} is ready')
+        self._collector.start()
+
+    def stop(self) -> None:
+        self._stopping = True
+        for queue in self._requests:
+            queue.put(None)
+        for process in self._processes:
+            if process.pid is None:
+                continue
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._stop_writer.send(None)
+        if self._collector.is_alive():
+            self._collector.join()
+
+    async def __call__(self, model_args: List[list]) -> list:
+        alive = [i for i, is_alive in enumerate(self._alive) if is_alive]
+        if not alive:
+            raise RuntimeError('No model workers are alive')
+        worker_id = min(alive, key=self._load.__getitem__)
+        request_id = next(self._ids)
+        future = self._loop.create_future()
+        self._futures[request_id] = future, worker_id
+        self._load[worker_id] += 1
+        self._requests[worker_id].put((request_id, model_args))
+        return await future
+
+    def _collect(self) -> None:
+        workers = {}
+        for worker_id, (results, process) in enumerate(zip(self._results, self._processes)):
+            workers[results] = workers[process.sentinel] = worker_id
+        while True:
+            for ready in wait(list(workers) + [self._stop_reader]):
+                if ready is self._stop_reader:
+                    return
+                if ready not in workers:
+                    continue
+                worker_id = workers[ready]
+                results, process = self._results[worker_id], self._processes[worker_id]
+                exited = ready is process.sentinel
+                try:
+                    if not exited:
+                        self._loop.call_soon_threadsafe(self._resolve, *results.recv())
+                    # results sent before the process exited are delivered before its exit is handled
+                    while exited and results.poll():
+                        self._loop.call_soon_threadsafe(self._resolve, *results.recv())
+                except EOFError:
+                    exited = True
+                if exited:
+                    del workers[results], workers[process.sentinel]
+                    self._worker_exited(worker_id)
+
+    def _worker_exited(self, worker_id: int) -> None:
+        process = self._processes[worker_id]
+        process.join()
+        self._alive[worker_id] = False
+        if not self._stopping:
+            self._loop.call_soon_threadsafe(self._fail_worker, worker_id, process.exitcode)
+
+    def _resolve(self, request_id: int, result: Optional[list], error: Optional[str]) -> None:
+        if request_id not in self._futures:
+            return
+        future, worker_id = self._futures.pop(request_id)
+        self._load[worker_id] -= 1
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(RuntimeError(error))
+        else:
+            future.set_result(result)
+
+    def _fail_worker(self, worker_id: int, exitcode: int) -> None:
+        """Fails unfinished requests of a worker process that has exited."""
+        log.error(f'Worker {worker_id} exited with code {exitcode}')
+        for request_id, (_, request_worker_id) in list(self._futures.items()):
+            if request_worker_id == worker_id:
+                self._resolve(request_id, None, f'Worker {worker_id} exited with code {exitcode}')
+
+
+class AsyncModelServer:
+    """Minimal asyncio HTTP/1.1 server with the same JSON request/response contract as the ``riseapi`` Flask server.
+
+    Args:
+        pool: worker pool that runs the model
+        model_endpoint: path of the model endpoint
+        model_args_names: names of the payload keys with model arguments
+        n_inputs: number of model inputs
+        max_body_size: maximum size of a request body in bytes, larger requests are rejected with the 413 status
+    """
+
+    def __init__(self, pool: WorkerPool, model_endpoint: str, model_args_names: List[str], n_inputs: int,
+                 max_body_size: int = 10 * 2 ** 20) -> None:
+        self.pool = pool
+        self.model_endpoint = model_endpoint
+        self.model_args_names = model_args_names
+        self.n_inputs = n_inputs
+        self.max_body_size = max_body_size
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                request = request_line.decode('latin-1').split()
+                if len(request) != 3 or not request[2].startswith('HTTP/'):
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': 'malformed request line'},
+                                        keep_alive=False)
+                    break
+                method, path, version = request
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                if 'transfer-encoding' in headers:
+                    await self._respond(writer, HTTPStatus.NOT_IMPLEMENTED,
+                                        {'error': 'chunked requests are not supported'}, keep_alive=False)
+                    break
+                content_length = headers.get('content-length', '0')
+                if not re.fullmatch('[0-9]+', content_length):
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': 'invalid Content-Length header'},
+                                        keep_alive=False)
+                    break
+                if int(content_length) > self.max_body_size:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                        {'error': f'request body is larger than {self.max_body_size} bytes'},
+                                        keep_alive=False)
+                    break
+                body = await reader.readexactly(int(content_length))
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+
+                status, payload = await self._process(method, path, headers, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except ValueError:
+            # a request line or a header is longer than the limit of the stream reader
+            try:
+                await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': 'request header is too long'},
+                                    keep_alive=False)
+            except ConnectionError:
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _process(self, method: str, path: str, headers: dict, body: bytes) -> Tuple[HTTPStatus, object]:
+        path = urlsplit(path).path
+        if path != self.model_endpoint:
+            return HTTPStatus.NOT_FOUND, {'error': f'unknown endpoint {path}'}
+        if method == 'OPTIONS':
+            return HTTPStatus.OK, None
+        if method != 'POST':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f'method {method} is not allowed'}
+        if not headers.get('content-type', '').startswith('application/json'):
+            log.error("request Content-Type header is not application/json")
+            return HTTPStatus.BAD_REQUEST, {'error': 'request Content-Type header is not application/json'}
+
+        try:
+            data = json.loads(body.decode('utf-8'))
+            dialog_logger.log_in(data)
+            model_args = get_model_args(data, self.model_args_names, self.n_inputs)
+        except (ValueError, AttributeError) as e:
+            log.error(e)
+            return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+
+        try:
+            result = await self.pool(model_args)
+        except RuntimeError as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+        dialog_logger.log_out(result)
+        return HTTPStatus.OK, result
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: HTTPStatus, payload, keep_alive: bool) -> None:
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = [
+            f'HTTP/1.1 {status.value} {status.phrase}',
+            'Content-Type: application/json',
+            f'Content-Length: {len(body)}',
+            'Access-Control-Allow-Origin: *',
+            'Access-Control-Allow-Methods: POST, OPTIONS',
+            'Access-Control-Allow-Headers: Content-Type',
+            f'Connection: {"keep-alive" if keep_alive else "close"}'
+        ]
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+
+def start_async_model_server(model_config: Union[str, Path, dict], https: bool = False, ssl_key: Optional[str] = None,
+                             ssl_cert: Optional[str] = None, port: Optional[int] = None,
+                             n_workers: Optional[int] = None) -> None:
+    """Serves a model with an asyncio event loop and a pool of worker processes.
+
+    Args:
+        model_config: model config path or dict
+        https: flag for running the server in https mode
+        ssl_key: SSL key file path
+        ssl_cert: SSL certificate file path
+        port: server port, overrides the value from ``server_config.json``
+        n_workers: number of worker processes, overrides the value from ``server_config.json``
+    """
+    server_config_path = get_settings_path() / SERVER_CONFIG_FILENAME
+    server_params = get_server_params(server_config_path, model_config)
+
+    host = server_params['host']
+    port = int(port or server_params['port'])
+    n_workers = n_workers or server_params.get('n_workers', 1)
+
+    https = https or server_params['https']
+    ssl_context = get_ssl_context(server_params, ssl_key, ssl_cert) if https else None
+
+    in_x = parse_config(model_config)['chainer']['in']
+    n_inputs = 1 if isinstance(in_x, str) else len(in_x)
+
+    loop = asyncio.get_event_loop()
+    pool = WorkerPool(model_config, n_workers)
+    pool.start(loop)
+
+    server = AsyncModelServer(pool, server_params['model_endpoint'], server_params['model_args_names'], n_inputs,
+                              server_params.get('max_body_size', 10 * 2 ** 20))
+    tcp_server = loop.run_until_complete(asyncio.start_server(server.handle_connection, host, port, ssl=ssl_context))
+    log.info(f'Serving {n_workers} model workers on {"https" if https else "http"}://{host}:{port}'
+             f'{server_params["model_endpoint"]}')
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tcp_server.close()
+        loop.run_until_complete(tcp_server.wait_closed())
+        pool.stop()
@@ -0,0 +1,137 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from itertools import chain
+from logging import getLogger
+from queue import Queue, Empty
+from threading import Thread, Event
+from typing import List, Optional
+
+from deeppavlov.core.common.chainer import Chainer
+
+log = getLogger(__name__)
+
+
+class _PendingRequest:
+    """Arguments of a single model call waiting for their share of a merged batch result."""
+    __slots__ = ('args', 'size', 'arrived', 'result', 'error', 'done')
+
+    def __init__(self, args: tuple) -> None:
+        self.args = args
+        self.size = len(args[0]) if args else 0
+        self.arrived = time.monotonic()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.done = Event()
+
+
+class BatchingModel:
+    """Wrapper around a :class:`~deeppavlov.core.common.chainer.Chainer` that merges concurrent calls into batches.
+
+    Every call is put to a queue and blocks until a background thread runs the model on a batch that combines
+    the call's arguments with arguments of other calls waiting in the queue. The batch is sent to the model as soon
+    as it has ``max_batch_size`` samples or ``max_wait_ms`` milliseconds have passed since its first request arrived.
+
+    Args:
+        model: model to be called on merged batches
+        max_batch_size: maximum number of samples in a merged batch; a single request with more samples
+            is processed on its own
+        max_wait_ms: maximum time in milliseconds to wait for other requests before calling the model
+
+    Attributes:
+        in_x: names of the model inputs
+        out_params: names of the model outputs
+    """
+
+    def __init__(self, model: Chainer, max_batch_size: int = 32, max_wait_ms: float = 5) -> None:
+        self.model = model
+        self.in_x = model.in_x
+        self.out_params = model.out_params
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue: Queue = Queue()
+        self._worker = Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def __call__(self, *args: list):
+        request = _PendingRequest(args)
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _run(self) -> None:
+        pending = None
+        while True:
+            requests = [pending or self._queue.get()]
+            pending = None
+            batch_size = requests[0].size
+            deadline = requests[0].arrived + self.max_wait
+            while batch_size < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except Empty:
+                    break
+                if batch_size + request.size > self.max_batch_size:
+                    pending = request
+                    break
+                requests.append(request)
+                batch_size += request.size
+            self._process(requests)
+
+    def _process(self, requests: List[_PendingRequest]) -> None:
+        """Run the model on a merged batch of requests and wake up their callers.
+
+        If the merged batch fails, its requests are run one by one, so that an error is attached only to requests
+        that fail on their own.
+        """
+        split = False
+        try:
+            self._run_batch(requests)
+        except Exception as e:
+            if len(requests) > 1:
+                log.warning(f'Failed to process a merged batch of {len(requests)} requests, '
+                            f'processing them one by one')
+                split = True
+            else:
+                log.exception('Failed to process a request')
+                requests[0].error = e
+        if split:
+            for request in requests:
+                self._process([request])
+            return
+        for request in requests:
+            request.done.set()
+
+    def _run_batch(self, requests: List[_PendingRequest]) -> None:
+        args = [list(chain.from_iterable(arg)) for arg in zip(*(r.args for r in requests))]
+        log.debug(f'Running model on a batch of {len(args[0])} samples from {len(requests)} requests')
+        result = self.model(*args)
+        if len(self.out_params) == 1:
+            result = [result]
+        results = []
+        start = 0
+        for request in requests:
+            end = start + request.size
+            request_result = [out[start:end] for out in result]
+            results.append(request_result[0] if len(self.out_params) == 1 else request_result)
+            start = end
+        for request, request_result in zip(requests, results):
+            request.result = request_result
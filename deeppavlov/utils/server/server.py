@@ -15,7 +15,7 @@
 import ssl
 from logging import getLogger
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Tuple, Union, Optional
 
 from flasgger import Swagger, swag_from
 from flask import Flask, request, jsonify, redirect, Response
@@ -28,6 +28,7 @@ from deeppavlov.core.common.chainer import Chainer
 from deeppavlov.core.common.file import read_json
 from deeppavlov.core.common.paths import get_settings_path
 from deeppavlov.core.data.utils import check_nested_dict_keys, jsonify_data
+from deeppavlov.utils.server.batching import BatchingModel
 
 SERVER_CONFIG_FILENAME = 'server_config.json'
 
@@ -57,39 +58,79 @@ def get_server_params(server_config_path, model_config):
     return server_params
 
 
-def interact(model: Chainer, params_names: List[str]) -> Tuple[Response, int]:
-    if not request.is_json:
-        log.error("request Content-Type header is not application/json")
-        return jsonify({
-            "error": "request Content-Type header is not application/json"
-        }), 400
+def get_ssl_context(server_params: dict, ssl_key: Optional[str] = None,
+                    ssl_cert: Optional[str] = None) -> ssl.SSLContext:
+    ssh_key_path = Path(ssl_key or server_params['https_key_path']).resolve()
+    if not ssh_key_path.is_file():
+        e = FileNotFoundError('Ssh key file not found: please provide correct path in --key param or '
+                              'https_key_path param in server configuration file')
+        log.error(e)
+        raise e
+
+    ssh_cert_path = Path(ssl_cert or server_params['https_cert_path']).resolve()
+    if not ssh_cert_path.is_file():
+        e = FileNotFoundError('Ssh certificate file not found: please provide correct path in --cert param or '
+                              'https_cert_path param in server configuration file')
+        log.error(e)
+        raise e
 
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
+    ssl_context.load_cert_chain(ssh_cert_path, ssh_key_path)
+    return ssl_context
+
+
+def get_model_args(data: dict, params_names: List[str], n_inputs: int) -> List[list]:
+    """Extracts model arguments from a request payload.
+
+    Args:
+        data: decoded JSON payload of a request
+        params_names: names of the payload keys with model arguments
+        n_inputs: number of model inputs; missing arguments are filled with ``None`` values
+
+    Returns:
+        list of batches, one for each model input
+
+    Raises:
+        ValueError: if the payload does not contain a correct batch
+    """
     model_args = []
 
-    data = request.get_json()
-    dialog_logger.log_in(data)
     for param_name in params_names:
         param_value = data.get(param_name)
         if param_value is None or (isinstance(param_value, list) and len(param_value) > 0):
             model_args.append(param_value)
         else:
-            log.error(f"nonempty array expected but got '{param_name}'={repr(param_value)}")
-            return jsonify({'error': f"nonempty array expected but got '{param_name}'={repr(param_value)}"}), 400
+            raise ValueError(f"nonempty array expected but got '{param_name}'={repr(param_value)}")
 
     lengths = {len(i) for i in model_args if i is not None}
 
     if not lengths:
-        log.error('got empty request')
-        return jsonify({'error': 'got empty request'}), 400
+        raise ValueError('got empty request')
     elif len(lengths) > 1:
-        log.error('got several different batch sizes')
-        return jsonify({'error': 'got several different batch sizes'}), 400
+        raise ValueError('got several different batch sizes')
 
     batch_size = list(lengths)[0]
     model_args = [arg or [None] * batch_size for arg in model_args]
 
     # in case when some parameters were not described in model_args
-    model_args += [[None] * batch_size for _ in range(len(model.in_x) - len(model_args))]
+    model_args += [[None] * batch_size for _ in range(n_inputs - len(model_args))]
+    return model_args
+
+
+def interact(model: Union[Chainer, BatchingModel], params_names: List[str]) -> Tuple[Response, int]:
+    if not request.is_json:
+        log.error("request Content-Type header is not application/json")
+        return jsonify({
+            "error": "request Content-Type header is not application/json"
+        }), 400
+
+    data = request.get_json()
+    dialog_logger.log_in(data)
+    try:
+        model_args = get_model_args(data, params_names, len(model.in_x))
+    except ValueError as e:
+        log.error(e)
+        return jsonify({'error': str(e)}), 400
 
     prediction = model(*model_args)
     if len(model.out_params) == 1:
@@ -111,28 +152,15 @@ def start_model_server(model_config, https=False, ssl_key=None, ssl_cert=None, p
 
     https = https or server_params['https']
 
-    if https:
-        ssh_key_path = Path(ssl_key or server_params['https_key_path']).resolve()
-        if not ssh_key_path.is_file():
-            e = FileNotFoundError('Ssh key file not found: please provide correct path in --key param or '
-                                  'https_key_path param in server configuration file')
-            log.error(e)
-            raise e
-
-        ssh_cert_path = Path(ssl_cert or server_params['https_cert_path']).resolve()
-        if not ssh_cert_path.is_file():
-            e = FileNotFoundError('Ssh certificate file not found: please provide correct path in --cert param or '
-                                  'https_cert_path param in server configuration file')
-            log.error(e)
-            raise e
-
-        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
-        ssl_context.load_cert_chain(ssh_cert_path, ssh_key_path)
-    else:
-        ssl_context = None
+    ssl_context = get_ssl_context(server_params, ssl_key, ssl_cert) if https else None
 
     model = build_model(model_config)
 
+    max_batch_size = server_params.get('max_batch_size', 1)
+    batching = max_batch_size > 1
+    if batching:
+        model = BatchingModel(model, max_batch_size, server_params.get('max_wait_ms', 5))
+
     @app.route('/')
     def index():
         return redirect('/apidocs/')
@@ -159,4 +187,4 @@ def start_model_server(model_config, https=False, ssl_key=None, ssl_cert=None, p
     def answer():
         return interact(model, model_args_names)
 
-    app.run(host=host, port=port, threaded=False, ssl_context=ssl_context)
+    app.run(host=host, port=port, threaded=batching, ssl_context=ssl_context)
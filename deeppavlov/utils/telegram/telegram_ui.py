@@ -21,6 +21,7 @@ import telebot
 
 from deeppavlov.agents.default_agent.default_agent import DefaultAgent
 from deeppavlov.agents.processors.default_rich_content_processor import DefaultRichContentWrapper
+from deeppavlov.core.agent.dialog_store import build_dialog_stores
 from deeppavlov.core.agent import Agent
 from deeppavlov.core.agent.rich_content import RichMessage
 from deeppavlov.core.commands.infer import build_model
@@ -83,5 +84,6 @@ def interact_model_by_telegram(model_config: Union[str, Path, dict],
     model = build_model(model_config)
     model_name = type(model.get_main_component()).__name__
     skill = DefaultStatelessSkill(model) if default_skill_wrap else model
-    agent = DefaultAgent([skill], skills_processor=DefaultRichContentWrapper())
+    agent = DefaultAgent([skill], skills_processor=DefaultRichContentWrapper(),
+                         **build_dialog_stores(**server_config['common_defaults'].get('dialog_store', {})))
     init_bot_for_model(agent, token, model_name)
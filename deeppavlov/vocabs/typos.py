@@ -13,14 +13,17 @@
 # limitations under the License.
 
 import shutil
-from collections import defaultdict
+from collections.abc import Set
 from logging import getLogger
 from pathlib import Path
+from typing import Iterable, Iterator, List, Union
 
+import numpy as np
 import requests
 from lxml import html
 
 from deeppavlov.core.commands.utils import expand_path
+from deeppavlov.core.common.cache import LRUCache
 from deeppavlov.core.common.file import load_pickle, save_pickle
 from deeppavlov.core.common.registry import register
 from deeppavlov.core.data.utils import is_done, mark_done
@@ -28,6 +31,124 @@ from deeppavlov.core.data.utils import is_done, mark_done
 log = getLogger(__name__)
 
 
+class ArrayTrie:
+    """Prefix tree of words stored in flat numpy arrays
+
+    Nodes are numbered in breadth-first order with children of every node sorted by their characters, so children
+    of a node always have consecutive numbers. The tree is stored as three arrays that can be memory-mapped:
+    character codes of nodes, numbers of the first child of every node and a bitmap of nodes that end a word.
+
+    Args:
+        labels: character code of the edge that leads to every node
+        children: children of the node ``i`` are the nodes from ``children[i]`` to ``children[i + 1]``
+        final: packed bits of flags of nodes that end a word
+        cache_size: maximum number of prefixes to remember numbers of their nodes for
+
+    Attributes:
+        words: set-like view of all the words
+    """
+
+    def __init__(self, labels: np.ndarray, children: np.ndarray, final: np.ndarray, cache_size: int = 2**16):
+        self.labels = labels
+        self.children = children
+        self.final = final
+        self._nodes = LRUCache(cache_size)
+        self.words = _TrieWords(self)
+
+    @classmethod
+    def build(cls, words: Iterable[str]) -> 'ArrayTrie':
+        """Build a trie of the given words."""
+        words = set(words)
+        # sorting by length and then by characters gives the breadth-first order with sorted children
+        prefixes = sorted({word[:i] for word in words for i in range(len(word) + 1)}, key=lambda p: (len(p), p))
+        index = {prefix: i for i, prefix in enumerate(prefixes)}
+        labels = np.array([ord(prefix[-1]) if prefix else 0 for prefix in prefixes], dtype=np.uint32)
+        parents = np.fromiter((index[prefix[:-1]] for prefix in prefixes[1:]), dtype=np.int64,
+                              count=len(prefixes) - 1)
+        children = np.concatenate([[1], 1 + np.cumsum(np.bincount(parents, minlength=len(prefixes)))])
+        final = np.packbits(np.fromiter((prefix in words for prefix in prefixes), dtype=bool, count=len(prefixes)))
+        return cls(labels, children, final)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save trie arrays as **.npy** files to the given directory."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / 'labels.npy', self.labels)
+        np.save(path / 'children.npy', self.children)
+        np.save(path / 'final.npy', self.final)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> 'ArrayTrie':
+        """Load a trie saved by :meth:`save`, with memory mapping if ``mmap`` is ``True``."""
+        path = Path(path)
+        mmap_mode = 'r' if mmap else None
+        return cls(*(np.load(path / f'{name}.npy', mmap_mode=mmap_mode) for name in ('labels', 'children', 'final')))
+
+    def _child(self, node: int, char: str) -> int:
+        start, end = self.children[node], self.children[node + 1]
+        labels = self.labels[start:end]
+        i = np.searchsorted(labels, ord(char))
+        return int(start + i) if i < end - start and labels[i] == ord(char) else -1
+
+    def _find(self, prefix: str) -> int:
+        """Number of the node of the prefix or -1 if the trie does not contain it."""
+        if not prefix:
+            return 0
+        node = self._nodes.get(prefix)
+        if node is None:
+            node = self._find(prefix[:-1])
+            if node >= 0:
+                node = self._child(node, prefix[-1])
+            self._nodes[prefix] = node
+        return node
+
+    def is_final(self, node: int) -> bool:
+        return bool(self.final[node >> 3] & (128 >> (node & 7)))
+
+    def __getitem__(self, prefix: str) -> List[str]:
+        """Sorted list of the prefix extensions by one character."""
+        node = self._find(prefix)
+        if node < 0:
+            raise KeyError(prefix)
+        start, end = int(self.children[node]), int(self.children[node + 1])
+        extensions = [prefix + chr(c) for c in self.labels[start:end].tolist()]
+        for child, extension in enumerate(extensions, start):
+            self._nodes[extension] = child
+        return extensions
+
+    def __contains__(self, prefix: str) -> bool:
+        return self._find(prefix) >= 0
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+class _TrieWords(Set):
+    """Set-like view of words of an :class:`ArrayTrie`."""
+
+    def __init__(self, trie: ArrayTrie):
+        self._trie = trie
+        self._len = None
+
+    def __contains__(self, word) -> bool:
+        node = self._trie._find(word) if isinstance(word, str) else -1
+        return node >= 0 and self._trie.is_final(node)
+
+    def __len__(self) -> int:
+        if self._len is None:
+            self._len = int(np.unpackbits(self._trie.final).sum())
+        return self._len
+
+    def __iter__(self) -> Iterator[str]:
+        parents = np.repeat(np.arange(len(self._trie)), np.diff(self._trie.children)).tolist()
+        final = np.unpackbits(self._trie.final)
+        prefixes = ['']
+        for parent, label in zip(parents, self._trie.labels[1:].tolist()):
+            prefixes.append(prefixes[parent] + chr(label))
+        for node in np.flatnonzero(final[:len(prefixes)]).tolist():
+            yield prefixes[node]
+
+
 @register('static_dictionary')
 class StaticDictionary:
     """Trie vocabulary used in spelling correction algorithms
@@ -41,8 +162,8 @@ class StaticDictionary:
     Attributes:
         dict_name: logical name of the dictionary
         alphabet: set of all the characters used in this dictionary
-        words_set: set of all the words
-        words_trie: trie structure of all the words
+        words_set: set-like view of all the words
+        words_trie: memory-mapped :class:`ArrayTrie` of all the words
     """
 
     def __init__(self, data_dir: [Path, str]='', *args, dictionary_name: str='dictionary', **kwargs):
@@ -50,7 +171,7 @@ class StaticDictionary:
 
         alphabet_path = data_dir / 'alphabet.pkl'
         words_path = data_dir / 'words.pkl'
-        words_trie_path = data_dir / 'words_trie.pkl'
+        words_trie_path = data_dir / 'words_trie'
 
         if not is_done(data_dir):
             log.info('Trying to build a dictionary in {}'.format(data_dir))
@@ -66,25 +187,19 @@ class StaticDictionary:
             alphabet.remove('⟭')
 
             save_pickle(alphabet, alphabet_path)
-            save_pickle(words, words_path)
-
-            words_trie = defaultdict(set)
-            for word in words:
-                for i in range(len(word)):
-                    words_trie[word[:i]].add(word[:i+1])
-                words_trie[word] = set()
-            words_trie = {k: sorted(v) for k, v in words_trie.items()}
-
-            save_pickle(words_trie, words_trie_path)
+            ArrayTrie.build(words).save(words_trie_path)
 
             mark_done(data_dir)
             log.info('built')
         else:
             log.info('Loading a dictionary from {}'.format(data_dir))
+            if not words_trie_path.is_dir():
+                log.info('Converting pickled words to a trie in {}'.format(words_trie_path))
+                ArrayTrie.build(load_pickle(words_path)).save(words_trie_path)
 
         self.alphabet = load_pickle(alphabet_path)
-        self.words_set = load_pickle(words_path)
-        self.words_trie = load_pickle(words_trie_path)
+        self.words_trie = ArrayTrie.load(words_trie_path)
+        self.words_set = self.words_trie.words
 
     @staticmethod
     def _get_source(data_dir, raw_dictionary_path, *args, **kwargs):
@@ -109,8 +224,8 @@ class RussianWordsVocab(StaticDictionary):
     Attributes:
         dict_name: logical name of the dictionary
         alphabet: set of all the characters used in this dictionary
-        words_set: set of all the words
-        words_trie: trie structure of all the words
+        words_set: set-like view of all the words
+        words_trie: memory-mapped :class:`~deeppavlov.vocabs.typos.ArrayTrie` of all the words
     """
 
     def __init__(self, data_dir: [Path, str]='', *args, **kwargs):
@@ -137,8 +252,8 @@ class Wiki100KDictionary(StaticDictionary):
     Attributes:
         dict_name: logical name of the dictionary
         alphabet: set of all the characters used in this dictionary
-        words_set: set of all the words
-        words_trie: trie structure of all the words
+        words_set: set-like view of all the words
+        words_trie: memory-mapped :class:`~deeppavlov.vocabs.typos.ArrayTrie` of all the words
     """
     def __init__(self, data_dir: [Path, str]='', *args, **kwargs):
         kwargs['dictionary_name'] = 'wikipedia_100K_vocab'
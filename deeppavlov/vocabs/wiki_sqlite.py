@@ -12,9 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sys
 from logging import getLogger
 from typing import List, Any, Optional, Union
 
+from deeppavlov.core.common.cache import LRUCache
 from deeppavlov.core.common.registry import register
 from deeppavlov.core.models.component import Component
 from deeppavlov.dataset_iterators.sqlite_iterator import SQLiteDataIterator
@@ -26,19 +28,26 @@ logger = getLogger(__name__)
 class WikiSQLiteVocab(SQLiteDataIterator, Component):
     """Get content from SQLite database by document ids.
 
+    Contents of all documents of a batch are fetched with a single query and the most recently used ones
+    are kept in a cache.
+
     Args:
         load_path: a path to local DB file
         join_docs: whether to join extracted docs with ' ' or not
         shuffle: whether to shuffle data or not
+        cache_size: maximum size of cached documents contents in bytes, the cache is disabled if it is 0
 
     Attributes:
         join_docs: whether to join extracted docs with ' ' or not
+        cache: a cache of documents contents
 
     """
 
-    def __init__(self, load_path: str, join_docs: bool = True, shuffle: bool = False, **kwargs) -> None:
+    def __init__(self, load_path: str, join_docs: bool = True, shuffle: bool = False, cache_size: int = 0,
+                 **kwargs) -> None:
         SQLiteDataIterator.__init__(self, load_path=load_path, shuffle=shuffle)
         self.join_docs = join_docs
+        self.cache = LRUCache(cache_size, sizeof=sys.getsizeof)
 
     def __call__(self, doc_ids: Optional[List[List[Any]]] = None, *args, **kwargs) -> List[Union[str, List[str]]]:
         """Get the contents of files, stacked by space or as they are.
@@ -54,8 +63,21 @@ class WikiSQLiteVocab(SQLiteDataIterator, Component):
             logger.warn('No doc_ids are provided in WikiSqliteVocab, return all docs')
             doc_ids = [self.get_doc_ids()]
 
+        contents_by_id = {}
+        missing = []
+        for ids in doc_ids:
+            for doc_id in ids:
+                if doc_id not in contents_by_id:
+                    contents_by_id[doc_id] = self.cache.get(doc_id)
+                    if contents_by_id[doc_id] is None:
+                        missing.append(doc_id)
+        for doc_id, content in zip(missing, self.get_docs_content(missing)):
+            contents_by_id[doc_id] = content
+            if content is not None:
+                self.cache[doc_id] = content
+
         for ids in doc_ids:
-            contents = [self.get_doc_content(doc_id) for doc_id in ids]
+            contents = [contents_by_id[doc_id] for doc_id in ids]
             if self.join_docs:
                 contents = ' '.join(contents)
             all_contents.append(contents)
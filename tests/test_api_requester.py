@@ -0,0 +1,102 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import pytest
+import requests
+
+from deeppavlov.models.api_requester.api_requester import ApiRequester
+from deeppavlov.models.api_requester.api_router import ApiRouter
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Responds with the ``x`` field of a posted json, waits for ``sleep`` seconds first if it is given."""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.server.clients.add(self.client_address)
+        data = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        time.sleep(data.get('sleep', 0))
+        body = json.dumps(data['x']).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class EchoServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), EchoHandler)
+        self.clients = set()
+
+
+server = None
+url = None
+
+
+def setup_module():
+    global server, url
+    server = EchoServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/'
+
+
+def teardown_module():
+    server.shutdown()
+    server.server_close()
+
+
+def setup_function():
+    server.clients.clear()
+
+
+def test_keep_alive():
+    requester = ApiRequester(url, 1, ['x'])
+    for i in range(20):
+        assert requester([i, 'a']) == [i, 'a']
+    assert len(server.clients) == 1
+    assert requester.latency.count == 20
+    requester.destroy()
+
+
+def test_debatchify_order():
+    requester = ApiRequester(url, 1, ['x', 'sleep'], debatchify=True, n_workers=4)
+    # earlier requests respond later, responses still have to be in the order of the batch
+    sleeps = [0.05 * (8 - i) for i in range(8)]
+    assert requester(list(range(8)), sleeps) == list(range(8))
+    assert len(server.clients) <= 4
+    requester.destroy()
+
+
+def test_debatchify_multiple_outputs():
+    requester = ApiRequester(url, 2, ['x'], debatchify=True)
+    assert requester([[1, 'a'], [2, 'b']]) == [(1, 2), ('a', 'b')]
+    requester.destroy()
+
+
+def test_timeout():
+    requester = ApiRequester(url, 1, ['x', 'sleep'], timeout=0.1)
+    with pytest.raises(requests.exceptions.Timeout):
+        requester([1], 0.5)
+    requester.destroy()
+
+
+def test_router_reuses_executor():
+    requesters = [ApiRequester(url, 1, ['x']), ApiRequester(url, 1, ['x'])]
+    router = ApiRouter(requesters, n_workers=2)
+    assert router([1, 2]) == [[1, 2], [1, 2]]
+    executor = router._executor
+    assert router([3]) == [[3], [3]]
+    assert router._executor is executor
+    assert router.latency.count == 2
+    router.destroy()
+    for requester in requesters:
+        requester.destroy()
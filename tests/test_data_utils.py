@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from deeppavlov.core.data.utils import (zero_pad, zero_pad_truncate, get_dimensions, _zero_pad_truncate_rows,
+                                        _MIN_VECTORIZED_ROWS)
+
+rng = np.random.RandomState(0)
+
+
+def loop_zero_pad(batch, dtype=np.float32, padding=0):
+    """Pads a batch by the row by row copy that is used for small and irregular batches."""
+    return zero_pad(batch, np.full(get_dimensions(batch), padding, dtype=dtype))
+
+
+def random_batch(n_rows, depth, max_len=6, max_token_len=4, equal_tokens=False):
+    token_len = rng.randint(1, max_token_len + 1)
+    batch = []
+    for _ in range(n_rows):
+        length = rng.randint(0, max_len + 1)
+        if depth == 2:
+            batch.append(list(rng.randint(1, 100, size=length)))
+        else:
+            batch.append([list(rng.rand(token_len if equal_tokens else rng.randint(0, max_token_len + 1)))
+                          for _ in range(length)])
+    return batch
+
+
+@pytest.mark.parametrize('n_rows', [1, _MIN_VECTORIZED_ROWS - 1, _MIN_VECTORIZED_ROWS, 4 * _MIN_VECTORIZED_ROWS])
+@pytest.mark.parametrize('depth,equal_tokens', [(2, False), (3, False), (3, True)])
+def test_zero_pad_matches_loop(n_rows, depth, equal_tokens):
+    for _ in range(20):
+        batch = random_batch(n_rows, depth, equal_tokens=equal_tokens)
+        result, expected = zero_pad(batch, padding=-1), loop_zero_pad(batch, padding=-1)
+        assert result.dtype == expected.dtype
+        np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize('n_rows', [1, _MIN_VECTORIZED_ROWS])
+def test_zero_pad_empty_tokens(n_rows):
+    batch = [[[], []]] * n_rows
+    result = zero_pad(batch)
+    assert result.shape == (n_rows, 2, 0)
+    np.testing.assert_array_equal(result, loop_zero_pad(batch))
+
+
+@pytest.mark.parametrize('n_rows', [1, _MIN_VECTORIZED_ROWS - 1, _MIN_VECTORIZED_ROWS, 4 * _MIN_VECTORIZED_ROWS])
+@pytest.mark.parametrize('pad', ['post', 'pre'])
+@pytest.mark.parametrize('trunc', ['post', 'pre'])
+def test_zero_pad_truncate_matches_loop(n_rows, pad, trunc):
+    for _ in range(20):
+        n_features = rng.randint(1, 4)
+        batch = [rng.rand(rng.randint(1, 10), n_features) for _ in range(n_rows)]
+        result = zero_pad_truncate(batch, 5, pad, trunc)
+        expected = _zero_pad_truncate_rows(batch, 5, pad, trunc, np.float32)
+        np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize('n_rows', [1, _MIN_VECTORIZED_ROWS])
+def test_zero_pad_truncate_no_features(n_rows):
+    batch = [[[], []]] * n_rows
+    assert zero_pad_truncate(batch, 3).shape == (n_rows, 3, 0)
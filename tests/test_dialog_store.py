@@ -0,0 +1,114 @@
+import pytest
+
+from deeppavlov.core.agent import dialog_store
+from deeppavlov.core.agent.dialog_store import MemoryDialogStore, SQLiteDialogStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.
+
+    def time(self):
+        return self.now
+
+    monotonic = time
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(dialog_store, 'time', clock)
+    return clock
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_store(request, tmp_path):
+    def make(**kwargs):
+        if request.param == 'memory':
+            return MemoryDialogStore(**kwargs)
+        # only the cache of the SQLite store is bounded
+        kwargs['cache_size'] = kwargs.pop('max_dialogs', 1000)
+        return SQLiteDialogStore(tmp_path / 'dialogs.db', **kwargs)
+    return make
+
+
+def test_default_factory(make_store):
+    store = make_store(default_factory=list)
+    assert 0 not in store
+    assert store.get(0) is None
+    store[0].append('a')
+    store.commit(0)
+    assert 0 in store
+    assert store[0] == ['a']
+    assert len(store) == 1
+    del store[0]
+    assert 0 not in store
+    with pytest.raises(KeyError):
+        make_store()['unknown']
+
+
+def test_truncation(make_store):
+    store = make_store(default_factory=list, max_turns=3)
+    for i in range(5):
+        store[0].append(i)
+        store.commit(0)
+    assert store[0] == [2, 3, 4]
+
+
+def test_ttl(make_store, clock):
+    store = make_store(default_factory=list, ttl=10)
+    store[0].append('a')
+    store.commit(0)
+    clock.now += 5
+    store[1].append('b')
+    store.commit(1)
+    clock.now += 6
+    assert 0 not in store
+    assert store[1] == ['b']
+    assert len(store) == 1
+
+
+def test_commit_persists_changes(tmp_path):
+    store = SQLiteDialogStore(tmp_path / 'dialogs.db', default_factory=list)
+    store[0].append('a')
+    store.commit(0)
+    store.close()
+    assert SQLiteDialogStore(tmp_path / 'dialogs.db')[0] == ['a']
+
+
+def test_uncommitted_survive_eviction(make_store):
+    """Changes of a batch of more dialogs than the store keeps in memory are not lost before commit."""
+    store = make_store(default_factory=list, max_dialogs=2)
+    for i in range(3):
+        store[i].append('u')
+    for i in range(3):
+        store[i].append('r')
+        store.commit(i)
+    assert store.get(1) == ['u', 'r']
+    assert store.get(2) == ['u', 'r']
+    if isinstance(store, SQLiteDialogStore):
+        assert store.get(0) == ['u', 'r']
+
+
+def test_lru_eviction():
+    store = MemoryDialogStore(default_factory=list, max_dialogs=2)
+    for i in range(2):
+        store[i].append(i)
+        store.commit(i)
+    # dialog 0 becomes the most recently used one
+    store.commit(0)
+    store[2].append(2)
+    store.commit(2)
+    assert 1 not in store
+    assert 0 in store and 2 in store
+    assert len(store) == 2
+
+
+def test_size_eviction():
+    store = MemoryDialogStore(default_factory=list, max_size=100, sizeof=len)
+    for i in range(3):
+        store[i].extend(range(40))
+        store.commit(i)
+    assert 0 not in store
+    assert len(store) == 2
+    assert store.size == 80